@@ -0,0 +1,225 @@
+# bird_pool.py - FLYWEIGHT BIRDS AND OBJECT POOLING
+#
+# test_birds() creates a fresh BirdClass() for every bird. The birds of
+# birds_v1/v2/v3 have no state at all, so a million of them are a million
+# identical objects that the allocator hands out and, as long as they live,
+# the garbage collector tracks and scans.
+#
+# Flyweights: flyweight(cls) returns one shared instance per class, and
+# shared(cls) a drop-in replacement for the class that always returns it:
+#
+#   test_birds([shared(cls) for cls in bird_classes])    # One object per class
+#
+# Pooling: birds that do have state (here: energy and altitude) keep it in a
+# PooledBird, which has __slots__ instead of a __dict__, and share everything
+# else: a PooledBird delegates fly() and swim() to the flyweight of its
+# species. A BirdPool keeps released PooledBirds and hands them out again,
+# so short-lived birds do not churn the allocator.
+#
+# Usage:
+#   python bird_pool.py [BIRDS]    # Default: 1 million; memory and GC pauses
+import gc
+import sys
+import time
+import tracemalloc
+from functools import cache
+
+import output_sink
+
+# Released birds a BirdPool keeps at most; more are left to the garbage collector
+MAX_FREE = 10_000
+
+# Shared instance per stateless class
+FLYWEIGHTS = {}
+
+
+def flyweight(cls):
+    """
+    Returns the shared instance of a stateless bird class.
+
+    Raises:
+    TypeError: If a new instance of cls has instance attributes.
+    """
+    try:
+        return FLYWEIGHTS[cls]
+    except KeyError:
+        instance = cls()
+        if getattr(instance, "__dict__", None):
+            raise TypeError(f"{cls.__name__} instances have state: {sorted(vars(instance))}") from None
+        FLYWEIGHTS[cls] = instance
+        return instance
+
+
+@cache
+def shared(cls):
+    """Returns a callable that, like cls(), returns a bird: always the flyweight of cls."""
+    instance = flyweight(cls)
+    return lambda: instance
+
+
+class PooledBird:
+    """
+    A bird with its own energy and altitude, flying and swimming like its species.
+    """
+    __slots__ = ("species", "energy", "altitude", "pool")
+
+    def __init__(self, cls, energy=1.0):
+        self.species = flyweight(cls)
+        self.energy = energy
+        self.altitude = 0.0
+        self.pool = None  # The BirdPool the bird is checked out from, if any
+
+    def fly(self):
+        self.energy -= 0.1
+        self.altitude = 10.0
+        self.species.fly()
+
+    def swim(self):
+        self.energy = min(1.0, self.energy + 0.05)
+        self.altitude = 0.0
+        self.species.swim()
+
+    def __repr__(self):
+        return f"<Pooled {type(self.species).__name__}: energy {self.energy:.2f}, altitude {self.altitude}>"
+
+
+class BirdPool:
+    """
+    Hands out PooledBirds, reusing released ones.
+    """
+
+    def __init__(self, max_free=MAX_FREE):
+        self.free = []
+        self.max_free = max_free
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, cls, energy=1.0):
+        """Returns a PooledBird of species cls, reset to energy and altitude 0."""
+        if self.free:
+            bird = self.free.pop()
+            bird.species = flyweight(cls)
+            bird.energy = energy
+            bird.altitude = 0.0
+            bird.pool = self
+            self.reused += 1
+            return bird
+        self.created += 1
+        bird = PooledBird(cls, energy)
+        bird.pool = self
+        return bird
+
+    def release(self, bird):
+        """
+        Returns a bird to the pool; it must not be used afterwards.
+
+        Raises:
+        ValueError: If the bird is not checked out from this pool, e.g. when it
+            is released twice: the pool would hand it out to two owners.
+        """
+        if bird.pool is not self:
+            raise ValueError(f"{bird!r} is not checked out from this pool")
+        bird.pool = None
+        if len(self.free) < self.max_free:
+            self.free.append(bird)
+
+
+# ===== Benchmark: plain instances vs flyweights vs pooled slots =====
+
+class StatefulBird:
+    """PooledBird without __slots__ and without a pool: the plain stateful bird."""
+
+    def __init__(self, cls, energy=1.0):
+        self.species = cls()
+        self.energy = energy
+        self.altitude = 0.0
+
+    fly = PooledBird.fly
+    swim = PooledBird.swim
+
+
+class GCPauses:
+    """Times every garbage collection, through gc.callbacks."""
+
+    def __init__(self):
+        self.pauses = []
+        self.started = 0.0
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self.started)
+
+    def __enter__(self):
+        gc.collect()
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        gc.callbacks.remove(self)
+
+
+def measure(label, count, action):
+    """
+    Runs action twice: timed, with its GC pauses, and then with tracemalloc for
+    the peak memory (tracing slows allocations down too much to time them).
+    """
+    with GCPauses() as pauses:
+        start = time.perf_counter()
+        result = action()
+        elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    longest = max(pauses.pauses, default=0)
+    print(f"{label:>32}: {elapsed * 1e9 / count:7.1f} ns/bird, peak {peak / 2**20:6.1f} MiB, "
+          f"{len(pauses.pauses):5} GCs, {sum(pauses.pauses) * 1e3:6.1f} ms total, {longest * 1e3:5.1f} ms max")
+
+
+def run_benchmark(count=1_000_000):
+    import birds_v1
+    import birds_v2
+    import birds_v3
+    from main import test_birds
+
+    classes = [
+        birds_v1.Duck, birds_v1.Swan, birds_v1.Albatross,
+        birds_v2.Duck, birds_v2.Swan, birds_v2.Albatross,
+        birds_v3.Duck, birds_v3.Swan, birds_v3.Albatross,
+    ]
+    bird_classes = classes * (count // len(classes)) + classes[:count % len(classes)]
+    shared_classes = [shared(cls) for cls in bird_classes]
+    pool = BirdPool()
+
+    def churn_pooled():
+        for cls in bird_classes:
+            bird = pool.acquire(cls)
+            bird.fly()
+            bird.swim()
+            pool.release(bird)
+
+    def churn_plain():
+        for cls in bird_classes:
+            bird = StatefulBird(cls)
+            bird.fly()
+            bird.swim()
+
+    with output_sink.use_sink(output_sink.NullSink()):
+        print(f"{count:,} short-lived birds (created, fly, swim, dropped)")
+        measure("stateless: BirdClass()", count, lambda: test_birds(bird_classes))
+        measure("stateless: shared flyweights", count, lambda: test_birds(shared_classes))
+        measure("stateful: plain instances", count, churn_plain)
+        measure("stateful: pooled __slots__", count, churn_pooled)
+
+        print(f"\n{count:,} live birds")
+        measure("stateless: BirdClass()", count, lambda: [cls() for cls in bird_classes])
+        measure("stateless: flyweights", count, lambda: list(map(flyweight, bird_classes)))
+        measure("stateful: plain instances", count, lambda: [StatefulBird(cls) for cls in bird_classes])
+        measure("stateful: __slots__", count, lambda: [PooledBird(cls) for cls in bird_classes])
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,132 @@
+# bird_protocol.py - CACHED PROTOCOL CHECKS
+#
+# birds_v2 relies on duck typing (call fly()/swim() and hope), birds_v3 on an
+# ABC that every bird must inherit from. A typing.Protocol sits in between:
+# any object with fly() and swim() methods is a Bird, whatever it inherits
+# from. But isinstance() with a runtime-checkable protocol looks up every
+# protocol method on the object each time, which costs microseconds.
+#
+# Here the answer is cached per type: the first check of a Duck walks the
+# methods, every later check of any Duck is a lookup in a weak-keyed dict. This
+# assumes that the methods are defined on the class (as for all birds here),
+# not assigned to single instances; call clear_conformance_cache() after
+# changing a class.
+import random
+import sys
+import time
+import weakref
+from typing import Protocol, runtime_checkable
+
+import birds_v1
+import birds_v2
+import birds_v3
+import output_sink
+
+
+class CachedProtocolMeta(type(Protocol)):
+    """
+    Metaclass for protocols whose isinstance() result is cached by type.
+
+    Every protocol keeps its own cache, so a check is one lookup. The cache
+    holds its types weakly, so classes created at runtime (e.g. in tests or by
+    plugins) are freed once nothing else uses them.
+    """
+    protocols = weakref.WeakSet()  # Every protocol with a cache, for clear_conformance_cache()
+
+    def __init__(cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Type -> conforms. Names starting with "_abc_" are not taken for protocol members.
+        cls._abc_conformance = weakref.WeakKeyDictionary()
+        CachedProtocolMeta.protocols.add(cls)
+
+    def __instancecheck__(cls, instance):
+        try:
+            return cls._abc_conformance[type(instance)]
+        except KeyError:
+            conforms = super().__instancecheck__(instance)
+            cls._abc_conformance[type(instance)] = conforms
+            return conforms
+
+
+def clear_conformance_cache():
+    """Forgets all cached results, e.g. after methods were added to a class."""
+    for protocol in CachedProtocolMeta.protocols:
+        protocol._abc_conformance.clear()
+
+
+@runtime_checkable
+class Bird(Protocol, metaclass=CachedProtocolMeta):
+    """
+    Anything that can fly and swim, checked with a per-type cache.
+    """
+    def fly(self):
+        ...
+
+    def swim(self):
+        ...
+
+
+@runtime_checkable
+class UncachedBird(Protocol):
+    """
+    The same protocol with the standard (uncached) isinstance() check.
+    """
+    def fly(self):
+        ...
+
+    def swim(self):
+        ...
+
+
+def require_bird(obj):
+    """
+    Validates an incoming object.
+
+    Raises:
+    TypeError: If obj lacks fly() or swim().
+    """
+    if not isinstance(obj, Bird):
+        missing = [name for name in ("fly", "swim") if not callable(getattr(obj, name, None))]
+        raise TypeError(f"{type(obj).__name__} is not a Bird: missing {', '.join(missing)}")
+    return obj
+
+
+# ===== Benchmark: duck typing vs ABC vs protocol checks =====
+
+class Penguin:
+    """Swims, but cannot fly: not a Bird."""
+    def swim(self):
+        output_sink.emit("Penguin swims fast.")
+
+
+def has_bird_methods(obj):
+    """The duck-typing check: look the methods up on the object."""
+    return callable(getattr(obj, "fly", None)) and callable(getattr(obj, "swim", None))
+
+
+def run_benchmark(count=1_000_000):
+    classes = [
+        birds_v1.Duck, birds_v1.Swan, birds_v1.Albatross,
+        birds_v2.Duck, birds_v2.Swan, birds_v2.Albatross,
+        birds_v3.Duck, birds_v3.Swan, birds_v3.Albatross,
+        Penguin, object, int, str,
+    ]
+    rng = random.Random(0)
+    objects = [rng.choice(classes)() for _ in range(count)]
+
+    checks = [
+        ("duck typing (getattr)", has_bird_methods),
+        ("ABC isinstance (v3 only)", lambda obj: isinstance(obj, birds_v3.Bird)),
+        ("Protocol isinstance", lambda obj: isinstance(obj, UncachedBird)),
+        ("cached Protocol isinstance", lambda obj: isinstance(obj, Bird)),
+    ]
+    print(f"{count:,} objects of {len(classes)} types")
+    for label, check in checks:
+        start = time.perf_counter()
+        birds = sum(map(check, objects))
+        elapsed = time.perf_counter() - start
+        print(f"{label:>28}: {elapsed * 1e9 / count:8.1f} ns/check, {birds:,} birds")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,180 @@
+# bird_registry.py - LAZY BIRD REGISTRY
+#
+# main.py used to import birds_v1, birds_v2 and birds_v3 up front, whether or
+# not their birds were used. With hundreds of species modules, importing all
+# of them would dominate startup.
+#
+# Here a species is registered by name with the place it lives, as text:
+#
+#   register("duck_typing.Duck", "birds_v2:Duck")
+#
+# Registering and listing import nothing. The module is imported the first
+# time load() asks for one of its birds, and the class is cached from then
+# on. Names are "<family>.<species>"; a family is one implementation of the
+# birds (inheritance, duck_typing, abc).
+#
+# Usage:
+#   python bird_registry.py [SPECIES]    # Default: 300 generated species modules
+import importlib
+import os
+import sys
+
+# Species name -> "module:Class"
+REGISTRY = {}
+
+# Species name -> class, for every species loaded so far
+LOADED = {}
+
+
+def register(name, target, replace=False):
+    """
+    Registers a species without importing it.
+
+    Args:
+    name (str): "<family>.<species>", e.g. "abc.Duck".
+    target (str): "module:Class", e.g. "birds_v3:Duck".
+    replace (bool): Allow replacing an existing registration.
+
+    Raises:
+    ValueError: If the name is taken (and replace is false) or a part is malformed.
+    """
+    if name.count(".") != 1 or ":" not in target:
+        raise ValueError(f"Expected '<family>.<species>' and 'module:Class', got {name!r} and {target!r}")
+    if name in REGISTRY and not replace:
+        raise ValueError(f"{name!r} is already registered as {REGISTRY[name]!r}")
+    REGISTRY[name] = target
+    LOADED.pop(name, None)
+
+
+def names(family=None):
+    """Returns the registered species names, optionally of one family, in registration order."""
+    if family is None:
+        return list(REGISTRY)
+    prefix = family + "."
+    return [name for name in REGISTRY if name.startswith(prefix)]
+
+
+def families():
+    return list(dict.fromkeys(name.partition(".")[0] for name in REGISTRY))
+
+
+def load(name):
+    """
+    Returns the class registered as name, importing its module on first use.
+
+    Raises:
+    KeyError: If no species is registered as name.
+    """
+    cls = LOADED.get(name)
+    if cls is None:
+        try:
+            target = REGISTRY[name]
+        except KeyError:
+            raise KeyError(f"No bird registered as {name!r}") from None
+        module, _, attribute = target.partition(":")
+        cls = LOADED[name] = getattr(importlib.import_module(module), attribute)
+    return cls
+
+
+def load_family(family):
+    """Returns the classes of one family, in registration order."""
+    return [load(name) for name in names(family)]
+
+
+for _family, _module in (("inheritance", "birds_v1"), ("duck_typing", "birds_v2"), ("abc", "birds_v3")):
+    for _species in ("Duck", "Swan", "Albatross"):
+        register(f"{_family}.{_species}", f"{_module}:{_species}")
+del _family, _module, _species
+
+
+# ===== Benchmark: eager imports vs the registry, with -X importtime =====
+
+SPECIES_MODULE = '''\
+import birds_v2
+
+
+class {name}(birds_v2.Bird):
+    WINGSPAN = {wingspan}
+
+    def fly(self):
+        return "{name} is flying."
+
+    def swim(self):
+        return "{name} is swimming."
+'''
+
+EAGER_SCRIPT = '''\
+{imports}
+CLASSES = [{classes}]
+print(CLASSES[0]().fly())
+'''
+
+LAZY_SCRIPT = '''\
+import sys
+
+import bird_registry
+{registrations}
+if sys.argv[1:] == ["list"]:
+    print(len(bird_registry.names()), "species")
+else:
+    print(bird_registry.load("generated.{first}")().fly())
+'''
+
+
+def import_times(script, directory):
+    """
+    Runs script with -X importtime.
+
+    Returns:
+    tuple: (wall time in s, total self import time in us, number of modules imported)
+    """
+    import re  # The benchmark's imports stay out of the registry's own startup cost.
+    import subprocess
+    import time
+
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, os.path.dirname(os.path.abspath(__file__))]))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", *script], cwd=directory, env=environment,
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    # Lines look like "import time:       123 |        456 | module"
+    self_times = [int(match[1]) for match in re.finditer(r"import time:\s+(\d+) \|", result.stderr)]
+    return elapsed, sum(self_times), len(self_times)
+
+
+def run_benchmark(species=300):
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        modules = [f"species_{i:04d}" for i in range(species)]
+        classes = [f"Species{i:04d}" for i in range(species)]
+        for module, name in zip(modules, classes):
+            with open(os.path.join(directory, f"{module}.py"), "w") as output:
+                output.write(SPECIES_MODULE.format(name=name, wingspan=len(name)))
+        with open(os.path.join(directory, "eager.py"), "w") as output:
+            output.write(EAGER_SCRIPT.format(
+                imports="\n".join(f"from {module} import {name}" for module, name in zip(modules, classes)),
+                classes=", ".join(classes)))
+        with open(os.path.join(directory, "lazy.py"), "w") as output:
+            output.write(LAZY_SCRIPT.format(
+                registrations="\n".join(f'bird_registry.register("generated.{name}", "{module}:{name}")'
+                                        for module, name in zip(modules, classes)),
+                first=classes[0]))
+        with open(os.path.join(directory, "empty.py"), "w") as output:
+            output.write("")
+
+        print(f"{species} generated species modules (best of 5 runs)")
+        runs = [
+            ("interpreter only", ["empty.py"]),
+            ("eager imports, use one species", ["eager.py"]),
+            ("registry, use one species", ["lazy.py"]),
+            ("registry, list all species", ["lazy.py", "list"]),
+        ]
+        for label, script in runs:
+            elapsed, self_time, count = min(import_times(script, directory) for _ in range(5))
+            print(f"{label:>32}: {elapsed * 1e3:7.1f} ms wall, {self_time / 1e3:7.1f} ms importing "
+                  f"{count} modules")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -1,24 +1,26 @@
 # birds_v1.py - INHERITANCE BIRDS
+import output_sink
+
 
 class Duck:
     def swim(self):
-        print("Duck is swimming gracefully.")
+        output_sink.emit("Duck is swimming gracefully.")
 
     def fly(self):
-        print("Duck is flying at a moderate height.")
+        output_sink.emit("Duck is flying at a moderate height.")
 
 
 class Swan:
     def swim(self):
-        print("Swan is gliding elegantly on the water.")
+        output_sink.emit("Swan is gliding elegantly on the water.")
 
     def fly(self):
-        print("Swan is flying with long, smooth strokes.")
+        output_sink.emit("Swan is flying with long, smooth strokes.")
 
 
 class Albatross:
     def swim(self):
-        print("Albatross swims when necessary, though it prefers flying.")
+        output_sink.emit("Albatross swims when necessary, though it prefers flying.")
 
     def fly(self):
-        print("Albatross soars for hours without flapping its wings.")
\ No newline at end of file
+        output_sink.emit("Albatross soars for hours without flapping its wings.")
\ No newline at end of file
@@ -0,0 +1,319 @@
+# flock.py - STRUCT-OF-ARRAYS FLOCK ENGINE
+#
+# birds_v1/v2/v3 create one object per bird, whose fly() and swim() write a
+# line. That is fine for three birds and hopeless for ten million. Flock keeps
+# all birds as columns of NumPy arrays instead (struct of arrays):
+#
+#   species   uint8     0 = Duck, 1 = Swan, 2 = Albatross
+#   position  float32   3 x N (x, y, altitude)
+#   velocity  float32   2 x N (horizontal)
+#   energy    float32   0.0 (exhausted) .. 1.0 (rested)
+#   flying    bool      True in the air, False on the water
+#
+# Birds are stored grouped by species, so each species' behavior is applied
+# to one contiguous slice of every column, with in-place array operations:
+# flying birds move at full speed, climb towards their cruising altitude and
+# spend energy; swimming birds paddle slowly and rest; exhausted birds land
+# and rested birds take off. Only element-wise operations are used, so any
+# split of the rows into chunks gives bit-identical results.
+#
+# flock[i] returns a thin view of bird i, which is also a birds_v2 Duck, Swan
+# or Albatross: code written for the bird classes keeps working, and calling
+# fly() or swim() on the view updates the columns. The views' fly_many() and
+# swim_many() do the same for many views at once (see batch_dispatch.py).
+#
+# Usage:
+#   python flock.py [BIRDS] [TICKS]    # Default: 10 million birds, 20 ticks
+import sys
+import time
+from itertools import repeat
+from operator import attrgetter
+
+import birds_v2
+import output_sink
+
+try:
+    import numpy as np  # Required by Flock; the module imports without it.
+except ImportError:
+    np = None
+
+
+class Behavior:
+    """
+    How one species flies, swims and rests (speeds in m/s, energy per second).
+    """
+    __slots__ = ("name", "cls", "speed", "swim_factor", "cruise_altitude", "climb_rate",
+                 "fly_cost", "rest_gain", "land_below", "take_off_above")
+
+    def __init__(self, name, cls, speed, swim_factor, cruise_altitude, climb_rate,
+                 fly_cost, rest_gain, land_below, take_off_above):
+        self.name = name
+        self.cls = cls
+        self.speed = speed
+        self.swim_factor = swim_factor
+        self.cruise_altitude = cruise_altitude
+        self.climb_rate = climb_rate
+        self.fly_cost = fly_cost
+        self.rest_gain = rest_gain
+        self.land_below = land_below
+        self.take_off_above = take_off_above
+
+
+# Behavior per species code; the codes are the positions in this list.
+BEHAVIORS = [
+    # The duck stays near the water surface.
+    Behavior("Duck", birds_v2.Duck, speed=15, swim_factor=0.3, cruise_altitude=20, climb_rate=0.5,
+             fly_cost=0.05, rest_gain=0.04, land_below=0.2, take_off_above=0.8),
+    Behavior("Swan", birds_v2.Swan, speed=20, swim_factor=0.25, cruise_altitude=60, climb_rate=0.3,
+             fly_cost=0.04, rest_gain=0.03, land_below=0.2, take_off_above=0.8),
+    # The albatross soars for hours without flapping its wings.
+    Behavior("Albatross", birds_v2.Albatross, speed=30, swim_factor=0.2, cruise_altitude=200, climb_rate=0.2,
+             fly_cost=0.005, rest_gain=0.02, land_below=0.1, take_off_above=0.6),
+]
+
+# Species code by name
+SPECIES = {behavior.name: code for code, behavior in enumerate(BEHAVIORS)}
+
+
+class Flock:
+    """
+    Millions of birds stored as columns, grouped by species.
+    """
+    # Names of the column attributes, in the order from_columns takes them
+    COLUMNS = ("species", "position", "velocity", "energy", "flying", "scratch")
+
+    def __init__(self, counts, seed=0):
+        """
+        Args:
+        counts (dict | list): Number of birds per species name, or per species code.
+        seed (int): Seed of the random start positions, velocities and energies.
+        """
+        if np is None:
+            raise ImportError("Flock requires NumPy")
+        if isinstance(counts, dict):
+            counts = [counts.get(behavior.name, 0) for behavior in BEHAVIORS]
+        size = sum(counts)
+        self.species = np.repeat(np.arange(len(BEHAVIORS), dtype=np.uint8), counts)
+        # Rows [start, stop) of each species, by code
+        bounds = np.cumsum([0, *counts]).tolist()
+        self.ranges = list(zip(bounds[:-1], bounds[1:]))
+
+        rng = np.random.default_rng(seed)
+        self.position = np.zeros((3, size), dtype=np.float32)
+        self.position[:2] = rng.uniform(-1000, 1000, (2, size))
+        heading = rng.uniform(0, 2 * np.pi, size)
+        speed = np.array([behavior.speed for behavior in BEHAVIORS], dtype=np.float32)[self.species]
+        self.velocity = np.stack([np.cos(heading) * speed, np.sin(heading) * speed]).astype(np.float32)
+        self.energy = rng.uniform(0, 1, size).astype(np.float32)
+        self.flying = self.energy > 0.5
+        self.scratch = np.empty((2, size), dtype=np.float32)  # Reused by every tick
+        self.ticks = 0
+
+    @classmethod
+    def from_columns(cls, species, position, velocity, energy, flying, scratch, ticks=0):
+        """
+        Returns a flock over existing columns (e.g. in shared memory), without copying them.
+
+        The species column must be grouped by species, as Flock creates it.
+        """
+        flock = cls.__new__(cls)
+        flock.species, flock.position, flock.velocity = species, position, velocity
+        flock.energy, flock.flying, flock.scratch = energy, flying, scratch
+        bounds = np.cumsum([0, *np.bincount(species, minlength=len(BEHAVIORS))]).tolist()
+        flock.ranges = list(zip(bounds[:-1], bounds[1:]))
+        flock.ticks = ticks
+        return flock
+
+    def __len__(self):
+        return len(self.species)
+
+    def __getitem__(self, row):
+        if not -len(self) <= row < len(self):
+            raise IndexError("bird index out of range")
+        row %= len(self)
+        return VIEWS[self.species[row]](self, row)
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def tick(self, dt=0.1):
+        """Advances every bird by dt seconds."""
+        self.step(0, len(self), dt)
+        self.ticks += 1
+
+    def step(self, start, stop, dt):
+        """Advances the birds in rows [start, stop) by dt seconds."""
+        for behavior, (first, last) in zip(BEHAVIORS, self.ranges):
+            low, high = max(start, first), min(stop, last)
+            if low < high:
+                self.behave(behavior, slice(low, high), dt)
+
+    def behave(self, behavior, rows, dt):
+        """Applies one species' behavior to a slice of rows, in place."""
+        flying = self.flying[rows]
+        x, y, z = self.position[:, rows]
+        vx, vy = self.velocity[:, rows]
+        energy = self.energy[rows]
+        factor, change = self.scratch[:, rows]
+
+        # Horizontal movement: full speed in the air, swim_factor of it on the water
+        np.multiply(flying, np.float32((1 - behavior.swim_factor) * dt), out=factor)
+        factor += np.float32(behavior.swim_factor * dt)
+        np.multiply(vx, factor, out=change)
+        x += change
+        np.multiply(vy, factor, out=change)
+        y += change
+
+        # Altitude: climb towards the cruising altitude in the air
+        np.subtract(np.float32(behavior.cruise_altitude), z, out=change)
+        change *= np.float32(min(1.0, behavior.climb_rate * dt))
+        z += change
+
+        # Energy: spent in the air, regained on the water
+        np.multiply(flying, np.float32(-(behavior.fly_cost + behavior.rest_gain) * dt), out=change)
+        change += np.float32(behavior.rest_gain * dt)
+        energy += change
+        np.clip(energy, 0, 1, out=energy)
+
+        # Land when exhausted, take off when rested
+        flying &= energy > behavior.land_below
+        flying |= energy >= behavior.take_off_above
+        z *= flying  # After landing: birds on the water are at altitude 0.
+
+    def census(self):
+        """Returns {species name: (flying, swimming)}."""
+        result = {}
+        for behavior, (first, last) in zip(BEHAVIORS, self.ranges):
+            flying = int(np.count_nonzero(self.flying[first:last]))
+            result[behavior.name] = (flying, last - first - flying)
+        return result
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.COLUMNS)
+
+
+class BirdView:
+    """
+    One row of a Flock, usable where a birds_v2 bird is expected.
+    """
+    # The bird classes have no __slots__, so views get a __dict__ regardless.
+
+    def __init__(self, flock, row):
+        self.flock = flock
+        self.row = row
+
+    @property
+    def behavior(self):
+        return BEHAVIORS[self.flock.species[self.row]]
+
+    @property
+    def position(self):
+        return tuple(self.flock.position[:, self.row].tolist())
+
+    @property
+    def velocity(self):
+        return tuple(self.flock.velocity[:, self.row].tolist())
+
+    @property
+    def energy(self):
+        return float(self.flock.energy[self.row])
+
+    @property
+    def flying(self):
+        return bool(self.flock.flying[self.row])
+
+    def fly(self):
+        self.flock.flying[self.row] = True
+        super().fly()
+
+    def swim(self):
+        self.flock.flying[self.row] = False
+        self.flock.position[2, self.row] = 0
+        super().swim()
+
+    @classmethod
+    def fly_many(cls, views):
+        """fly() for many views of this class: one column update per flock, one write."""
+        for flock, rows in cls.rows_by_flock(views).items():
+            flock.flying[rows] = True
+        output_sink.emit_many(repeat(cls.message("fly"), len(views)))
+
+    @classmethod
+    def swim_many(cls, views):
+        """swim() for many views of this class: one column update per flock, one write."""
+        for flock, rows in cls.rows_by_flock(views).items():
+            flock.flying[rows] = False
+            flock.position[2, rows] = 0
+        output_sink.emit_many(repeat(cls.message("swim"), len(views)))
+
+    @staticmethod
+    def rows_by_flock(views):
+        """Returns {flock: row array} for views, usually of a single flock."""
+        flocks = set(map(attrgetter("flock"), views))
+        if len(flocks) == 1:
+            rows = np.fromiter(map(attrgetter("row"), views), dtype=np.intp, count=len(views))
+            return {flocks.pop(): rows}
+        rows = {}
+        for view in views:
+            rows.setdefault(view.flock, []).append(view.row)
+        return {flock: np.array(flock_rows, dtype=np.intp) for flock, flock_rows in rows.items()}
+
+    @classmethod
+    def message(cls, method):
+        """The line the bird class writes from method (its methods do not depend on the bird)."""
+        if (cls, method) not in MESSAGES:
+            bird_class = next(base for base in cls.__mro__ if base.__module__ == birds_v2.__name__)
+            with output_sink.use_sink(output_sink.RecordingSink()) as recording:
+                getattr(bird_class(), method)()
+            MESSAGES[cls, method], = recording.lines
+        return MESSAGES[cls, method]
+
+    def __repr__(self):
+        state = "flying" if self.flying else "swimming"
+        return f"<{self.behavior.name} #{self.row} {state} at {self.position}, energy {self.energy:.2f}>"
+
+
+class DuckView(BirdView, birds_v2.Duck):
+    pass
+
+
+class SwanView(BirdView, birds_v2.Swan):
+    pass
+
+
+class AlbatrossView(BirdView, birds_v2.Albatross):
+    pass
+
+
+# View class per species code
+VIEWS = [DuckView, SwanView, AlbatrossView]
+
+# (view class, method name) -> the line it writes, filled by BirdView.message
+MESSAGES = {}
+
+
+# ===== Benchmark: ticks per second =====
+
+def run_benchmark(birds=10_000_000, ticks=20):
+    share = birds // len(BEHAVIORS)
+    counts = [share] * len(BEHAVIORS)
+    counts[0] += birds - sum(counts)
+
+    start = time.perf_counter()
+    flock = Flock(counts)
+    print(f"{birds:,} birds created in {time.perf_counter() - start:.2f} s, "
+          f"{flock.nbytes() / 2**20:,.0f} MiB ({flock.nbytes() / birds:.0f} bytes per bird)")
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        flock.tick()
+    elapsed = time.perf_counter() - start
+    print(f"{ticks} ticks in {elapsed:.2f} s: {ticks / elapsed:.1f} ticks/s, "
+          f"{elapsed / ticks * 1e3:.1f} ms/tick, {birds * ticks / elapsed / 1e6:.0f} M bird updates/s")
+    for name, (flying, swimming) in flock.census().items():
+        print(f"{name:>10}: {flying:,} flying, {swimming:,} swimming")
+    print(flock[0])
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:3]))
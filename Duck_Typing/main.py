@@ -1,7 +1,23 @@
 # main.py - COMMON DRIVER CODE
-from birds_v1 import Duck as InheritanceDuck, Swan as InheritanceSwan, Albatross as InheritanceAlbatross
-from birds_v2 import Duck as DuckTypingDuck, Swan as DuckTypingSwan, Albatross as DuckTypingAlbatross
-from birds_v3 import Duck as ABCDuck, Swan as ABCSwan, Albatross as ABCAlbatross
+#
+# The birds are loaded through bird_registry, so only the implementations
+# that are run get imported.
+#
+# Usage:
+#   python main.py               # Run every family and the ABC demonstrations
+#   python main.py list          # List the registered birds (imports none of them)
+#   python main.py NAME ...      # Run the named birds, e.g. abc.Duck duck_typing.Swan
+import sys
+
+import bird_registry
+import output_sink
+
+# Heading of each family
+TITLES = {
+    "inheritance": "Inheritance Birds",
+    "duck_typing": "Duck Typing Birds",
+    "abc": "Abstract Base Class Birds",
+}
 
 
 def test_birds(bird_classes):
@@ -12,20 +28,29 @@ def test_birds(bird_classes):
 
 
 def main():
-    print("=== Inheritance Birds ===")
-    test_birds([InheritanceDuck, InheritanceSwan, InheritanceAlbatross])
-    print("\n=== Duck Typing Birds ===")
-    test_birds([DuckTypingDuck, DuckTypingSwan, DuckTypingAlbatross])
-    print("\n=== Abstract Base Class Birds ===")
-    test_birds([ABCDuck, ABCSwan, ABCAlbatross])
-    
+    for index, (family, title) in enumerate(TITLES.items()):
+        if index:
+            output_sink.emit("")
+        output_sink.emit(f"=== {title} ===")  # Through the sink, so headings stay in order with the birds
+        test_birds(bird_registry.load_family(family))
+
     # Demonstrate ABC-specific features
-    print("\n=== ABC Features Demonstration ===")
-    import birds_v3
+    output_sink.emit("\n=== ABC Features Demonstration ===")
+    import birds_v3  # Already imported by the registry for the ABC birds
     birds_v3.demonstrate_abc_error()
-    print()
+    output_sink.emit("")
     birds_v3.demonstrate_incomplete_implementation()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    match sys.argv[1:]:
+        case []:
+            main()
+        case ["list"]:
+            for family in bird_registry.families():
+                print(f"{family}: {', '.join(name.partition('.')[2] for name in bird_registry.names(family))}")
+        case names:
+            try:
+                test_birds([bird_registry.load(name) for name in names])
+            except KeyError as error:
+                sys.exit(f"{error.args[0]}; see: python main.py list")
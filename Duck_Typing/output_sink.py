@@ -0,0 +1,208 @@
+# output_sink.py - PLUGGABLE OUTPUT SINKS
+#
+# Every bird method used to print() its line. print() writes twice per call
+# (the text and the newline), and to a terminal, which is line buffered, each
+# line becomes a system call. The birds now hand their lines to the current
+# sink instead, through output_sink.emit(line):
+#
+#   StreamSink    writes each line to sys.stdout right away (the default,
+#                 behaves like print, including under redirect_stdout)
+#   BufferedSink  collects lines in memory and writes them in large blocks
+#   NullSink      discards everything, for benchmarks
+#   RecordingSink keeps the lines as a list, for tests
+#
+# emit is the bound write method of the current sink, so a bird's line costs
+# one call. Select a sink with use_sink() (restores the previous one) or
+# set_sink(). A BufferedSink is flushed whenever it is replaced, closed or
+# left as a context manager, and the current sink is flushed at interpreter
+# exit (one atexit handler for the module, not one per sink); only a hard exit
+# (os._exit, a fatal signal) loses pending lines. Everything written to the
+# terminal alongside the birds (headings, demo messages) goes through emit
+# too, or a buffered sink would write the birds' lines after it.
+#
+# The sinks are for the birds only. The demos in the other folders keep
+# print(), for three reasons:
+# - Each folder is a standalone set of scripts, run from its own directory,
+#   so thread_safety/ and structural_pattern_matching/ cannot import this module.
+# - The bank reports and the counter demos print a few dozen lines per run.
+#   They are not hot paths, and their sleeps are deliberate.
+# - Colors at scale go through color_dispatch.describe_colors, which returns
+#   the messages of process_color without printing them.
+#
+# Usage:
+#   python output_sink.py [BIRDS]    # Default: 1 million; test_birds with each sink
+import atexit
+import os
+import sys
+from contextlib import contextmanager, redirect_stdout
+
+# Lines a BufferedSink collects before writing them as one block
+BLOCK_LINES = 8192
+
+
+class StreamSink:
+    """
+    Writes every line immediately, like print().
+    """
+
+    def __init__(self, stream=None):
+        """
+        Args:
+        stream: A text file; None means whatever sys.stdout is at the time of writing.
+        """
+        self.stream = stream
+
+    def write(self, line):
+        (sys.stdout if self.stream is None else self.stream).write(line + "\n")
+
+    def writelines(self, lines):
+        (sys.stdout if self.stream is None else self.stream).write("".join(line + "\n" for line in lines))
+
+    def flush(self):
+        (sys.stdout if self.stream is None else self.stream).flush()
+
+    def close(self):
+        self.flush()
+
+
+class BufferedSink(StreamSink):
+    """
+    Collects lines in memory and writes them BLOCK_LINES at a time.
+    """
+
+    def __init__(self, stream=None, block_lines=BLOCK_LINES):
+        super().__init__(stream)
+        self.block_lines = block_lines
+        self.lines = []
+
+    def write(self, line):
+        lines = self.lines
+        lines.append(line)
+        if len(lines) >= self.block_lines:
+            self.flush()
+
+    def writelines(self, lines):
+        self.lines.extend(lines)
+        if len(self.lines) >= self.block_lines:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            lines, self.lines = self.lines, []
+            super().write("\n".join(lines))  # One write for the whole block
+        super().flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NullSink:
+    """
+    Discards every line.
+    """
+
+    def write(self, line):
+        pass
+
+    def writelines(self, lines):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingSink(NullSink):
+    """
+    Keeps every line, in order, in self.lines.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.write = self.lines.append  # Bound list method: no Python code per line
+        self.writelines = self.lines.extend
+
+
+# The sink the birds write to, and its write and writelines methods
+sink = StreamSink()
+emit = sink.write
+emit_many = sink.writelines
+
+
+@atexit.register
+def flush_at_exit():
+    """Writes the lines the current sink still holds when the interpreter exits."""
+    sink.flush()
+
+
+def set_sink(new_sink):
+    """
+    Makes new_sink the current sink; the previous one is flushed.
+
+    Returns:
+    The previous sink.
+    """
+    global sink, emit, emit_many
+    previous = sink
+    previous.flush()
+    sink, emit, emit_many = new_sink, new_sink.write, new_sink.writelines
+    return previous
+
+
+@contextmanager
+def use_sink(new_sink):
+    """Writes to new_sink inside the with block, then flushes it and restores the previous sink."""
+    previous = set_sink(new_sink)
+    try:
+        yield new_sink
+    finally:
+        set_sink(previous)
+
+
+# ===== Benchmark: test_birds over a million birds with each sink =====
+
+def run_benchmark(count=1_000_000):
+    # The birds write to the imported module's sink, not to this script's (__main__).
+    from output_sink import BufferedSink, NullSink, RecordingSink, StreamSink, use_sink
+    import tempfile  # Imported here: every bird imports this module.
+    import time
+    import birds_v1
+    import birds_v2
+    import birds_v3
+    from main import test_birds
+
+    classes = [
+        birds_v1.Duck, birds_v1.Swan, birds_v1.Albatross,
+        birds_v2.Duck, birds_v2.Swan, birds_v2.Albatross,
+        birds_v3.Duck, birds_v3.Swan, birds_v3.Albatross,
+    ]
+    bird_classes = classes * (count // len(classes)) + classes[:count % len(classes)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        def timed(label, make_sink, line_buffering=False):
+            # A line-buffered file writes every line, like a terminal does.
+            path = os.path.join(directory, "birds.txt")
+            with open(path, "w", buffering=1 if line_buffering else -1) as output, redirect_stdout(output):
+                start = time.perf_counter()
+                with use_sink(make_sink()):
+                    test_birds(bird_classes)
+                elapsed = time.perf_counter() - start
+            print(f"{label:>40}: {elapsed * 1e9 / count:7.1f} ns/bird, "
+                  f"{os.path.getsize(path) / 2**20:6.1f} MiB written")
+
+        print(f"test_birds over {count:,} birds (fly and swim each)")
+        for line_buffering in (True, False):
+            kind = "line-buffered file" if line_buffering else "block-buffered file"
+            timed(f"StreamSink, {kind}", StreamSink, line_buffering)
+            timed(f"BufferedSink, {kind}", BufferedSink, line_buffering)
+        timed("RecordingSink", RecordingSink)
+        timed("NullSink", NullSink)
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
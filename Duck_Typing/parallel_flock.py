@@ -0,0 +1,248 @@
+# parallel_flock.py - MULTI-PROCESS FLOCK SIMULATION
+#
+# Flock.tick() (flock.py) runs its array operations on one core. Here the
+# columns of a Flock live in one multiprocessing.shared_memory block, and a
+# team of worker processes owns one contiguous range of rows each:
+#
+#   main:     set the command  -> barrier --------------------> barrier -> ...
+#   worker i:                     barrier -> step(own rows) --> barrier -> ...
+#
+# The first barrier starts a tick, the second ends it, so no worker starts
+# tick t + 1 before every worker has finished tick t. The work of a tick is
+# Flock.step() over the worker's rows; its operations are element-wise, so
+# the columns are bit-identical to Flock.tick() in a single process,
+# whatever the split.
+#
+# Rows do not all cost the same: a worker whose rows span several species
+# runs each species' operations separately, and cores are not all equally
+# fast. Each worker adds up the time it spends stepping; every
+# rebalance_every ticks, if the slowest worker took more than tolerance
+# longer than the average, the rows are redistributed in proportion to the
+# measured speed of each worker. Boundaries are multiples of ALIGN rows, so
+# no two workers write to the same cache line.
+#
+# Usage:
+#   python parallel_flock.py [BIRDS] [TICKS] [WORKERS]    # Default: 10 million, 20 ticks, all cores
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+from flock import BEHAVIORS, Flock, np
+
+# Worker boundaries are multiples of this many rows (64-byte cache lines of float32).
+ALIGN = 16
+
+# Seconds the main process waits at a barrier before giving up on the workers
+TIMEOUT = 60
+
+# Commands of the control block
+STOP, TICK = 0, 1
+
+
+def layout(size, workers):
+    """
+    Places the columns and the control arrays of a flock in one memory block.
+
+    Returns:
+    tuple: ([(name, dtype, shape, offset)], total size in bytes)
+    """
+    fields = [
+        ("species", np.uint8, (size,)),
+        ("position", np.float32, (3, size)),
+        ("velocity", np.float32, (2, size)),
+        ("energy", np.float32, (size,)),
+        ("flying", np.bool_, (size,)),
+        ("scratch", np.float32, (2, size)),
+        ("control", np.float64, (2,)),           # command, dt
+        ("plan", np.int64, (workers, 2)),        # Rows [start, stop) of each worker
+        ("busy", np.float64, (workers,)),        # Seconds each worker spent stepping
+    ]
+    placed, offset = [], 0
+    for name, dtype, shape in fields:
+        placed.append((name, dtype, shape, offset))
+        offset += -(-np.dtype(dtype).itemsize * int(np.prod(shape)) // 64) * 64  # Keep 64-byte alignment.
+    return placed, offset
+
+
+def attach(buffer, fields):
+    """Returns {name: array} over buffer, without copying."""
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, dtype, shape, offset in fields}
+
+
+def split(size, weights):
+    """
+    Splits rows [0, size) into consecutive ranges proportional to weights.
+
+    Returns:
+    list[tuple[int, int]]: One (start, stop) per weight; boundaries are multiples of ALIGN.
+    """
+    shares = np.cumsum(weights, dtype=np.float64) / np.sum(weights, dtype=np.float64)
+    bounds = [0] + [min(size, int(round(size * share / ALIGN)) * ALIGN) for share in shares[:-1]] + [size]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def work(name, size, workers, index, barrier):
+    """A worker process: steps its rows once per tick until told to stop."""
+    memory = SharedMemory(name)
+    try:
+        run_ticks(attach(memory.buf, layout(size, workers)[0]), index, barrier)
+    finally:
+        memory.close()  # Possible once run_ticks has returned: its arrays used the block.
+
+
+def run_ticks(arrays, index, barrier):
+    flock = Flock.from_columns(*(arrays[column] for column in Flock.COLUMNS))
+    control, plan, busy = arrays["control"], arrays["plan"], arrays["busy"]
+    while True:
+        barrier.wait()
+        if control[0] == STOP:
+            return
+        start = time.perf_counter()
+        flock.step(int(plan[index, 0]), int(plan[index, 1]), float(control[1]))
+        busy[index] += time.perf_counter() - start
+        barrier.wait()
+
+
+class ParallelFlock:
+    """
+    A Flock whose ticks are computed by worker processes over shared memory.
+    """
+
+    def __init__(self, counts, workers=None, seed=0, rebalance_every=10, tolerance=0.1):
+        """
+        Args:
+        counts (dict | list): Number of birds per species, as for Flock.
+        workers (int | None): Number of worker processes; all cores by default.
+        seed (int): As for Flock; equal seeds give equal flocks.
+        rebalance_every (int): Ticks between load checks; 0 never rebalances.
+        tolerance (float): Imbalance (slowest worker vs average) accepted without rebalancing.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.rebalance_every = rebalance_every
+        self.tolerance = tolerance
+        self.rebalances = 0
+        source = Flock(counts, seed)
+        size = len(source)
+        fields, total = layout(size, self.workers)
+        self.memory = SharedMemory(create=True, size=max(total, 1))
+        self.processes = []
+        arrays = {}
+        try:
+            arrays.update(attach(self.memory.buf, fields))
+            for column in Flock.COLUMNS:
+                arrays[column][...] = getattr(source, column)
+            del source
+            self.flock = Flock.from_columns(*(arrays[column] for column in Flock.COLUMNS))
+            self.control, self.plan, self.busy = arrays["control"], arrays["plan"], arrays["busy"]
+            # Start evenly, with each species' rows weighted alike.
+            self.plan[:] = split(size, [1] * self.workers)
+
+            self.barrier = multiprocessing.Barrier(self.workers + 1)
+            for index in range(self.workers):
+                process = multiprocessing.Process(
+                    target=work, args=(self.memory.name, size, self.workers, index, self.barrier), daemon=True)
+                process.start()
+                self.processes.append(process)
+        except BaseException:
+            arrays.clear()
+            self.close()
+            raise
+
+    def __len__(self):
+        return len(self.flock)
+
+    def tick(self, dt=0.1):
+        """Advances every bird by dt seconds, using all workers."""
+        self.control[:] = (TICK, dt)
+        self.barrier.wait(TIMEOUT)  # Start the tick
+        self.barrier.wait(TIMEOUT)  # Wait until every worker has finished it
+        self.flock.ticks += 1
+        if self.rebalance_every and self.flock.ticks % self.rebalance_every == 0:
+            self.rebalance()
+
+    def ownership(self):
+        """Returns the rows [start, stop) of each worker."""
+        return [tuple(rows) for rows in self.plan.tolist()]
+
+    def rebalance(self):
+        """
+        Gives each worker rows in proportion to its measured speed, if the load is uneven.
+
+        Returns:
+        bool: True if the rows were redistributed.
+        """
+        busy = self.busy.copy()
+        self.busy[:] = 0
+        rows = self.plan[:, 1] - self.plan[:, 0]
+        if busy.min() <= 0 or busy.max() <= busy.mean() * (1 + self.tolerance):
+            return False
+        speed = np.maximum(rows, ALIGN) / busy  # Rows per second; idle workers still get some.
+        self.plan[:] = split(len(self.flock), speed)
+        self.rebalances += 1
+        return True
+
+    def census(self):
+        return self.flock.census()
+
+    def close(self):
+        """Stops the workers and frees the shared memory; later calls do nothing."""
+        if self.memory is None:
+            return
+        if any(process.is_alive() for process in self.processes):
+            self.control[0] = STOP
+            try:
+                self.barrier.wait(TIMEOUT)
+            except multiprocessing.BrokenBarrierError:
+                pass
+        for process in self.processes:
+            process.join(TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        for name in ("flock", "control", "plan", "busy"):
+            self.__dict__.pop(name, None)
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ===== Benchmark: scaling from 1 to N worker processes =====
+
+def run_benchmark(birds=10_000_000, ticks=20, workers=None):
+    workers = workers or os.cpu_count() or 1
+    share = birds // len(BEHAVIORS)
+    counts = [share] * len(BEHAVIORS)
+    counts[0] += birds - sum(counts)
+
+    flock = Flock(counts)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        flock.tick()
+    single = (time.perf_counter() - start) / ticks
+    print(f"{birds:,} birds, {ticks} ticks, {os.cpu_count()} cores")
+    print(f"{'single process':>16}: {single * 1e3:8.1f} ms/tick")
+
+    for count in range(1, workers + 1):
+        with ParallelFlock(counts, workers=count) as parallel:
+            start = time.perf_counter()
+            for _ in range(ticks):
+                parallel.tick()
+            elapsed = (time.perf_counter() - start) / ticks
+            for column in ("position", "energy", "flying"):
+                assert np.array_equal(getattr(parallel.flock, column), getattr(flock, column)), column
+            speedup = single / elapsed
+            print(f"{count:>6} workers: {elapsed * 1e3:8.1f} ms/tick, speedup {speedup:5.2f}, "
+                  f"efficiency {speedup / count:6.1%}, {parallel.rebalances} rebalances")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:4]))
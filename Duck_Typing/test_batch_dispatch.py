@@ -0,0 +1,97 @@
+"""
+Simple test script to verify that type-grouped dispatch in batch_dispatch.py
+calls every object's method exactly once, using bulk methods where a class
+has them.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+# Import the functions we want to test
+sys.path.append('.')
+import birds_v1
+import birds_v3
+from batch_dispatch import TypeGroups, call_each, dispatch
+from flock import Flock, np
+
+
+class Counter:
+    """Counts its calls; count_many is its bulk version."""
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, step=1):
+        self.calls += step
+        return self.calls
+
+
+class BulkCounter(Counter):
+    bulk_calls = 0
+
+    @classmethod
+    def count_many(cls, counters, step=1):
+        cls.bulk_calls += 1
+        for counter in counters:
+            counter.calls += step
+
+
+def test_same_output_as_per_object_calls():
+    """
+    Grouped calls print the same lines as calling each bird, grouped by type.
+    """
+    birds = [birds_v1.Duck(), birds_v3.Swan(), birds_v1.Duck(), birds_v3.Albatross()]
+    with redirect_stdout(io.StringIO()) as expected:
+        call_each(birds)
+    with redirect_stdout(io.StringIO()) as output:
+        groups = TypeGroups(birds)
+        groups.call("fly")
+        groups.call("swim")
+    assert sorted(output.getvalue().splitlines()) == sorted(expected.getvalue().splitlines())
+    assert list(groups) == [birds[0], birds[2], birds[1], birds[3]]  # Type by type, in order
+    assert len(groups) == 4
+
+
+def test_arguments_bulk_and_results():
+    """
+    Arguments are passed on, bulk methods replace per-object calls, map() collects results.
+    """
+    plain, bulk = [Counter(), Counter()], [BulkCounter(), BulkCounter()]
+    dispatch(plain + bulk, "count", 2)
+    assert [counter.calls for counter in plain + bulk] == [2, 2, 2, 2]
+    assert BulkCounter.bulk_calls == 1
+    dispatch(bulk, "count", bulk=False)
+    assert BulkCounter.bulk_calls == 1 and bulk[0].calls == 3
+    assert TypeGroups(plain + bulk).map("count") == {Counter: [3, 3], BulkCounter: [4, 4]}
+
+    try:
+        dispatch([Counter(), object()], "count")
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("object has no count method")
+
+
+def test_flock_views_bulk():
+    """
+    fly_many()/swim_many() of the flock views change the same rows as fly()/swim().
+    """
+    if np is None:
+        return  # The flock needs NumPy.
+    single, bulk = Flock([40, 30, 30], seed=2), Flock([40, 30, 30], seed=2)
+    rows = list(range(0, 100, 3))
+    with redirect_stdout(io.StringIO()) as expected:
+        for row in rows:
+            single[row].swim()
+    with redirect_stdout(io.StringIO()) as output:
+        TypeGroups(bulk[row] for row in rows).call("swim")
+    assert np.array_equal(single.flying, bulk.flying)
+    assert np.array_equal(single.position, bulk.position)
+    assert sorted(output.getvalue().splitlines()) == sorted(expected.getvalue().splitlines())
+
+
+if __name__ == "__main__":
+    test_same_output_as_per_object_calls()
+    test_arguments_bulk_and_results()
+    test_flock_views_bulk()
+    print("SUCCESS: Grouped dispatch calls every object's method once.")
@@ -0,0 +1,83 @@
+"""
+Simple test script to verify that the flyweights and the pool in bird_pool.py
+behave like fresh birds while sharing and reusing instances.
+"""
+
+import sys
+
+# Import the functions we want to test
+sys.path.append('.')
+import main
+from bird_pool import BirdPool, PooledBird, flyweight, shared
+from birds_v1 import Albatross
+from birds_v2 import Duck, Swan
+from output_sink import RecordingSink, use_sink
+
+
+def test_flyweights():
+    """
+    Flyweights are shared per class, write the same lines, and refuse stateful classes.
+    """
+    assert flyweight(Duck) is flyweight(Duck) and flyweight(Duck) is not flyweight(Swan)
+    assert shared(Duck)() is flyweight(Duck)
+    with use_sink(RecordingSink()) as fresh:
+        main.test_birds([Duck, Swan, Albatross])
+    with use_sink(RecordingSink()) as reused:
+        main.test_birds([shared(Duck), shared(Swan), shared(Albatross)])
+    assert fresh.lines == reused.lines
+
+    class Tagged(Duck):
+        def __init__(self):
+            self.tag = 1
+    try:
+        flyweight(Tagged)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("Tagged instances have state")
+
+
+def test_pool():
+    """
+    Released birds are handed out again, reset, up to max_free of them.
+    """
+    pool = BirdPool(max_free=1)
+    first = pool.acquire(Duck)
+    assert not hasattr(first, "__dict__")
+    with use_sink(RecordingSink()) as recording:
+        first.fly()
+    assert recording.lines == ["Duck is flying, but stays near the water surface."]
+    assert first.altitude == 10.0 and first.energy < 1.0
+
+    second = pool.acquire(Swan, energy=0.5)
+    pool.release(first)
+    pool.release(second)  # The pool is full: left to the garbage collector.
+    again = pool.acquire(Swan, energy=0.5)
+    assert again is first and again.species is flyweight(Swan)
+    assert (again.energy, again.altitude) == (0.5, 0.0)
+    assert (pool.created, pool.reused) == (2, 1)
+    assert isinstance(PooledBird(Duck).species, Duck)
+
+
+def test_double_release():
+    """
+    Releasing a bird twice, or a bird of another pool, raises instead of handing it out twice.
+    """
+    pool = BirdPool(max_free=1)
+    bird = pool.acquire(Duck)
+    pool.release(bird)
+    for stray in [bird, PooledBird(Duck), BirdPool().acquire(Duck)]:
+        try:
+            pool.release(stray)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{stray!r} is not checked out from the pool")
+    assert pool.acquire(Duck) is bird and pool.acquire(Duck) is not bird
+
+
+if __name__ == "__main__":
+    test_flyweights()
+    test_pool()
+    test_double_release()
+    print("SUCCESS: Flyweights and pooled birds behave like fresh birds.")
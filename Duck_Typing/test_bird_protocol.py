@@ -0,0 +1,70 @@
+"""
+Simple test script to verify that the Bird protocol in bird_protocol.py gives
+the same answers as a plain runtime-checkable protocol, cached per type.
+"""
+
+import gc
+import sys
+import weakref
+
+# Import the protocol we want to test
+sys.path.append('.')
+import birds_v1
+import birds_v3
+from bird_protocol import Bird, Penguin, UncachedBird, clear_conformance_cache, require_bird
+
+
+def test_same_answers_as_protocol():
+    """
+    The cached check agrees with the standard protocol check, also when repeated.
+    """
+    objects = [birds_v1.Duck(), birds_v3.Swan(), Penguin(), 42, "text"] * 2
+    assert [isinstance(obj, Bird) for obj in objects] == [isinstance(obj, UncachedBird) for obj in objects]
+    assert [isinstance(obj, Bird) for obj in objects[:5]] == [True, True, False, False, False]
+
+
+def test_cache_is_per_type():
+    """
+    Classes changed after a check need the cache cleared.
+    """
+    class Robot:
+        def fly(self):
+            print("Robot hovers.")
+
+    assert not isinstance(Robot(), Bird)
+    Robot.swim = lambda self: print("Robot floats.")
+    assert not isinstance(Robot(), Bird)  # Still the cached answer.
+    clear_conformance_cache()
+    assert isinstance(Robot(), Bird)
+
+    try:
+        require_bird(Penguin())
+    except TypeError as error:
+        assert "missing fly" in str(error)
+    else:
+        raise AssertionError("A Penguin cannot fly")
+
+
+def test_cache_does_not_keep_classes_alive():
+    """
+    A class that was checked is freed once nothing else uses it.
+    """
+    class Drone:
+        def fly(self):
+            print("Drone buzzes.")
+
+        def swim(self):
+            print("Drone sinks.")
+
+    assert isinstance(Drone(), Bird)
+    drone_class = weakref.ref(Drone)
+    del Drone
+    gc.collect()  # A class is part of reference cycles (e.g. through its __mro__).
+    assert drone_class() is None
+
+
+if __name__ == "__main__":
+    test_same_answers_as_protocol()
+    test_cache_is_per_type()
+    test_cache_does_not_keep_classes_alive()
+    print("SUCCESS: Bird protocol checks are cached per type.")
@@ -0,0 +1,66 @@
+"""
+Simple test script to verify that bird_registry.py lists birds without
+importing them and imports each module on first use only.
+"""
+
+import os
+import subprocess
+import sys
+
+# Import the module we want to test
+sys.path.append('.')
+import bird_registry
+
+
+def test_listing_imports_nothing():
+    """
+    Importing the registry and listing the birds loads no bird module.
+    """
+    code = ("import sys, bird_registry\n"
+            "assert len(bird_registry.names()) == 9\n"
+            "assert bird_registry.families() == ['inheritance', 'duck_typing', 'abc']\n"
+            "print(sorted(name for name in sys.modules if name.startswith('birds_')))\n"
+            "bird_registry.load('abc.Swan')\n"
+            "print(sorted(name for name in sys.modules if name.startswith('birds_')))\n")
+    directory = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-c", code], cwd=directory,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == ["[]", "['birds_v3']"]
+
+
+def test_register_and_load():
+    """
+    Registered birds load from their module, are cached, and names are checked.
+    """
+    import birds_v2
+    assert bird_registry.load("duck_typing.Duck") is birds_v2.Duck
+    assert bird_registry.load_family("duck_typing") == [birds_v2.Duck, birds_v2.Swan, birds_v2.Albatross]
+
+    bird_registry.register("test.Bird", "birds_v2:Bird")
+    try:
+        assert bird_registry.names("test") == ["test.Bird"]
+        assert bird_registry.load("test.Bird") is birds_v2.Bird
+        for name, target in [("test.Bird", "birds_v1:Duck"), ("Bird", "birds_v2:Bird"), ("test.Other", "birds_v2")]:
+            try:
+                bird_registry.register(name, target)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"register({name!r}, {target!r}) should fail")
+        bird_registry.register("test.Bird", "birds_v2:Duck", replace=True)
+        assert bird_registry.load("test.Bird") is birds_v2.Duck
+    finally:
+        del bird_registry.REGISTRY["test.Bird"], bird_registry.LOADED["test.Bird"]
+
+    try:
+        bird_registry.load("test.Missing")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("test.Missing is not registered")
+
+
+if __name__ == "__main__":
+    test_listing_imports_nothing()
+    test_register_and_load()
+    print("SUCCESS: The registry loads birds lazily.")
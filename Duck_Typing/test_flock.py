@@ -0,0 +1,83 @@
+"""
+Simple test script to verify that the flock engine in flock.py updates its
+columns consistently and that its views behave like the bird classes.
+"""
+
+import sys
+
+# Import the class we want to test
+sys.path.append('.')
+import birds_v2
+from flock import BirdView, DuckView, Flock, np
+
+
+def test_chunks_are_bit_identical():
+    """
+    Advancing the rows in any chunks gives exactly the same columns as one tick.
+    """
+    if np is None:
+        return  # The engine needs NumPy.
+    whole, chunked = Flock([500, 300, 200], seed=1), Flock([500, 300, 200], seed=1)
+    for _ in range(50):
+        whole.tick()
+        for start in range(0, len(chunked), 137):
+            chunked.step(start, start + 137, 0.1)
+    for name in ("position", "velocity", "energy", "flying"):
+        assert np.array_equal(getattr(whole, name), getattr(chunked, name)), name
+    assert 0 <= whole.energy.min() and whole.energy.max() <= 1
+
+
+def test_swimming_birds_are_on_the_water():
+    """
+    After every tick, including those in which birds land, swimming birds have altitude 0.
+    """
+    if np is None:
+        return
+    flock = Flock([5000, 3000, 2000], seed=1)
+    for tick in range(300):
+        flock.tick()
+        assert not flock.position[2][~flock.flying].any(), f"tick {tick}"
+    assert flock.position[2][flock.flying].min() > 0  # ... and flying birds are in the air.
+
+
+def test_views():
+    """
+    Views are birds_v2 birds whose fly() and swim() change the columns.
+    """
+    if np is None:
+        return
+    flock = Flock({"Duck": 1, "Albatross": 1})
+    duck, albatross = flock
+    assert isinstance(duck, birds_v2.Duck) and isinstance(albatross, birds_v2.Albatross)
+    duck.swim()
+    assert not flock.flying[0] and flock.position[2, 0] == 0
+    duck.fly()
+    assert duck.flying and flock.census()["Duck"] == (1, 0)
+
+
+def test_messages_of_view_subclasses():
+    """
+    The line of a bulk fly()/swim() comes from the birds_v2 class, wherever it is in the MRO.
+    """
+    if np is None:
+        return
+
+    class Tagged:
+        pass
+
+    class TaggedSwanView(BirdView, Tagged, birds_v2.Swan):
+        pass
+
+    class LoudDuckView(DuckView):
+        pass
+
+    assert TaggedSwanView.message("swim") == "Swan glides gracefully on the water."
+    assert LoudDuckView.message("fly") == "Duck is flying, but stays near the water surface."
+
+
+if __name__ == "__main__":
+    test_chunks_are_bit_identical()
+    test_swimming_birds_are_on_the_water()
+    test_views()
+    test_messages_of_view_subclasses()
+    print("SUCCESS: The flock engine updates birds consistently.")
@@ -0,0 +1,105 @@
+"""
+Simple test script to verify that the output sinks in output_sink.py deliver
+every line the birds write, in order, and that buffered lines are flushed.
+"""
+
+import gc
+import io
+import os
+import subprocess
+import sys
+import weakref
+
+# Import the module we want to test
+sys.path.append('.')
+import output_sink
+from birds_v2 import Duck, Swan
+import main
+from output_sink import BufferedSink, NullSink, RecordingSink, StreamSink, use_sink
+
+
+def test_recording_and_null():
+    """
+    RecordingSink keeps the birds' lines; NullSink drops them; the default returns afterwards.
+    """
+    default = output_sink.sink
+    with use_sink(RecordingSink()) as recording:
+        main.test_birds([Duck, Swan])
+    assert recording.lines == [
+        "Duck is flying, but stays near the water surface.",
+        "Duck swims smoothly in the pond.",
+        "Swan is flying elegantly with long wings.",
+        "Swan glides gracefully on the water.",
+    ]
+    with use_sink(NullSink()):
+        main.test_birds([Duck])
+    assert output_sink.sink is default and output_sink.emit == default.write
+
+
+def test_buffered_blocks():
+    """
+    BufferedSink writes nothing until a block is full, and everything when replaced.
+    """
+    stream = io.StringIO()
+    with use_sink(BufferedSink(stream, block_lines=3)):
+        output_sink.emit("one")
+        output_sink.emit("two")
+        assert stream.getvalue() == ""
+        output_sink.emit_many(["three", "four"])
+        assert stream.getvalue() == "one\ntwo\nthree\nfour\n"
+        output_sink.emit("five")
+    assert stream.getvalue() == "one\ntwo\nthree\nfour\nfive\n"
+
+    unbuffered = io.StringIO()
+    with use_sink(StreamSink(unbuffered)):
+        output_sink.emit_many(["a", "b"])
+    assert unbuffered.getvalue() == "a\nb\n"
+
+
+def test_demo_output_in_order():
+    """
+    Headings and demo messages go through the sink, so a buffered run prints them in order.
+    """
+    stream = io.StringIO()
+    with use_sink(BufferedSink(stream)):
+        main.main()
+    lines = stream.getvalue().splitlines()
+    assert lines[:2] == ["=== Inheritance Birds ===", "Duck is flying at a moderate height."]
+    assert lines.index("=== Duck Typing Birds ===") == 8
+    assert lines.index("=== ABC Features Demonstration ===") < lines.index("Created a Duck instance successfully")
+
+
+def test_sinks_are_not_kept_alive():
+    """
+    Buffered sinks are not registered with atexit one by one: dropped sinks are freed.
+    """
+    stream = io.StringIO()
+    sink = BufferedSink(stream)
+    with use_sink(sink):
+        output_sink.emit("kept")
+    reference = weakref.ref(sink)
+    del sink
+    gc.collect()
+    assert reference() is None and stream.getvalue() == "kept\n"
+
+
+def test_flush_on_exit():
+    """
+    Lines still buffered when the interpreter exits are written out.
+    """
+    code = ("import output_sink\n"
+            "output_sink.set_sink(output_sink.BufferedSink())\n"
+            "output_sink.emit('last words')\n")
+    directory = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-c", code], cwd=directory,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout == "last words\n"
+
+
+if __name__ == "__main__":
+    test_recording_and_null()
+    test_buffered_blocks()
+    test_demo_output_in_order()
+    test_sinks_are_not_kept_alive()
+    test_flush_on_exit()
+    print("SUCCESS: Output sinks deliver and flush every line.")
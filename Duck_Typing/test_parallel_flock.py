@@ -0,0 +1,52 @@
+"""
+Simple test script to verify that parallel_flock.py computes exactly the same
+ticks as a single-process Flock, also while rebalancing its workers.
+"""
+
+import os
+import sys
+
+# Import the classes we want to test
+sys.path.append('.')
+from flock import Flock, np
+from parallel_flock import ALIGN, ParallelFlock, split
+
+
+def test_split():
+    """
+    Ranges are consecutive, cover all rows and start at multiples of ALIGN.
+    """
+    ranges = split(1000, [1, 2, 1])
+    assert ranges[0][0] == 0 and ranges[-1][1] == 1000
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+    assert all(start % ALIGN == 0 for start, _ in ranges)
+    assert split(5, [1, 1, 1]) == [(0, 0), (0, 0), (0, 5)]
+
+
+def test_bit_identical_with_rebalancing():
+    """
+    Two workers, rebalanced every few ticks, give the columns of one process.
+    """
+    if np is None:
+        return  # The flock needs NumPy.
+    counts = [1500, 700, 800]
+    single = Flock(counts, seed=3)
+    # A negative tolerance rebalances at every check.
+    with ParallelFlock(counts, workers=2, seed=3, rebalance_every=4, tolerance=-1) as parallel:
+        name = parallel.memory.name
+        for _ in range(20):
+            single.tick()
+            parallel.tick()
+        for column in ("position", "velocity", "energy", "flying"):
+            assert np.array_equal(getattr(single, column), getattr(parallel.flock, column)), column
+        assert parallel.census() == single.census()
+        assert parallel.rebalances == 5
+        (first, middle), (middle_again, last) = parallel.ownership()
+        assert (first, middle, last) == (0, middle_again, len(single))
+    assert not os.path.exists(f"/dev/shm/{name}")  # The shared memory is freed (Linux path).
+
+
+if __name__ == "__main__":
+    test_split()
+    test_bit_identical_with_rebalancing()
+    print("SUCCESS: The parallel flock matches the single-process flock.")
@@ -0,0 +1,271 @@
+# streaming_min_max.py
+#
+# min_max() from tuples_example.py, for data too large to look at twice.
+#
+# min(numbers) followed by max(numbers) reads the data twice, and a one-shot
+# iterator (a file, a generator) is empty by the second pass. min_max() here
+# makes a single pass over any iterable, in chunks of CHUNK_SIZE values:
+# each chunk is small enough to stay in the CPU cache, so reducing it with the
+# C-level min() and max() (or NumPy's) costs about one read from memory.
+#
+# - lists, tuples, ranges and strings are reduced in slices of CHUNK_SIZE
+#   values, so each value comes from memory once, like with iterators
+# - iterators are read CHUNK_SIZE values at a time, so memory stays constant
+# - NumPy arrays, array.array and other buffers are reduced with NumPy, chunk
+#   by chunk, without copying, also strided views such as data[::2] (without
+#   NumPy: array.array chunks, or chunks of Python numbers)
+# - min_max_file() maps a binary file of numbers into memory (mmap), so a
+#   multi-GB metric dump is streamed from the page cache, never read whole
+#
+# With indices=True, the positions of the (first) minimum and maximum come
+# back too, as a MinMax named tuple. A NaN in NumPy data makes the result NaN,
+# as with numpy.min().
+#
+# Usage:
+#   python streaming_min_max.py FILE [TYPECODE]    # Binary file of numbers, e.g. d = float64
+#   python streaming_min_max.py -                  # One number per line on stdin
+#   python streaming_min_max.py bench [MILLIONS]   # Benchmark; default 10 million values
+import mmap
+import struct
+import sys
+import time
+from array import array, typecodes
+from collections import namedtuple
+from itertools import islice
+
+try:
+    import numpy as np  # Optional: vectorized chunks and memory-mapped arrays.
+except ImportError:
+    np = None
+
+# Values reduced per step
+CHUNK_SIZE = 1 << 16
+
+# Buffer formats (struct module codes, without byte order) of the numbers min_max reads from buffers
+NUMBER_FORMATS = frozenset("?bBhHiIlLqQnNefd")
+
+# Byte order and size prefixes of buffer formats, e.g. ">" in ">d" (big-endian float64)
+BYTE_ORDERS = "@=<>!"
+
+# Result of min_max(..., indices=True)
+MinMax = namedtuple("MinMax", ["min", "max", "argmin", "argmax"])
+
+
+def min_max(values, indices=False, chunk_size=CHUNK_SIZE):
+    """
+    Returns the smallest and the largest value in one pass.
+
+    Args:
+    values: Any iterable of comparable values, a NumPy array or a buffer of numbers.
+    indices (bool): Also return the positions of the first minimum and maximum.
+
+    Returns:
+    tuple: (min, max), or MinMax(min, max, argmin, argmax) if indices is true.
+
+    Raises:
+    ValueError: If values is empty.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        result = reduce_numpy(values, chunk_size, indices)
+    elif isinstance(values, (array, memoryview, bytes, bytearray, mmap.mmap)):
+        result = reduce_buffer(memoryview(values), chunk_size, indices)
+    else:
+        result = reduce_chunks(chunks(values, chunk_size), indices)
+    if result is None:
+        raise ValueError("min_max() arg is an empty iterable")
+    return MinMax(*result) if indices else result[:2]
+
+
+def chunks(values, chunk_size):
+    """Yields the values in chunks of up to chunk_size values (slices of a list, tuple, range or str)."""
+    if isinstance(values, (list, tuple, range, str)):
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]  # Small enough to stay in cache for min() and max()
+        return
+    iterator = iter(values)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def reduce_chunks(chunks, indices=True):
+    """
+    Folds chunks (with index()) into (min, max, argmin, argmax), or None if there are none.
+    Without indices, argmin and argmax are None.
+    """
+    empty = True
+    low = high = None
+    argmin = argmax = None
+    offset = 0
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        chunk_low, chunk_high = min(chunk), max(chunk)  # Two C loops over a chunk in cache
+        # Only strictly better values replace the current ones: the first minimum wins, as with min().
+        if empty or chunk_low < low:
+            low = chunk_low
+            if indices:
+                argmin = offset + chunk.index(chunk_low)
+        if empty or chunk_high > high:
+            high = chunk_high
+            if indices:
+                argmax = offset + chunk.index(chunk_high)
+        empty = False
+        offset += len(chunk)
+    return None if empty else (low, high, argmin, argmax)
+
+
+def numpy_chunks(values, chunk_size):
+    """
+    Yields (offset, chunk) for a NumPy array in blocks of rows along its first axis.
+
+    Each chunk is a view, so a non-contiguous array (e.g. data[::2] or data.T) is
+    never copied as a whole, as reshape(-1) would. Offsets count values in C
+    order, like the indices of numpy.argmin.
+    """
+    if values.ndim == 0:
+        values = values.reshape(1)
+    row_size = values.size // len(values)
+    rows = max(1, chunk_size // row_size)
+    for start in range(0, len(values), rows):
+        yield start * row_size, values[start:start + rows]
+
+
+def reduce_numpy(values, chunk_size, indices=True):
+    """(min, max, argmin, argmax) of a NumPy array of any shape, or None if it is empty."""
+    if not values.size:
+        return None
+    if not indices:
+        lows, highs = zip(*((chunk.min(), chunk.max()) for _, chunk in numpy_chunks(values, chunk_size)))
+        return np.min(lows).item(), np.max(highs).item(), None, None  # NaN wins, as with numpy.min.
+    low = high = None
+    argmin = argmax = 0
+    for start, chunk in numpy_chunks(values, chunk_size):
+        chunk_argmin, chunk_argmax = int(chunk.argmin()), int(chunk.argmax())
+        chunk_low, chunk_high = chunk.flat[chunk_argmin], chunk.flat[chunk_argmax]
+        if chunk_low != chunk_low:  # NaN: like numpy.min, the result is NaN.
+            return chunk_low.item(), chunk_low.item(), start + chunk_argmin, start + chunk_argmin
+        if start == 0 or chunk_low < low:
+            low, argmin = chunk_low, start + chunk_argmin
+        if start == 0 or chunk_high > high:
+            high, argmax = chunk_high, start + chunk_argmax
+    return low.item(), high.item(), argmin, argmax
+
+
+def reduce_buffer(buffer, chunk_size, indices=True):
+    """
+    (min, max, argmin, argmax) of a buffer of numbers, or None if it is empty.
+
+    Raises:
+    TypeError: If the buffer does not hold numbers of one of NUMBER_FORMATS.
+    """
+    typecode = buffer.format.lstrip(BYTE_ORDERS)
+    if typecode not in NUMBER_FORMATS:
+        raise TypeError(f"Unsupported buffer format {buffer.format!r}")
+    if np is not None:
+        try:
+            values = np.asarray(buffer)  # A view with the buffer's strides and byte order
+        except (TypeError, ValueError, NotImplementedError):
+            pass  # A format NumPy cannot view, e.g. "N" on some platforms
+        else:
+            return reduce_numpy(values, chunk_size, indices)
+    return reduce_chunks(buffer_chunks(buffer, typecode, chunk_size), indices)
+
+
+def buffer_chunks(buffer, typecode, chunk_size):
+    """Yields the numbers of a buffer in chunks of up to chunk_size values, copying one chunk at a time."""
+    if not buffer.c_contiguous:  # A strided view, e.g. memoryview(data)[::2]
+        for start in range(0, len(buffer), chunk_size):
+            yield buffer[start:start + chunk_size].tolist()
+        return
+    raw = buffer.cast("B")
+    step = chunk_size * buffer.itemsize
+    native = buffer.format[0] not in BYTE_ORDERS or buffer.format[0] == "@"
+    for start in range(0, len(raw), step):
+        if native and typecode in typecodes:
+            chunk = array(typecode)
+            chunk.frombytes(raw[start:start + step])
+        else:  # e.g. "?" or ">d": unpacked by struct
+            chunk = [value for value, in struct.iter_unpack(buffer.format, raw[start:start + step])]
+        yield chunk
+
+
+def min_max_file(path, typecode="d", indices=False, chunk_size=CHUNK_SIZE):
+    """
+    Returns min_max() of a binary file of numbers, mapped into memory instead of read.
+
+    Args:
+    typecode (str): The array module type code of the numbers, e.g. "d" for
+        float64, "f" for float32, "q" for int64 (native byte order).
+    """
+    if np is not None:
+        return min_max(np.memmap(path, dtype=typecode, mode="r"), indices, chunk_size)
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return min_max(view.cast(typecode), indices, chunk_size)
+            finally:
+                view.release()
+
+
+# ===== Benchmark: min() + max() vs one chunked pass =====
+
+def run_benchmark(millions=10):
+    import os
+    import random
+    import tempfile
+
+    count = int(millions * 1_000_000)
+    rng = random.Random(0)
+    values = [rng.random() for _ in range(count)]
+    packed = array("d", values)
+
+    def timed(label, action):
+        start = time.perf_counter()
+        result = action()
+        print(f"{label:>36}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+        return result
+
+    print(f"{count:,} float64 values")
+    expected = timed("list: min() + max()", lambda: (min(values), max(values)))
+    assert timed("list: min_max()", lambda: min_max(values)) == expected
+    timed("generator: list() + min() + max()", lambda: (lambda data: (min(data), max(data)))(list(iter(values))))
+    assert timed("generator: min_max()", lambda: min_max(iter(values))) == expected
+    timed("array('d'): min() + max()", lambda: (min(packed), max(packed)))
+    assert timed("array('d'): min_max()", lambda: min_max(packed)) == expected
+    if np is not None:
+        numbers = np.frombuffer(packed)
+        timed("NumPy: min() + max()", lambda: (numbers.min(), numbers.max()))
+        assert timed("NumPy: min_max()", lambda: min_max(numbers)) == expected
+        timed("NumPy: argmin() + argmax()", lambda: (numbers.argmin(), numbers.argmax()))
+        timed("NumPy: min_max(indices=True)", lambda: min_max(numbers, indices=True))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics.bin")
+        with open(path, "wb") as output:
+            packed.tofile(output)
+        print(f"\n{os.path.getsize(path) / 2**20:,.0f} MiB binary file")
+
+        def read_whole():
+            data = array("d")
+            with open(path, "rb") as file:
+                data.frombytes(file.read())
+            return min(data), max(data)
+        timed("read() + min() + max()", read_whole)
+        assert timed("min_max_file() (memory-mapped)", lambda: min_max_file(path)) == expected
+
+
+def main(arguments):
+    match arguments:
+        case ["bench", *millions]:
+            run_benchmark(*(float(value) for value in millions))
+        case ["-"]:
+            print(*min_max((float(line) for line in sys.stdin if line.strip()), indices=True))
+        case [path] | [path, _]:
+            print(*min_max_file(path, *arguments[1:], indices=True))
+        case _:
+            print("Usage: python streaming_min_max.py FILE [TYPECODE] | - | bench [MILLIONS]")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
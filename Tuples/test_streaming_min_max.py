@@ -0,0 +1,142 @@
+"""
+Simple test script to verify that min_max in streaming_min_max.py agrees with
+min() and max() on every kind of input, in a single pass.
+"""
+
+import math
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from array import array
+
+# Import the module we want to test
+sys.path.append('.')
+import streaming_min_max
+from streaming_min_max import MinMax, min_max, min_max_file
+
+
+def expected(values):
+    low, high = min(values), max(values)
+    return MinMax(low, high, values.index(low), values.index(high))
+
+
+def test_iterables():
+    """
+    Lists, one-shot iterators and strings give min(), max() and the first positions.
+    """
+    rng = random.Random(0)
+    values = [rng.randrange(1000) for _ in range(10_000)]
+    assert min_max(values) == (min(values), max(values))
+    assert min_max(values, indices=True) == expected(values)
+    assert min_max(iter(values), indices=True, chunk_size=7) == expected(values)
+    assert min_max((value for value in values), chunk_size=1) == (min(values), max(values))
+    assert min_max(values, indices=True, chunk_size=7) == expected(values)  # Sliced, like an iterator
+    assert min_max(tuple(values), indices=True, chunk_size=7) == expected(values)
+    assert min_max(range(5, 50, 3), indices=True, chunk_size=4) == (5, 47, 0, 14)
+    assert min_max("tuple") == ("e", "u")
+    assert min_max("streaming", indices=True, chunk_size=2) == ("a", "t", 4, 1)
+    try:
+        min_max(iter([]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("An empty iterable has no minimum")
+
+
+def test_buffers_with_and_without_numpy():
+    """
+    array.array, bytes and NumPy arrays agree, with NumPy and with plain array chunks.
+    """
+    rng = random.Random(1)
+    values = [rng.uniform(-5, 5) for _ in range(5_000)]
+    numpy = streaming_min_max.np
+    try:
+        for np in {numpy, None}:
+            streaming_min_max.np = np
+            assert min_max(array("d", values), indices=True, chunk_size=64) == expected(values)
+            assert min_max(bytes([7, 3, 9, 3]), indices=True) == (3, 9, 1, 2)
+            if np is not None:
+                assert min_max(np.array(values).reshape(50, 100), indices=True, chunk_size=333) == expected(values)
+                assert math.isnan(min_max(np.array([2.0, np.nan, 1.0]))[0])
+    finally:
+        streaming_min_max.np = numpy
+    try:
+        min_max(memoryview(b"ab").cast("c"))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("Characters are no numbers")
+
+
+def test_strided_and_foreign_buffers():
+    """
+    Strided views, big-endian and boolean buffers work with and without NumPy,
+    and a non-contiguous NumPy array is reduced without copying it.
+    """
+    rng = random.Random(2)
+    values = [rng.uniform(-5, 5) for _ in range(5_000)]
+    numpy = streaming_min_max.np
+    try:
+        for np in {numpy, None}:
+            streaming_min_max.np = np
+            assert min_max(memoryview(array("d", values))[::2], indices=True, chunk_size=64) == expected(values[::2])
+            assert min_max(memoryview(array("q", range(10)))[::-3], indices=True) == (0, 9, 3, 0)
+            assert min_max(memoryview(bytes([1, 0, 1])).cast("?"), indices=True) == (False, True, 1, 0)
+            if numpy is not None:
+                big_endian = numpy.array([2.5, -1.0, 7.0, -1.0], dtype=">f8")
+                assert memoryview(big_endian).format == ">d"
+                assert min_max(memoryview(big_endian), indices=True, chunk_size=3) == (-1.0, 7.0, 1, 2)
+    finally:
+        streaming_min_max.np = numpy
+
+    if numpy is None:
+        return
+    data = numpy.arange(4_000_000, dtype=numpy.float64).reshape(2_000, 2_000)
+    data[1_234, 567] = -1.0
+    tracemalloc.start()
+    try:
+        assert min_max(data.T, indices=True) == (-1.0, data.max(), 567 * 2_000 + 1_234, data.size - 1)
+        assert min_max(data[:, 1::2]) == (-1.0, data.max())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < data.nbytes // 4  # Chunks are copied at most, never the whole array
+
+
+def test_memory_mapped_file():
+    """
+    A binary file of numbers is reduced without reading it, with and without NumPy.
+    """
+    values = [float(value % 977) - 400 for value in range(0, 300_000, 7)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics.bin")
+        with open(path, "wb") as output:
+            array("d", values).tofile(output)
+        numpy = streaming_min_max.np
+        try:
+            for np in {numpy, None}:
+                streaming_min_max.np = np
+                assert min_max_file(path, "d", indices=True) == expected(values)
+        finally:
+            streaming_min_max.np = numpy
+
+
+def test_tuples_example():
+    """
+    The min_max of tuples_example.py makes one pass, so generators work.
+    """
+    from tuples_example import min_max as example_min_max  # Also runs the examples' prints
+    assert example_min_max([3, 5, 2, 8, 1]) == (1, 8)
+    assert example_min_max(n * n for n in [3, -5, 2]) == (4, 25)
+    assert example_min_max([4]) == (4, 4)
+
+
+if __name__ == "__main__":
+    test_iterables()
+    test_buffers_with_and_without_numpy()
+    test_strided_and_foreign_buffers()
+    test_memory_mapped_file()
+    test_tuples_example()
+    print("SUCCESS: min_max agrees with min() and max() on every input.")
@@ -39,13 +39,27 @@ print("x:", x, "y:", y)
 
 
 # 6. Using tuples to return multiple values from a function
+# min_max looks at every number once, so it also works on iterators (such as
+# a file or a generator), which can only be read once.
+# streaming_min_max.py does the same for arrays, files and very large data.
 def min_max(numbers):
-    return min(numbers), max(numbers)
+    iterator = iter(numbers)
+    try:
+        smallest = largest = next(iterator)
+    except StopIteration:
+        raise ValueError("min_max() arg is an empty iterable") from None
+    for number in iterator:
+        if number < smallest:
+            smallest = number
+        elif number > largest:
+            largest = number
+    return smallest, largest
 
 
 numbers = [3, 5, 2, 8, 1]
 min_val, max_val = min_max(numbers)
 print("Minimum:", min_val, "Maximum:", max_val)
+print("Min and max of a generator:", min_max(n * n for n in numbers))
 
 # 7. Tuple methods
 example_tuple = (1, 2, 3, 2, 2, 4)
@@ -0,0 +1,242 @@
+"""
+A column of Enum values (Color from constant_value_patterns_enums.py by
+default) stored as one byte per value.
+
+A list of Color members costs 8 bytes per element for the pointer alone, and
+every comparison looks up an Enum attribute. CategoricalColumn stores the code
+of each member instead as unsigned bytes, in a bytearray or any other buffer,
+and works on those bytes with C-level operations, in place. The code is the
+member's value if every value is an integer from 0 to 255 (RED = 1, GREEN = 2,
+BLUE = 3, as in color_dispatch.encode_colors), and its position otherwise:
+
+- mask(*members): bytearray.translate maps every code to 1 or 0 in one pass
+- counts(): bytearray.count per member (NumPy's bincount if NumPy is installed)
+- group_by(values): itertools.compress picks the values of each member
+- buffer() and from_buffer(): a memoryview of the codes out, and a column
+  over existing bytes (a file read, mmap or network buffer) in, without copying
+
+A column over a buffer (from_buffer() or a slice) is a read-only view: its
+bytes methods run over CHUNK codes at a time, and copy() gives a column that
+can grow.
+
+Enums with up to 256 members fit. Run this script to compare memory and speed
+with a list of members for 10 million values.
+"""
+
+import random
+import sys
+import time
+from array import array
+from itertools import compress
+
+from constant_value_patterns_enums import Color
+
+try:
+    import numpy as np  # Optional: faster counts and a zero-copy NumPy view.
+except ImportError:
+    np = None
+
+# Codes of a column over a buffer handled per step, to keep temporary copies small
+CHUNK = 1 << 20
+
+
+class CategoricalColumn:
+    """
+    A sequence of members of one Enum, stored as one byte code per member.
+    """
+
+    def __init__(self, values=(), enum=Color):
+        """
+        Args:
+        values: Members of enum to store.
+        enum (type[Enum]): The Enum the values belong to (at most 256 members).
+        """
+        self.enum = enum
+        self.members = list(enum)
+        if len(self.members) > 256:
+            raise ValueError(f"{enum.__name__} has more than 256 members")
+        if all(isinstance(member.value, int) and 0 <= member.value < 256 for member in self.members):
+            self.codes_by_member = {member: member.value for member in self.members}
+        else:
+            self.codes_by_member = {member: code for code, member in enumerate(self.members)}
+        self.members_by_code = [None] * 256  # Code -> member, for reading codes back
+        for member, code in self.codes_by_member.items():
+            self.members_by_code[code] = member
+        self.codes = bytearray(map(self.codes_by_member.__getitem__, values))
+
+    @classmethod
+    def from_buffer(cls, buffer, enum=Color, validate=True):
+        """
+        Returns a column over an existing buffer of codes, without copying it.
+
+        Args:
+        buffer: bytes, bytearray, mmap, array('B') or anything with the buffer protocol.
+        validate (bool): Check that every byte is the code of a member.
+
+        Raises:
+        ValueError: If validate is true and a byte is not a valid code.
+        """
+        column = cls(enum=enum)
+        column.codes = memoryview(buffer).cast("B")
+        if validate:
+            # Delete every valid code; anything left over is invalid.
+            valid = bytes(column.codes_by_member.values())
+            if any(chunk.translate(None, valid) for chunk in column.chunks()):
+                raise ValueError(f"Buffer holds codes that are no {enum.__name__} member")
+        return column
+
+    def copy(self):
+        """Returns a column with its own copy of the codes, which can grow."""
+        column = type(self)(enum=self.enum)
+        column.codes = bytearray(self.codes)
+        return column
+
+    def buffer(self):
+        """Returns the codes as a memoryview, without copying them."""
+        return memoryview(self.codes)
+
+    def to_numpy(self):
+        """Returns the codes as a NumPy uint8 array sharing their memory."""
+        if np is None:
+            raise ImportError("to_numpy() requires NumPy")
+        return np.frombuffer(self.codes, dtype=np.uint8)
+
+    def append(self, member):
+        self.writable_codes().append(self.codes_by_member[member])
+
+    def extend(self, members):
+        self.writable_codes().extend(map(self.codes_by_member.__getitem__, members))
+
+    def writable_codes(self):
+        if isinstance(self.codes, memoryview):
+            raise TypeError("A column over a buffer cannot grow; use copy() for one that can")
+        return self.codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            codes = memoryview(self.codes)[index]
+            if not codes.contiguous:
+                column = type(self)(enum=self.enum)
+                column.codes = bytearray(codes)  # A step: copy what it selects.
+                return column
+            return self.from_buffer(codes, self.enum, validate=False)
+        return self.members_by_code[self.codes[index]]
+
+    def __iter__(self):
+        return map(self.members_by_code.__getitem__, self.codes)
+
+    def __eq__(self, other):
+        if not isinstance(other, CategoricalColumn):
+            return NotImplemented
+        return self.enum is other.enum and self.buffer() == other.buffer()  # Compared in place
+
+    def __repr__(self):
+        shown = ", ".join(member.name for member in self[:10])
+        more = ", ..." if len(self) > 10 else ""
+        return f"CategoricalColumn({self.enum.__name__}: {shown}{more}; {len(self):,} values)"
+
+    def chunks(self):
+        """
+        Yields the codes as bytes-like objects with the C-level bytes methods:
+        the bytearray itself, or copies of CHUNK codes at a time of a buffer.
+        """
+        codes = self.codes
+        if not isinstance(codes, memoryview):
+            yield codes
+        elif isinstance(codes.obj, bytes) and codes.nbytes == len(codes.obj):
+            yield codes.obj  # The column covers a whole bytes object.
+        else:
+            for start in range(0, len(codes), CHUNK):
+                yield codes[start:start + CHUNK].tobytes()
+
+    def mask(self, *members):
+        """
+        Marks the positions holding any of members.
+
+        Returns:
+        bytes | bytearray: 1 where the value is one of members, 0 elsewhere;
+        usable with itertools.compress or as a NumPy bool array via np.frombuffer.
+        """
+        table = bytearray(256)
+        for member in members:
+            table[self.codes_by_member[member]] = 1
+        parts = [chunk.translate(table) for chunk in self.chunks()]
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def filter(self, *members):
+        """Returns the positions holding any of members, in order."""
+        return array("L", compress(range(len(self)), self.mask(*members)))
+
+    def count(self, member):
+        code = self.codes_by_member[member]
+        return sum(chunk.count(code) for chunk in self.chunks())
+
+    def counts(self):
+        """
+        Returns how often each member occurs (a histogram).
+
+        Returns:
+        dict: Member -> count, for every member of the Enum.
+        """
+        if np is not None:
+            by_code = np.bincount(self.to_numpy(), minlength=256).tolist()
+            return {member: by_code[code] for member, code in self.codes_by_member.items()}
+        return {member: self.count(member) for member in self.members}
+
+    def group_by(self, values):
+        """
+        Groups another column by this one.
+
+        Args:
+        values: A sequence as long as this column.
+
+        Returns:
+        dict: Member -> list of the values at the positions holding that member.
+        """
+        if len(values) != len(self):
+            raise ValueError(f"Column lengths differ: {len(self)} and {len(values)}")
+        return {member: list(compress(values, self.mask(member)))
+                for member, count in self.counts().items() if count}
+
+
+# ===== Benchmark: list of members vs categorical column =====
+
+def run_benchmark(count=10_000_000):
+    rng = random.Random(0)
+    members = rng.choices(list(Color), k=count)
+    sizes = list(range(count))
+
+    def timed(label, action):
+        start = time.perf_counter()
+        result = action()
+        print(f"{label:>32}: {(time.perf_counter() - start) * 1e3:9.1f} ms")
+        return result
+
+    column = timed("build column from list", lambda: CategoricalColumn(members))
+    list_bytes = sys.getsizeof(members)
+    column_bytes = sys.getsizeof(column.codes)
+    print(f"{count:,} values: list {list_bytes / 2**20:.1f} MiB, column {column_bytes / 2**20:.1f} MiB "
+          f"({list_bytes / column_bytes:.1f}x smaller)\n")
+
+    by_list = timed("list: filter == BLUE", lambda: [i for i, member in enumerate(members) if member == Color.BLUE])
+    by_column = timed("column: filter(BLUE)", lambda: column.filter(Color.BLUE))
+    assert list(by_column) == by_list
+    timed("list: histogram", lambda: {color: members.count(color) for color in Color})
+    timed("column: counts()", column.counts)
+
+    def group_list():
+        groups = {}
+        for member, size in zip(members, sizes):
+            groups.setdefault(member, []).append(size)
+        return groups
+    timed("list: group by", group_list)
+    timed("column: group_by()", lambda: column.group_by(sizes))
+    raw = timed("column: buffer()", column.buffer)
+    timed("column: from_buffer(validated)", lambda: CategoricalColumn.from_buffer(raw))
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
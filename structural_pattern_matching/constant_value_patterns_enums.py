@@ -5,16 +5,21 @@ class Color(Enum):
     GREEN = 2
     BLUE = 3
 
+# What process_color prints for each member, and for anything else
+MESSAGES = {Color.RED: "It's red!", Color.GREEN: "It's green!", Color.BLUE: "It's blue!"}
+UNKNOWN = "Unknown color"
+
 def process_color(color):
     match color:
         case Color.RED:
-            print("It's red!")
+            print(MESSAGES[Color.RED])
         case Color.GREEN:
-            print("It's green!")
+            print(MESSAGES[Color.GREEN])
         case Color.BLUE:
-            print("It's blue!")
+            print(MESSAGES[Color.BLUE])
         case _:
-            print("Unknown color")
+            print(UNKNOWN)
 
-process_color(Color.RED)   # Output: It's red!
-process_color(Color.GREEN) # Output: It's green!
\ No newline at end of file
+if __name__ == "__main__":
+    process_color(Color.RED)   # Output: It's red!
+    process_color(Color.GREEN) # Output: It's green!
\ No newline at end of file
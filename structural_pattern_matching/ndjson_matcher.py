@@ -0,0 +1,228 @@
+"""
+Streaming classification of NDJSON event logs with `match`.
+
+Every line of the input is a JSON record. The records are read, parsed and
+classified one at a time by a chain of generators, and the captured fields of
+every match are written to one NDJSON file per pattern:
+
+    input -> read_lines -> parse_records -> match_records -> write_matches
+
+Nothing is collected along the way: the input is read in chunks of CHUNK_SIZE
+characters (see repl_batch.read_lines) and every record is written out before
+the next one is parsed, so memory stays the same for 1 MB and for 100 GB of
+input.
+
+A classifier is a function that takes a record and returns (pattern name,
+captured fields) or None, usually a `match` statement like classify_event().
+
+Usage:
+    python ndjson_matcher.py INPUT|- [OUTPUT_DIR]   # OUTPUT_DIR/<pattern>.ndjson, or stdout
+    python ndjson_matcher.py bench [MIB]           # Generate MIB MiB of events and classify them
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from repl_batch import CHUNK_SIZE, read_lines
+
+try:
+    import resource  # Peak memory of the process; not available on Windows.
+except ImportError:
+    resource = None
+
+# Characters of output buffered per pattern file before writing
+BUFFER_SIZE = 1 << 20
+
+# Invalid lines reported on stderr; the rest are only counted
+MAX_REPORTED_ERRORS = 10
+
+
+def classify_event(record):
+    """
+    The default classifier: mouse, keyboard, point and error events.
+
+    Returns:
+    tuple[str, dict] | None: The pattern name and the captured fields.
+    """
+    match record:
+        case {"type": "click", "x": int() | float() as x, "y": int() | float() as y}:
+            return "click", {"x": x, "y": y}
+        case {"type": "key", "key": str() as key}:
+            return "key", {"key": key}
+        case {"type": "move", "position": [int() | float() as x, int() | float() as y, 0]}:
+            return "point", {"x": x, "y": y}  # The Point pattern of pattern_matching_v1.py
+        case {"type": "error", "code": int() as code, "message": str() as message}:
+            return "error", {"code": code, "message": message}
+    return None
+
+
+class Stats:
+    """
+    Counters updated while the records stream through the pipeline.
+    """
+
+    def __init__(self):
+        self.lines = 0
+        self.characters = 0
+        self.invalid = 0
+        self.unmatched = 0
+        self.matched = {}
+
+    @property
+    def records(self):
+        return self.lines - self.invalid
+
+    def report(self, elapsed, stream=None):
+        stream = sys.stderr if stream is None else stream
+        rate = self.records / elapsed if elapsed else 0
+        print(f"{self.records:,} records ({self.characters / 2**20:,.1f} MiB) in {elapsed:.2f} s: "
+              f"{rate:,.0f} records/s, {self.characters / 2**20 / elapsed if elapsed else 0:,.1f} MiB/s",
+              file=stream)
+        for name, count in sorted(self.matched.items()):
+            print(f"{name:>12}: {count:,}", file=stream)
+        print(f"{'unmatched':>12}: {self.unmatched:,}", file=stream)
+        if self.invalid:
+            print(f"{'invalid':>12}: {self.invalid:,}", file=stream)
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+            print(f"Peak memory: {peak / 1024:.1f} MiB", file=stream)
+
+
+def parse_records(lines, stats):
+    """
+    Parses each non-empty line as JSON.
+
+    Yields:
+    The parsed records; invalid lines are counted and the first few reported.
+    """
+    decode = json.JSONDecoder().decode  # json.loads without its argument checks
+    lines_seen = characters = invalid = 0  # Locals are faster; copied to stats at the end.
+    try:
+        for number, line in enumerate(lines, 1):
+            characters += len(line) + 1
+            if not line or line.isspace():
+                continue
+            lines_seen += 1
+            try:
+                yield decode(line)
+            except ValueError as error:
+                invalid += 1
+                if invalid <= MAX_REPORTED_ERRORS:
+                    print(f"line {number}: {type(error).__name__}: {error}", file=sys.stderr)
+    finally:
+        stats.lines += lines_seen
+        stats.characters += characters
+        stats.invalid += invalid
+
+
+def match_records(records, stats, classify=classify_event):
+    """
+    Runs every record through the classifier.
+
+    Yields:
+    tuple[str, dict]: The pattern name and captured fields of each match.
+    """
+    matched = stats.matched
+    for record in records:
+        result = classify(record)
+        if result is None:
+            stats.unmatched += 1
+            continue
+        matched[result[0]] = matched.get(result[0], 0) + 1
+        yield result
+
+
+def write_matches(matches, directory=None, stdout=None):
+    """
+    Writes the captured fields of each match as one JSON line.
+
+    Args:
+    matches: (pattern name, fields) pairs.
+    directory (str | None): Write to directory/<pattern name>.ndjson; if None,
+        write {"pattern": name, **fields} lines to stdout instead.
+    """
+    encode = json.JSONEncoder().encode  # json.dumps without its argument checks
+    if directory is None:
+        stdout = sys.stdout if stdout is None else stdout
+        for name, fields in matches:
+            stdout.write(encode({"pattern": name, **fields}) + "\n")
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    outputs = {}  # One open file per pattern seen so far
+    try:
+        for name, fields in matches:
+            output = outputs.get(name)
+            if output is None:
+                path = os.path.join(directory, f"{name}.ndjson")
+                output = outputs[name] = open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+            output.write(encode(fields) + "\n")
+    finally:
+        for output in outputs.values():
+            output.close()
+
+
+def run(stream, directory=None, classify=classify_event, chunk_size=CHUNK_SIZE):
+    """
+    Classifies every record of a text stream and writes the matches.
+
+    Returns:
+    Stats: Counts of records, matches per pattern, unmatched and invalid lines.
+    """
+    stats = Stats()
+    records = parse_records(read_lines(stream, chunk_size), stats)
+    write_matches(match_records(records, stats, classify), directory)
+    return stats
+
+
+def classify_path(path, directory=None):
+    start = time.perf_counter()
+    if path == "-":
+        stats = run(sys.stdin, directory)
+    else:
+        with open(path, encoding="utf-8") as stream:
+            stats = run(stream, directory)
+    stats.report(time.perf_counter() - start)
+    return 1 if stats.invalid else 0
+
+
+# ===== Benchmark: classify a generated multi-MiB event log =====
+
+def generate_events(path, mebibytes, seed=0):
+    """Writes about mebibytes MiB of random events to path, chunk by chunk."""
+    rng = random.Random(seed)
+    templates = [
+        lambda: {"type": "click", "x": rng.randrange(1920), "y": rng.randrange(1080), "button": 1},
+        lambda: {"type": "key", "key": rng.choice("abcdefgh")},
+        lambda: {"type": "move", "position": [rng.random(), rng.randrange(100), 0]},
+        lambda: {"type": "move", "position": [rng.random(), rng.randrange(100), 1]},
+        lambda: {"type": "error", "code": rng.randrange(400, 600), "message": "request failed"},
+        lambda: {"type": "scroll", "delta": rng.randrange(-5, 5)},
+    ]
+    # A few thousand distinct lines, repeated: generating is not what is measured.
+    lines = [json.dumps({"time": i, **rng.choice(templates)()}) + "\n" for i in range(4096)]
+    block = "".join(lines)
+    with open(path, "w", encoding="utf-8") as output:
+        for _ in range(max(1, mebibytes * 2**20 // len(block))):
+            output.write(block)
+
+
+def run_benchmark(mebibytes=256):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.ndjson")
+        generate_events(path, int(mebibytes))
+        classify_path(path, os.path.join(directory, "matches"))
+
+
+if __name__ == "__main__":
+    match sys.argv[1:]:
+        case ["bench", *mebibytes]:
+            run_benchmark(*mebibytes)
+        case [path] | [path, _]:
+            sys.exit(classify_path(path, *sys.argv[2:]))
+        case _:
+            print(__doc__)
@@ -0,0 +1,583 @@
+"""
+Compiles a list of structural patterns into a decision tree.
+
+A `match` statement tries its cases one after another: with 100 cases whose
+first element is a different literal, a record matching the last case is
+compared with all 100 literals, and the "is it a list of length 3?" test
+that every case shares is repeated for each of them. The compiler builds a
+decision tree from the patterns instead:
+
+- every test on a part of the record (its type, its length, its value) is
+  made once, and the cases it rules out are dropped from the subtree
+- a test with many outcomes (e.g. 80 literals, or many sequence lengths)
+  is a dict lookup, so the work per record no longer grows with the number
+  of cases
+- the tree is written out as Python code and compiled, so walking it costs
+  no more than the if statements and lookups it consists of
+
+Patterns are built from the same pieces as in a `case`:
+
+    Capture("x")                      x
+    WILDCARD                          _
+    Literal("GET")                    "GET"
+    Type(int)                         int()
+    Type(list, Sequence([...]))       list([...])
+    Sequence([p1, p2])                [p1, p2]
+    Or(p1, p2)                        p1 | p2
+    As(p, "x")                        p as x
+
+compile_patterns(patterns) returns match(record), which returns
+(number of the first matching pattern, dict of captures) or None, exactly like
+the `match` statement that source(patterns) writes for the same patterns.
+The one difference: where a dict is used, records are compared with literals
+through their hash, so an object that equals a literal without hashing like it
+does not match it.
+
+Run this script to benchmark a compiled match against the written-out `match`
+statement over 120 cases.
+"""
+
+import math
+import random
+import sys
+import time
+from collections.abc import Sequence as SequenceABC
+
+
+class Capture:
+    """Matches anything and binds it to name (None for the wildcard _)."""
+    __slots__ = ("name",)
+
+    def __init__(self, name=None):
+        self.name = name
+
+
+# The wildcard pattern _
+WILDCARD = Capture()
+
+
+class Literal:
+    """Matches a value equal to value (identical for None, True and False)."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Type:
+    """Matches an instance of cls that also matches pattern, like int() or list([...])."""
+    __slots__ = ("cls", "pattern")
+
+    def __init__(self, cls, pattern=WILDCARD):
+        self.cls = cls
+        self.pattern = pattern
+
+
+class Sequence:
+    """Matches a sequence (but not a string) whose items match patterns one by one."""
+    __slots__ = ("patterns",)
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+
+
+class Or:
+    """Matches if any of the alternatives matches, trying them in order."""
+    __slots__ = ("alternatives",)
+
+    def __init__(self, *alternatives):
+        self.alternatives = alternatives
+
+
+class As:
+    """Matches pattern and binds the value to name."""
+    __slots__ = ("pattern", "name")
+
+    def __init__(self, pattern, name):
+        self.pattern = pattern
+        self.name = name
+
+
+def names(pattern):
+    """
+    Returns the names a pattern binds, in order.
+
+    Raises ValueError where Python raises SyntaxError: a name bound twice, or
+    alternatives of an Or binding different names.
+    """
+    match pattern:
+        case Capture(name=None) | Literal():
+            bound = []
+        case Capture(name=name):
+            bound = [name]
+        case Type(pattern=inner):
+            bound = names(inner)
+        case Sequence(patterns=items):
+            bound = [name for item in items for name in names(item)]
+        case Or(alternatives=alternatives):
+            bound = names(alternatives[0])
+            for alternative in alternatives[1:]:
+                if set(names(alternative)) != set(bound):
+                    raise ValueError("Alternatives of an Or must bind the same names")
+        case As(pattern=inner, name=name):
+            bound = names(inner) + [name]
+        case _:
+            raise TypeError(f"Not a pattern: {pattern!r}")
+    if len(set(bound)) != len(bound):
+        raise ValueError(f"Name bound more than once: {bound}")
+    return bound
+
+
+def source(patterns, function="match_record"):
+    """
+    Writes the `match` statement equivalent to compile_patterns(patterns).
+
+    The classes used by Type patterns must be available by name where the
+    source is executed.
+    """
+    lines = [f"def {function}(record):", "    match record:"]
+    for number, pattern in enumerate(patterns):
+        captures = ", ".join(f"{name!r}: {name}" for name in names(pattern))
+        lines.append(f"        case {pattern_source(pattern)}:")
+        lines.append(f"            return {number}, {{{captures}}}")
+    lines.append("    return None")
+    return "\n".join(lines) + "\n"
+
+
+def pattern_source(pattern):
+    match pattern:
+        case Capture(name=name):
+            return name or "_"
+        case Literal(value=value):
+            return repr(value)
+        case Type(cls=cls, pattern=Capture(name=None)):
+            return f"{cls.__name__}()"
+        case Type(cls=cls, pattern=inner):
+            # Only the builtins that match themselves (int, list, ...) take a positional pattern.
+            return f"{cls.__name__}({pattern_source(inner)})"
+        case Sequence(patterns=items):
+            return "[" + ", ".join(pattern_source(item) for item in items) + "]"
+        case Or(alternatives=alternatives):
+            return "(" + " | ".join(pattern_source(alternative) for alternative in alternatives) + ")"
+        case As(pattern=inner, name=name):
+            return f"({pattern_source(inner)} as {name})"
+
+
+# ===== Compiler =====
+#
+# The compiler works on rows, one per pattern still in the running:
+# (pattern number, pending tests, captures). A test is (path, pattern), where
+# the path is the chain of indexes leading from the record to the part the
+# pattern applies to. Rows stay in pattern order, so the first row without
+# pending tests is the first pattern that matches.
+#
+# Each test splits the rows into the rows left for each outcome, and each set
+# of rows becomes a node of the tree. Identical sets of rows share one node,
+# so the tree is really a graph. The nodes are then written out as Python
+# code: a node used in one place is inlined as an if statement, a shared node
+# becomes a function of its own.
+
+# Literal values that `match` compares by identity
+SINGLETONS = (None, True, False)
+
+# Above this many outcomes a test dispatches through a dict instead of if statements
+DICT_DISPATCH = 4
+
+# Inlined nodes nested deeper than this become functions (Python allows 100 indents)
+MAX_INLINE_DEPTH = 40
+
+# Types seen so far: whether a sequence pattern can match them
+SEQUENCE_TYPES = {}
+
+
+def is_sequence_type(cls):
+    result = SEQUENCE_TYPES[cls] = issubclass(cls, SequenceABC) and not issubclass(cls, (str, bytes, bytearray))
+    return result
+
+
+def is_singleton(value):
+    return value is None or value is True or value is False
+
+
+def expand(number, tests, captures):
+    """
+    Returns the rows a pattern turns into: captures are recorded, As is
+    unwrapped, and every Or splits the row into one row per alternative.
+    """
+    for position, (path, pattern) in enumerate(tests):
+        match pattern:
+            case Capture(name=name):
+                rest = tests[:position] + tests[position + 1:]
+                return expand(number, rest, captures + ((name, path),) if name else captures)
+            case As(pattern=inner, name=name):
+                rest = tests[:position] + ((path, inner),) + tests[position + 1:]
+                return expand(number, rest, captures + ((name, path),))
+            case Or(alternatives=alternatives):
+                rows = []
+                for alternative in alternatives:
+                    rest = tests[:position] + ((path, alternative),) + tests[position + 1:]
+                    rows.extend(expand(number, rest, captures))
+                return rows
+    return [(number, tests, captures)]
+
+
+def split(rows, path, kind, resolve):
+    """
+    Specializes rows for one outcome of a test on path.
+
+    resolve(pattern) is called for each pending test of the given kind on path
+    and returns None if the outcome rules the pattern out, or the tests that
+    replace it otherwise (the test itself if the outcome says nothing about
+    it). Rows without such a test are kept as they are.
+    """
+    result = []
+    for number, tests, captures in rows:
+        kept = []
+        for test in tests:
+            if test[0] == path and type(test[1]) is kind:
+                replacement = resolve(test[1])
+                if replacement is None:
+                    break
+                kept.extend(replacement)
+            else:
+                kept.append(test)
+        else:
+            result.extend(expand(number, tuple(kept), captures))
+    return tuple(result)
+
+
+class DecisionGraph:
+    """
+    The decision tree for a list of patterns, with identical subtrees shared.
+
+    Nodes are tuples, referring to other nodes by their index in self.nodes:
+        ("fail",)
+        ("leaf", pattern number, captures)
+        ("literal", path, [((is singleton, value), node)], default node)
+        ("type", path, cls, node if isinstance, node otherwise)
+        ("length", path, [(length, node)], default node)
+    """
+
+    def __init__(self, patterns):
+        self.nodes = []
+        self.index = {}  # Rows -> node index
+        rows = []
+        for number, pattern in enumerate(patterns):
+            names(pattern)  # Reject the patterns Python would reject.
+            rows.extend(expand(number, (((), pattern),), ()))
+        self.root = self.node_for(tuple(rows))
+
+    def node_for(self, rows):
+        try:
+            return self.index[rows]
+        except KeyError:
+            node = self.build(rows)
+            self.index[rows] = len(self.nodes)
+            self.nodes.append(node)
+            return self.index[rows]
+
+    def build(self, rows):
+        if not rows:
+            return ("fail",)
+        number, tests, captures = rows[0]
+        if not tests:
+            return ("leaf", number, captures)
+        # Of the tests the first row needs, make the one most rows share, so
+        # that it rules out as many rows as possible.
+        path, pattern = max(tests, key=lambda test: sum(
+            any(other[0] == test[0] and type(other[1]) is type(test[1]) for other in row[1]) for row in rows))
+        if type(pattern) is Literal:
+            return self.literal_node(rows, path)
+        if type(pattern) is Type:
+            return self.type_node(rows, path, pattern.cls)
+        return self.length_node(rows, path)
+
+    def literal_node(self, rows, path):
+        def matches(value):
+            # `match` compares None, True and False by identity and everything else with ==.
+            return lambda pattern: () if (
+                pattern.value is value if is_singleton(pattern.value) else pattern.value == value) else None
+
+        branches = {}
+        for _, tests, _ in rows:
+            for test_path, pattern in tests:
+                if test_path == path and type(pattern) is Literal:
+                    # Keys are (True, value) for singletons, so that True and 1 stay apart.
+                    key = (is_singleton(pattern.value), pattern.value)
+                    if key not in branches:
+                        branches[key] = self.node_for(split(rows, path, Literal, matches(pattern.value)))
+        default = self.node_for(split(rows, path, Literal, lambda pattern: None))
+        # A singleton also equals some plain literals (True == 1), which have
+        # to be checked for it even without a singleton pattern.
+        for singleton in SINGLETONS:
+            if (True, singleton) not in branches and any(
+                    not singleton_key and value == singleton for singleton_key, value in branches):
+                branches[True, singleton] = self.node_for(split(rows, path, Literal, matches(singleton)))
+        return ("literal", path, list(branches.items()), default)
+
+    def type_node(self, rows, path, cls):
+        # isinstance(value, cls) also settles the tests of its base classes, and
+        # not isinstance(value, cls) those of its subclasses.
+        yes = self.node_for(split(rows, path, Type, lambda pattern: (
+            ((path, pattern.pattern),) if issubclass(cls, pattern.cls) else ((path, pattern),))))
+        no = self.node_for(split(rows, path, Type, lambda pattern: (
+            None if issubclass(pattern.cls, cls) else ((path, pattern),))))
+        return ("type", path, cls, yes, no)
+
+    def length_node(self, rows, path):
+        lengths = []
+        for _, tests, _ in rows:
+            for test_path, pattern in tests:
+                if test_path == path and type(pattern) is Sequence and len(pattern.patterns) not in lengths:
+                    lengths.append(len(pattern.patterns))
+        branches = [
+            (length, self.node_for(split(
+                rows, path, Sequence,
+                lambda pattern, length=length: tuple(
+                    (path + (i,), item) for i, item in enumerate(pattern.patterns))
+                if len(pattern.patterns) == length else None)))
+            for length in lengths
+        ]
+        default = self.node_for(split(rows, path, Sequence, lambda pattern: None))
+        return ("length", path, branches, default)
+
+
+class CodeWriter:
+    """
+    Writes a DecisionGraph as Python functions.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.namespace = {"SEQUENCE_TYPES": SEQUENCE_TYPES, "is_sequence_type": is_sequence_type}
+        self.names = {}  # id of a constant -> its name in the namespace
+        self.tables = []  # Names of the dicts mapping a key to the name of a node function
+        # Nodes used in more than one place, or as dict values, become functions.
+        self.functions = {graph.root}
+        uses = {}
+        for node in graph.nodes:
+            kind = node[0]
+            if kind in ("literal", "length"):
+                children = [child for _, child in node[2]] + [node[3]]
+                if len(node[2]) > DICT_DISPATCH:
+                    self.functions.update(child for _, child in node[2])
+            elif kind == "type":
+                children = [node[3], node[4]]
+            else:
+                children = []
+            for child in children:
+                uses[child] = uses.get(child, 0) + 1
+        self.functions.update(node for node, count in uses.items() if count > 1)
+        self.functions = {node for node in self.functions if graph.nodes[node][0] not in ("fail", "leaf")}
+
+    def constant(self, value, prefix="K"):
+        if type(value) in (str, int, bytes) or value is None or (type(value) is float and math.isfinite(value)):
+            return repr(value)
+        if id(value) not in self.names:
+            self.names[id(value)] = f"{prefix}{len(self.names)}"
+            self.namespace[self.names[id(value)]] = value
+        return self.names[id(value)]
+
+    def write(self):
+        lines = []
+        written = set()
+        pending = [self.graph.root]
+        while pending:
+            node = pending.pop()
+            if node in written:
+                continue
+            written.add(node)
+            lines.append(f"def n{node}(record):")
+            lines.extend(self.body(node, 1, pending, top=True))
+            lines.append("")
+        return "\n".join(lines)
+
+    def body(self, node, depth, pending, top=False):
+        indent = "    " * depth
+        description = self.graph.nodes[node]
+        kind = description[0]
+        if not top and (node in self.functions or depth > MAX_INLINE_DEPTH):
+            pending.append(node)
+            return [f"{indent}return n{node}(record)"]
+        if kind == "fail":
+            return [f"{indent}return None"]
+        if kind == "leaf":
+            _, number, captures = description
+            fields = ", ".join(f"{name!r}: record{self.path(path)}" for name, path in captures)
+            return [f"{indent}return {number}, {{{fields}}}"]
+
+        value = f"record{self.path(description[1])}"
+        lines = []
+        if kind == "type":
+            _, _, cls, yes, no = description
+            lines.append(f"{indent}if isinstance({value}, {self.constant(cls, 'C')}):")
+            lines.extend(self.body(yes, depth + 1, pending))
+            lines.extend(self.body(no, depth, pending))
+            return lines
+
+        _, path, branches, default = description
+        lines.append(f"{indent}value = {value}")
+        if kind == "length":
+            lines.append(f"{indent}sequence = SEQUENCE_TYPES.get(type(value))")
+            lines.append(f"{indent}if sequence is None:")
+            lines.append(f"{indent}    sequence = is_sequence_type(type(value))")
+            lines.append(f"{indent}if sequence:")
+            level = depth + 1
+            lines.append(f"{indent}    length = len(value)")
+            test, keys = "length", branches
+        else:
+            for (singleton, key), child in branches:
+                if singleton:
+                    lines.append(f"{indent}if value is {key!r}:")
+                    lines.extend(self.body(child, depth + 1, pending))
+            level = depth
+            test, keys = "value", [(key, child) for (singleton, key), child in branches if not singleton]
+
+        inner = "    " * level
+        if len(keys) > DICT_DISPATCH:
+            table = self.constant({key: f"n{self.function(child, pending)}" for key, child in keys}, "D")
+            self.tables.append(table)
+            if kind == "length":
+                lines.append(f"{inner}target = {table}.get(length)")
+            else:
+                # Unhashable values equal none of the literals; most are recognized without raising.
+                lines.append(f"{inner}target = None")
+                lines.append(f"{inner}if type(value).__hash__ is not None:")
+                lines.append(f"{inner}    try:")
+                lines.append(f"{inner}        target = {table}.get(value)")
+                lines.append(f"{inner}    except TypeError:")
+                lines.append(f"{inner}        pass")
+            lines.append(f"{inner}if target is not None:")
+            lines.append(f"{inner}    return target(record)")
+        else:
+            for key, child in keys:
+                lines.append(f"{inner}if {test} == {self.constant(key)}:")
+                lines.extend(self.body(child, level + 1, pending))
+        lines.extend(self.body(default, depth, pending))
+        return lines
+
+    @staticmethod
+    def function(node, pending):
+        """Returns node, making sure it is written as a function for a dict to dispatch to."""
+        pending.append(node)
+        return node
+
+    @staticmethod
+    def path(path):
+        return "".join(f"[{index}]" for index in path)
+
+
+def compile_patterns(patterns):
+    """
+    Compiles patterns into a decision tree, written out as Python code.
+
+    Args:
+    patterns (list): Patterns built from Capture, Literal, Type, Sequence, Or and As.
+
+    Returns:
+    callable: match(record), returning (pattern number, captures) for the
+    first pattern that matches, or None. Its source attribute holds the code.
+    """
+    graph = DecisionGraph(patterns)
+    writer = CodeWriter(graph)
+    code = writer.write()
+    namespace = writer.namespace
+    exec(compile(code, "<compiled patterns>", "exec"), namespace)
+    # The dispatch dicts hold function names until the functions exist.
+    for table in writer.tables:
+        namespace[table] = {key: namespace[target] for key, target in namespace[table].items()}
+    match_record = namespace[f"n{graph.root}"]
+    match_record.source = code
+    match_record.size = len(graph.nodes)
+    return match_record
+
+
+def dispatcher(cases, default=None):
+    """
+    Compiles (pattern, handler) pairs into dispatch(record), which calls the
+    handler of the first matching pattern with the captures as keyword
+    arguments, or default(record) if no pattern matches.
+    """
+    match_record = compile_patterns([pattern for pattern, _ in cases])
+    handlers = [handler for _, handler in cases]
+
+    def dispatch(record):
+        found = match_record(record)
+        if found is None:
+            return None if default is None else default(record)
+        number, captures = found
+        return handlers[number](**captures)
+    return dispatch
+
+
+# ===== Benchmark: compiled tree vs written-out match over 120 cases =====
+
+NUMBER = Or(Type(int), Type(float))
+
+
+def benchmark_patterns():
+    """
+    120 patterns in the style of pattern_matching_v1.py: commands with typed
+    arguments, status codes, and the Point pattern.
+    """
+    patterns = [Type(list, Sequence([As(NUMBER, "x"), As(NUMBER, "y"), Literal(0)]))]
+    argument_types = [Type(int), Type(float), Type(str), NUMBER]
+    for i in range(80):
+        arguments = [As(argument_types[(i + j) % 4], f"arg{j}") for j in range(i % 4)]
+        patterns.append(Sequence([Literal(f"command{i}"), *arguments]))
+    for code in range(100, 130):
+        patterns.append(Literal(code))
+    patterns.append(Sequence([Literal("move"), As(Type(int), "dx"), As(Type(int), "dy")]))
+    patterns.append(Sequence([Capture("name"), WILDCARD]))
+    patterns.append(Sequence([Capture("name"), WILDCARD, WILDCARD]))
+    patterns.append(As(Type(str), "text"))
+    patterns.extend(Literal(word) for word in ("start", "stop", "pause", "resume", "reset", "status"))
+    return patterns
+
+
+def benchmark_records(count, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        match rng.randrange(6):
+            case 0:
+                records.append([rng.random(), rng.randrange(100), 0])
+            case 1:
+                i = rng.randrange(80)
+                records.append([f"command{i}", *(rng.choice([1, 2.5, "x"]) for _ in range(i % 4))])
+            case 2:
+                records.append(rng.randrange(90, 140))
+            case 3:
+                records.append(["move", rng.randrange(10), rng.randrange(10)])
+            case 4:
+                records.append(rng.choice(["start", "reset", "status", "other", "command5"]))
+            case _:
+                records.append(rng.choice([("a", 1), ["a", 1, 2, 3], {"a": 1}, None, 3.5]))
+    return records
+
+
+def run_benchmark(count=1_000_000):
+    patterns = benchmark_patterns()
+    namespace = {}
+    exec(source(patterns), namespace)
+    written = namespace["match_record"]
+
+    start = time.perf_counter()
+    compiled = compile_patterns(patterns)
+    print(f"{len(patterns)} patterns compiled into {compiled.size} nodes "
+          f"in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    records = benchmark_records(count)
+    for record in records[:10_000]:
+        assert compiled(record) == written(record), record
+
+    for label, function in [("written-out match", written), ("compiled tree", compiled)]:
+        start = time.perf_counter()
+        for record in records:
+            function(record)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>18}: {elapsed * 1e9 / count:8.1f} ns/record")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
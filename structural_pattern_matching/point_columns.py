@@ -0,0 +1,157 @@
+"""
+Columnar version of the Point pattern from pattern_matching_v1.py.
+
+The pattern classifies one record at a time:
+
+    match [x, y, z]:
+        case list([int() | float() as x, int() | float() as y, 0]):
+            ...
+
+classify() takes the same records as three columns (x, y and z) and
+classifies all of them in one pass. It returns a mask with one entry per
+record (true where the record is a Point) and the x and y columns of the
+matching records. The result is the same as running the scalar match on
+every record [x[i], y[i], z[i]], where the elements are the Python values the
+columns hold:
+
+- x and y must be int or float (bool counts, since it is a subclass of int)
+- z must equal 0 (0, 0.0, -0.0 and False do; NaN does not)
+
+Supported columns:
+
+- NumPy arrays (if NumPy is installed): the mask is a bool array and the
+  comparison runs in NumPy. Numeric dtypes hold ints and floats only, so
+  only z is compared; object columns are checked element by element and
+  other dtypes (strings, complex, dates) never match.
+- array.array: the mask is a bytearray of 0 and 1 and the x/y columns are
+  arrays of the same type code. Every numeric type code holds ints or floats,
+  so again only z is compared, with C-level map() instead of a Python loop.
+- Any other sequences (e.g. lists): element by element, the mask is a
+  bytearray and the x/y columns are lists.
+
+Run this script to compare the scalar match with classify() on 1 million records.
+"""
+
+import math
+import random
+import sys
+import time
+from array import array
+from itertools import compress, repeat
+from operator import eq
+
+try:
+    import numpy as np  # Optional: faster classification of NumPy columns.
+except ImportError:
+    np = None
+
+# array type codes that hold characters instead of numbers
+CHARACTER_CODES = frozenset("uw")
+
+# NumPy dtype kinds holding only ints and floats (bool, signed, unsigned, float)
+NUMBER_KINDS = "biuf"
+
+# NumPy dtype kinds whose elements can be compared with 0 (the above, complex and object)
+COMPARABLE_KINDS = "biufcO"
+
+
+def is_number(value):
+    """The int() | float() part of the pattern."""
+    return isinstance(value, (int, float))
+
+
+def classify(x, y, z):
+    """
+    Classifies the records (x[i], y[i], z[i]) like the Point pattern.
+
+    Args:
+    x, y, z: Columns of the same length: NumPy arrays, array.array or sequences.
+
+    Returns:
+    tuple: (mask, x of the Points, y of the Points).
+    """
+    if not len(x) == len(y) == len(z):
+        raise ValueError(f"Columns differ in length: {len(x)}, {len(y)}, {len(z)}")
+    if np is not None and any(isinstance(column, np.ndarray) for column in (x, y, z)):
+        return classify_numpy(*map(numpy_column, (x, y, z)))
+    if all(isinstance(column, array) for column in (x, y, z)):
+        return classify_array(x, y, z)
+    return classify_sequences(x, y, z)
+
+
+def numpy_column(column):
+    """
+    Returns a column as a NumPy array. Sequences become object arrays: np.asarray
+    would turn a list such as ["a", 1] into strings, and 1 would no longer match.
+    """
+    if isinstance(column, (np.ndarray, array)):
+        return np.asarray(column)  # Typed already: no conversion of the values
+    return np.asarray(column, dtype=object)
+
+
+def classify_numpy(x, y, z):
+    if z.dtype.kind in COMPARABLE_KINDS:
+        mask = np.asarray(z == 0, dtype=bool)
+    else:
+        mask = np.zeros(len(z), dtype=bool)
+    for column in (x, y):
+        if column.dtype.kind == "O":
+            mask &= np.fromiter(map(is_number, column), dtype=bool, count=len(column))
+        elif column.dtype.kind not in NUMBER_KINDS:
+            mask[:] = False
+    return mask, x[mask], y[mask]
+
+
+def classify_array(x, y, z):
+    if CHARACTER_CODES.intersection((x.typecode, y.typecode, z.typecode)):
+        mask = bytearray(len(z))
+    else:
+        mask = bytearray(map(eq, z, repeat(0)))
+    return mask, array(x.typecode, compress(x, mask)), array(y.typecode, compress(y, mask))
+
+
+def classify_sequences(x, y, z):
+    mask = bytearray(map(eq, z, repeat(0)))
+    for column in (x, y):
+        mask = bytearray(map(min, mask, map(is_number, column)))
+    return mask, list(compress(x, mask)), list(compress(y, mask))
+
+
+def classify_scalar(record):
+    """The pattern from pattern_matching_v1.py, one record at a time."""
+    match record:
+        case list([int() | float() as x, int() | float() as y, 0]):
+            return x, y
+    return None
+
+
+# ===== Benchmark: scalar match vs columnar classification =====
+
+def run_benchmark(count=1_000_000, hit_ratio=0.5):
+    rng = random.Random(0)
+    x = array("d", (rng.uniform(-1e3, 1e3) for _ in range(count)))
+    y = array("d", (rng.uniform(-1e3, 1e3) for _ in range(count)))
+    z = array("d", (0.0 if rng.random() < hit_ratio else rng.choice([1.0, -2.5, math.nan]) for _ in range(count)))
+    records = [[*record] for record in zip(x, y, z)]
+
+    runs = [
+        ("scalar match", lambda: [classify_scalar(record) for record in records]),
+        ("array columns", lambda: classify(x, y, z)),
+        ("list columns", lambda: classify(list(x), list(y), list(z))),
+    ]
+    if np is not None:
+        columns = [np.frombuffer(column, dtype=np.float64) for column in (x, y, z)]
+        runs.append(("numpy columns", lambda: classify(*columns)))
+
+    print(f"{count:,} records, {hit_ratio:.0%} Points")
+    for label, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>14}: {elapsed * 1e9 / count:8.1f} ns/record")
+    if np is None:
+        print("(NumPy is not installed; install it to benchmark NumPy columns.)")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
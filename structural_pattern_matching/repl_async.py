@@ -0,0 +1,253 @@
+"""
+Asyncio-backed version of repl_v2.py.
+
+Every input runs as an asyncio task, so the REPL supports top-level `await`
+and several inputs can run at the same time:
+
+    🐍 await asyncio.sleep(1)            # Runs in the foreground, Ctrl+C cancels it
+    🐍 & await probe("example.org")      # Runs in the background as job [1]
+    🐍 thread sum(range(10**9))          # Runs blocking code in a worker thread
+    🐍 & thread sum(range(10**9))        # ... also in the background
+    🐍 jobs                              # Lists running background jobs
+    🐍 wait 1                            # Brings job 1 to the foreground
+    🐍 cancel 1                          # Cancels job 1 ("cancel all" cancels every job)
+
+A word is only taken for a command while it is not a variable: after
+`jobs = []` or `thread = 1`, lines starting with it are plain Python code.
+
+Python cannot stop a running thread, so cancelling a `thread` job stops waiting
+for it while the worker thread finishes in the background. Those threads are
+daemon threads: leaving the REPL does not wait for them.
+"""
+
+import ast
+import asyncio
+import inspect
+import signal
+import sys
+import threading
+import traceback
+
+import repl_render
+import repl_v2
+from repl_v2 import compile_code
+
+PROMPT = repl_v2.PROMPT
+
+# Compiler flag that allows `await`, `async for` and `async with` outside functions
+TOP_LEVEL_AWAIT = ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+
+class Command(repl_v2.Command):
+    JOBS = "jobs"  # Command to list the running background jobs.
+    WAIT = "wait"  # Command to wait for a background job in the foreground.
+    CANCEL = "cancel"  # Command to cancel a background job.
+    BACKGROUND = "&"  # Prefix to run the input as a background job.
+    THREAD = "thread"  # Prefix to run the input in a worker thread.
+
+
+def evaluate(source, namespace):
+    """
+    Evaluates an expression or executes statements that may use top-level await.
+
+    Args:
+    source (str): The code to run.
+    namespace (dict): Global namespace the code runs in.
+
+    Returns:
+    tuple[bool, object]: Whether the result must still be awaited, and the result.
+
+    Raises:
+    SyntaxError: If source is neither a valid expression nor valid statements.
+    """
+    for mode in ("eval", "exec"):
+        if (code := compile_code(source, mode, TOP_LEVEL_AWAIT)) is not None:
+            # Code using await evaluates to a coroutine that runs the actual code.
+            return bool(code.co_flags & inspect.CO_COROUTINE), eval(code, namespace)
+    raise SyntaxError("Please type a command")
+
+
+def evaluate_blocking(source, namespace):
+    """Runs source to completion in the calling (worker) thread."""
+    awaitable, result = evaluate(source, namespace)
+    return asyncio.run(result) if awaitable else result
+
+
+async def in_daemon_thread(function, *args):
+    """
+    Like asyncio.to_thread, but in a daemon thread of its own, which neither
+    asyncio.run nor the interpreter waits for when they shut down.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(method, value):
+        if not future.done():  # The job may have been cancelled meanwhile.
+            method(value)
+
+    def target():
+        try:
+            result = function(*args)
+        except BaseException as error:
+            outcome = (future.set_exception, error)
+        else:
+            outcome = (future.set_result, result)
+        try:
+            loop.call_soon_threadsafe(settle, *outcome)
+        except RuntimeError:
+            pass  # The event loop is closed: nobody waits for the result any more.
+
+    threading.Thread(target=target, daemon=True).start()
+    return await future
+
+
+class AsyncREPL:
+    """
+    A REPL that runs each input as an asyncio task in a shared namespace.
+    """
+
+    def __init__(self):
+        self.namespace = {"__name__": "__main__", "asyncio": asyncio}
+        self.jobs = {}  # Job number -> (task, source)
+        self.next_job = 1
+        self.foreground = None  # Task currently blocking the prompt
+
+    async def run(self, source):
+        """Runs one input, awaiting it if needed, and renders the result like repl_v2."""
+        match source.split(maxsplit=1):
+            case [Command.THREAD, statement] if self.is_command(Command.THREAD, statement):
+                result = await in_daemon_thread(evaluate_blocking, statement, self.namespace)
+            case _:
+                awaitable, result = evaluate(source, self.namespace)
+                if awaitable:
+                    result = await result
+        if result is not None:
+            self.namespace["_"] = result  # Keep the result for the page command.
+            repl_render.render(result)  # Print it without building its full text.
+
+    def is_command(self, word, args=""):
+        """
+        Tells whether a line starting with word is a command: word is not one of
+        the user's variables, and the rest of the line is no continuation of code
+        (`thread = 1` assigns a variable).
+        """
+        if word in self.namespace:
+            return False
+        return word != Command.THREAD or repl_v2.valid(args, "exec")
+
+    def start_job(self, source):
+        """Starts source as a background job."""
+        number, self.next_job = self.next_job, self.next_job + 1
+        task = asyncio.create_task(self.run(source))
+        self.jobs[number] = (task, source)
+        task.add_done_callback(lambda task: self.finish_job(number, task))
+        print(f"[{number}] started")
+
+    def finish_job(self, number, task):
+        """Reports a finished background job."""
+        self.jobs.pop(number, None)
+        if task.cancelled():
+            print(f"\n[{number}] cancelled")
+        elif (error := task.exception()) is not None:
+            print(f"\n[{number}] failed: {type(error).__name__}: {error}")
+        else:
+            print(f"\n[{number}] done")
+
+    async def wait_foreground(self, task):
+        """Waits for a task in the foreground; Ctrl+C cancels only this task."""
+        self.foreground = task
+        try:
+            await asyncio.wait({task})
+        finally:
+            self.foreground = None
+        if task.cancelled():
+            print("\nKeyboardInterrupt")
+        else:
+            task.result()  # Re-raise the error of the task, if any.
+
+    def interrupt(self):
+        """Handles Ctrl+C: cancels the foreground task, if there is one."""
+        if self.foreground is not None:
+            self.foreground.cancel()
+        else:
+            print("\nKeyboardInterrupt")
+
+    async def execute(self, line):
+        """
+        Handles one line of input.
+
+        Returns:
+        bool: False if the REPL should stop, True otherwise.
+        """
+        match line.split(maxsplit=1):
+            case [word, *_] if word in self.namespace:
+                # A variable, e.g. `jobs` after `jobs = []`: the line is code.
+                await self.wait_foreground(asyncio.create_task(self.run(line)))
+
+            case [Command.JOBS]:
+                for number, (task, source) in self.jobs.items():
+                    print(f"[{number}] running  {source}")
+
+            case [Command.WAIT, number] if number.isdigit() and int(number) in self.jobs:
+                task, _ = self.jobs[int(number)]
+                await self.wait_foreground(task)
+
+            case [Command.CANCEL, "all"]:
+                for task, _ in list(self.jobs.values()):
+                    task.cancel()
+
+            case [Command.CANCEL, number] if number.isdigit() and int(number) in self.jobs:
+                task, _ = self.jobs[int(number)]
+                task.cancel()
+
+            case [Command.WAIT | Command.CANCEL, number] if number.isdigit():
+                print(f"No such job: {number}")
+
+            case [Command.BACKGROUND, source]:
+                self.start_job(source)
+
+            case []:
+                pass
+
+            # Commands registered with repl_v2 (help, exit, timeit, ...) run on the loop.
+            case _ if repl_v2.commands.resolve(line, self.namespace) is not None:
+                return repl_v2.execute(line, self.namespace)
+
+            case _:
+                await self.wait_foreground(asyncio.create_task(self.run(line)))
+
+        return True
+
+    async def main(self):
+        print('Type "help" for more information, "exit" or "quit" to finish.')
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass  # No signal handlers on this platform; Ctrl+C ends the REPL.
+
+        while True:
+            try:
+                # Read input in a thread so background jobs keep running.
+                line = await asyncio.to_thread(input, PROMPT)
+                if not await self.execute(line):
+                    break
+            except EOFError:
+                print()
+                break
+            except SyntaxError as error:
+                print(error.msg)
+            except Exception:
+                traceback.print_exc(file=sys.stdout)
+
+        # Stop waiting for background jobs; thread jobs run on in daemon threads.
+        for task, _ in list(self.jobs.values()):
+            task.cancel()
+
+
+def main():
+    asyncio.run(AsyncREPL().main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Non-interactive batch mode shared by repl_v1.py and repl_v2.py.
+
+When stdin is not a terminal (e.g. `python repl_v2.py < script.txt` or a pipe),
+prompting and flushing once per line is pure overhead. Batch mode instead:
+
+- reads stdin in large chunks and splits them into lines itself
+- runs every line without printing a prompt
+- collects output in memory and writes it to stdout in large blocks
+- reports errors as "line N: ErrorType: message" instead of full tracebacks
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+# Number of characters read from stdin at once
+CHUNK_SIZE = 1 << 20
+
+# Number of characters of output collected before writing them to stdout
+BUFFER_SIZE = 1 << 20
+
+
+def interactive(stream=None):
+    """
+    Checks whether input comes from a terminal.
+
+    Args:
+    stream (io.TextIOBase): The input stream, sys.stdin by default.
+
+    Returns:
+    bool: True if a user is typing, False for pipes and redirected files.
+    """
+    stream = sys.stdin if stream is None else stream
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def read_lines(stream, chunk_size=CHUNK_SIZE):
+    """
+    Reads a text stream in large chunks and yields it line by line.
+
+    Args:
+    stream (io.TextIOBase): The stream to read.
+    chunk_size (int): Number of characters to read at once.
+
+    Yields:
+    str: Each line without its trailing newline, like input() returns it.
+    """
+    pieces = []  # Pieces of a line that spans several chunks, joined once it is complete
+    while chunk := stream.read(chunk_size):
+        first, *lines = chunk.split("\n")
+        pieces.append(first)
+        if not lines:
+            continue  # No line ends in this chunk.
+        yield "".join(pieces)
+        last = lines.pop()  # The last piece may continue in the next chunk.
+        yield from lines
+        pieces = [last]
+    if pending := "".join(pieces):
+        yield pending
+
+
+def run_batch(execute, stdin=None, stdout=None, buffer_size=BUFFER_SIZE):
+    """
+    Runs every line of stdin through execute without prompts.
+
+    Args:
+    execute (callable): Handles one line; returns False to stop (exit/quit).
+    stdin (io.TextIOBase): Input stream, sys.stdin by default.
+    stdout (io.TextIOBase): Output stream, sys.stdout by default.
+    buffer_size (int): Number of characters of output buffered before writing.
+
+    Returns:
+    int: The number of lines that raised an error.
+    """
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    buffer = io.StringIO()
+    errors = 0
+
+    def flush():
+        stdout.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+
+    try:
+        with redirect_stdout(buffer):
+            for lineno, line in enumerate(read_lines(stdin), 1):
+                try:
+                    if not execute(line):
+                        break
+                except Exception as error:
+                    errors += 1
+                    print(f"line {lineno}: {type(error).__name__}: {error}")
+                if buffer.tell() >= buffer_size:
+                    flush()
+    finally:
+        # Always write what was collected, also on exit() or Ctrl+C.
+        flush()
+        stdout.flush()
+    return errors
@@ -0,0 +1,278 @@
+"""
+Persistent, searchable REPL history.
+
+Every line typed in repl_v2 is appended to a history that survives restarts
+and is shared by all REPL processes of the user. It is stored in two files:
+
+- PATH.dat: the entries as UTF-8 text, one per line, in the order typed
+- PATH.idx: the byte offset of every entry as 8-byte integers (in the byte
+  order of the machine), so entry N is found without reading the ones before it
+
+Both files are created readable by their owner only (mode 0600), as they may
+hold secrets typed at the prompt.
+
+Appends take an exclusive lock (fcntl.flock) on the data file while writing
+both files, so concurrent REPLs never interleave their entries. Searches map
+the data file into memory (mmap) and use its C-level find/rfind, newest entry
+first, so even millions of entries are searched in milliseconds without
+loading them into Python objects. The index is mapped too: a search or
+`history` only touches the offsets it needs, not the whole index. A search
+maps both files under a shared lock, so an append cannot come in between and
+shift the entry numbers.
+
+Usage in the REPL:
+    history            # Last 20 entries
+    history text       # Entries containing "text", newest first
+    history ^text      # Entries starting with "text", newest first
+
+Run this script to benchmark searching a history of 2 million entries.
+"""
+
+import bisect
+import mmap
+import os
+import tempfile
+import time
+from array import array
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl  # File locks; not available on Windows.
+except ImportError:
+    fcntl = None
+
+# Default location of the history files (without extension)
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".repl_v2_history")
+
+# Entries shown by `history` and loaded into readline at startup
+RECENT = 20
+
+# Type code of an offset in the index (8-byte unsigned integer)
+OFFSET = "Q"
+
+# Permissions of newly created history files: read and write for the owner only
+MODE = 0o600
+
+
+def private(path, flags):
+    """Opener for open() that creates files with MODE instead of the umask default."""
+    return os.open(path, flags, MODE)
+
+
+class History:
+    """
+    Append-only history with an offset index, searched through mmap.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.data_path = path + ".dat"
+        self.index_path = path + ".idx"
+        with self.locked() as data:
+            self.repair(data)
+
+    def locked(self):
+        """Opens the data file for appending and holds an exclusive lock on it."""
+        return LockedFile(self.data_path)
+
+    def repair(self, data):
+        """Rebuilds the index if a crashed writer left it out of step with the data."""
+        size = os.fstat(data.fileno()).st_size
+        with self.mapped_offsets() as offsets:
+            count = len(offsets)
+            last = offsets[-1] if count else None
+        if last is not None:
+            with open(self.data_path, "rb") as stream:
+                stream.seek(last)
+                end = last + len(stream.readline())
+        else:
+            end = 0
+        if end == size and count * array(OFFSET).itemsize == self.index_size():
+            return
+
+        rebuilt = array(OFFSET)
+        if size:
+            with open(self.data_path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                position = 0
+                while position < size:
+                    rebuilt.append(position)
+                    newline = view.find(b"\n", position)
+                    position = size if newline < 0 else newline + 1
+        with open(self.index_path, "wb", opener=private) as index:
+            index.write(rebuilt.tobytes())
+
+    def index_size(self):
+        try:
+            return os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def mapped_offsets(self):
+        """
+        Maps the index into memory and yields the start offset of every entry
+        as a read-only sequence, valid inside the with block only.
+        """
+        try:
+            index = open(self.index_path, "rb")
+        except FileNotFoundError:
+            yield array(OFFSET)
+            return
+        with index:
+            size = os.fstat(index.fileno()).st_size
+            size -= size % array(OFFSET).itemsize  # Ignore a partly written last offset.
+            if not size:
+                yield array(OFFSET)  # An empty file cannot be mapped.
+                return
+            with mmap.mmap(index.fileno(), size, access=mmap.ACCESS_READ) as view:
+                with memoryview(view) as raw, raw.cast(OFFSET) as offsets:
+                    yield offsets
+
+    def append(self, entry):
+        """Adds one entry; safe to call from several processes at once."""
+        # One line per entry: line breaks inside it become spaces (\r too, which
+        # terminals and readline would take for one).
+        encoded = entry.replace("\r", " ").replace("\n", " ").encode("utf-8", "replace") + b"\n"
+        with self.locked() as data:
+            offset = os.fstat(data.fileno()).st_size
+            os.write(data.fileno(), encoded)
+            with open(self.index_path, "ab", opener=private) as index:
+                index.write(array(OFFSET, [offset]).tobytes())
+
+    def __len__(self):
+        return self.index_size() // array(OFFSET).itemsize
+
+    def recent(self, count=RECENT):
+        """Returns the last count entries as (number, entry), oldest first."""
+        with self.mapped_offsets() as offsets:
+            first = max(0, len(offsets) - count)
+            if first == len(offsets):
+                return []
+            start = offsets[first]
+            count = len(offsets) - first  # Entries appended since are not shown.
+        with open(self.data_path, "rb") as stream:
+            stream.seek(start)
+            lines = stream.read().split(b"\n")  # Entries never hold a "\n"; other separators are text.
+        return [(first + i + 1, line.decode("utf-8", "replace")) for i, line in enumerate(lines[:count])]
+
+    def search(self, text, limit=RECENT, prefix=False):
+        """
+        Finds entries containing text (or starting with it), newest first.
+
+        Returns:
+        list[tuple[int, str]]: Up to limit (number, entry) pairs.
+        """
+        needle = text.encode("utf-8")
+        if prefix:
+            needle = b"\n" + needle  # An entry starts right after a newline, or at offset 0.
+        results = []
+        try:
+            stream = open(self.data_path, "rb")
+        except FileNotFoundError:
+            return results
+        with stream, ExitStack() as mapped:
+            with shared_lock(stream):  # No append between mapping the data and its index
+                if os.fstat(stream.fileno()).st_size == 0:
+                    return results
+                view = mapped.enter_context(mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ))
+                offsets = mapped.enter_context(self.mapped_offsets())
+            end = len(view)
+            while len(results) < limit:
+                hit = view.rfind(needle, 0, end)
+                if hit >= 0:
+                    start = hit + 1 if prefix else view.rfind(b"\n", 0, hit) + 1
+                elif prefix and view[:len(needle) - 1] == needle[1:]:
+                    start = 0  # The very first entry has no newline before it.
+                else:
+                    break
+                stop = view.find(b"\n", start)
+                stop = len(view) if stop < 0 else stop
+                number = bisect.bisect_right(offsets, start)
+                results.append((number, view[start:stop].decode("utf-8", "replace")))
+                if start == 0:
+                    break
+                end = hit if prefix else start  # Go on with the older entries.
+        return results
+
+
+@contextmanager
+def shared_lock(stream):
+    """Holds a shared lock on an open file: appends wait, other readers do not."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(stream.fileno(), fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(stream.fileno(), fcntl.LOCK_UN)
+
+
+class LockedFile:
+    """Context manager: the data file opened for appending, exclusively locked."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self.stream = open(self.path, "ab", opener=private)
+        if fcntl is not None:
+            fcntl.flock(self.stream.fileno(), fcntl.LOCK_EX)
+        return self.stream
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.stream.fileno(), fcntl.LOCK_UN)
+        self.stream.close()
+
+
+def show(results):
+    """Prints (number, entry) pairs, one per line."""
+    for number, entry in results:
+        print(f"{number:>8}  {entry}")
+
+
+def load_into_readline(history, count=1000):
+    """Makes the last count entries available to the arrow keys, if readline is available."""
+    try:
+        import readline
+    except ImportError:
+        return
+    for _, entry in history.recent(count):
+        readline.add_history(entry)
+
+
+# ===== Benchmark: search over millions of entries =====
+
+def run_benchmark(entries=2_000_000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history")
+        # Write the files in bulk; append() would take a lock per entry.
+        lines = [f"result_{i % 997} = compute(data[{i}], scale={i % 13})\n".encode() for i in range(entries)]
+        offsets = array(OFFSET)
+        position = 0
+        for line in lines:
+            offsets.append(position)
+            position += len(line)
+        with open(path + ".dat", "wb") as data:
+            data.writelines(lines)
+        with open(path + ".idx", "wb") as index:
+            index.write(offsets.tobytes())
+        del lines
+
+        history = History(path)
+        print(f"{len(history):,} entries, {position / 2**20:.0f} MiB")
+        for label, action in [
+            ("append", lambda: history.append("x = 1")),
+            ("last 20 entries", lambda: history.recent()),
+            ("substring, 20 hits", lambda: history.search("scale=7")),
+            ("prefix, 20 hits", lambda: history.search("result_5 ", prefix=True)),
+            ("substring, 1 hit (oldest)", lambda: history.search("data[0]")),
+            ("substring, no hit", lambda: history.search("not in history")),
+        ]:
+            start = time.perf_counter()
+            action()
+            print(f"{label:>28}: {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,329 @@
+"""
+Isolated execution mode for repl_v2.py with a pool of pre-forked workers.
+
+repl_v2 runs every statement in the REPL process itself, so a runaway
+statement or a memory blow-up takes the whole REPL down. Here statements run
+in a worker process instead:
+
+- Workers are forked ahead of time, after repl_v2 has been imported, so they
+  are warm: handing a statement to a worker costs one round trip over a pipe.
+- The namespace lives in the worker. Output comes back as text, and an
+  exception raised by a statement is raised again in the REPL process, so
+  batch mode counts and reports it as usual.
+- A worker that crashes, runs past the timeout or uses more memory than the
+  limit is replaced by a spare one. Its namespace is lost, and the REPL says so.
+  The address space of a worker is capped (RLIMIT_AS), so a huge allocation
+  fails with MemoryError in the statement instead of growing until it finishes.
+- Workers exit when the REPL process dies, even abruptly (kill -9).
+- Ctrl+C is forwarded to the worker and interrupts only the running statement.
+
+Usage:
+    python repl_pool.py          # REPL (batch mode when stdin is not a terminal)
+    python repl_pool.py bench    # Isolation overhead per statement
+"""
+
+import io
+import multiprocessing
+import os
+import pickle
+import resource
+import signal
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+
+import repl_v2
+from repl_batch import interactive, run_batch
+
+PROMPT = repl_v2.PROMPT
+
+# Number of idle workers kept ready to replace a worker
+SPARES = 2
+
+# Peak resident memory (bytes) after which a worker is retired
+MEMORY_LIMIT = 512 * 2**20
+
+# Seconds a statement may run before its worker is killed (None waits forever)
+TIMEOUT = 300
+
+# Parent ends of the pipes to all running workers. A worker forked later
+# inherits them and must close them, or it would keep the pipes of the other
+# workers open, and they would never see EOF when the REPL dies.
+PARENT_ENDS = set()
+
+
+def peak_memory():
+    """Returns the peak resident memory of the current process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KiB on Linux
+
+
+class RemoteError(Exception):
+    """Stands in for an exception of a statement that cannot be sent to the parent."""
+
+
+def address_space():
+    """Returns the address space of the current process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def limit_address_space(memory_limit):
+    """
+    Lets the current process map at most memory_limit bytes more than it has
+    mapped now, so allocations beyond it raise MemoryError.
+    """
+    current = address_space()
+    if current is None:
+        return  # No way to measure the baseline: rely on the check after each statement.
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (current + memory_limit, resource.RLIM_INFINITY))
+    except (ValueError, OSError):
+        pass  # A lower hard limit is already in place.
+
+
+def portable(error):
+    """Returns error if it survives pickling, otherwise a RemoteError with its text."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RemoteError("".join(traceback.format_exception_only(type(error), error)).strip())
+
+
+def worker_main(connection, memory_limit, inherited):
+    """
+    Runs lines received over connection in a private namespace and sends back
+    (output, keep_going, retired, error) for each of them; error is None or
+    (exception, traceback text).
+    """
+    for parent_end in inherited:
+        parent_end.close()  # Only the parent may hold them, so recv() sees EOF when it dies.
+    os.setpgrp()  # Ctrl+C in the terminal reaches the parent only, which forwards it.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ignore interrupts while idle.
+    limit_address_space(memory_limit)
+    namespace = {"__name__": "__main__"}
+    while True:
+        try:
+            line, batch = connection.recv()
+        except EOFError:
+            return  # The parent went away.
+
+        output = io.StringIO()
+        error = None
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            with redirect_stdout(output):
+                try:
+                    keep_going = repl_v2.execute(line, namespace, batch=batch)
+                except SystemExit:
+                    keep_going = False  # exit() or quit() called as a function
+                except Exception as exception:
+                    error = (portable(exception), traceback.format_exc())  # Raised again by the parent
+                    keep_going = True
+        except KeyboardInterrupt:
+            output.write("\nKeyboardInterrupt\n")
+            keep_going = True
+        finally:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        out_of_memory = error is not None and isinstance(error[0], MemoryError)
+        retired = out_of_memory or peak_memory() > memory_limit
+        if retired:
+            output.write(f"MemoryError: worker memory limit of {memory_limit / 2**20:.0f} MiB "
+                         f"exceeded, namespace reset\n")
+        connection.send((output.getvalue(), keep_going, retired, error))
+        if retired:
+            return
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker died or was killed while running a statement."""
+
+
+class Worker:
+    """
+    Handle of one worker process and the pipe to it.
+    """
+
+    def __init__(self, context, memory_limit):
+        self.connection, child = context.Pipe()
+        PARENT_ENDS.add(self.connection)
+        self.process = context.Process(
+            target=worker_main, args=(child, memory_limit, list(PARENT_ENDS)), daemon=True)
+        self.process.start()
+        child.close()
+
+    def execute(self, line, timeout=TIMEOUT, batch=False):
+        """
+        Runs a line in the worker.
+
+        Returns:
+        tuple[str, bool, bool, tuple | None]: The output, False if the REPL
+        should stop, True if the worker retired itself and must be replaced,
+        and (exception, traceback text) if the statement raised one.
+
+        Raises:
+        WorkerCrashed: If the worker died or did not answer within timeout.
+        """
+        self.connection.send((line, batch))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self.connection.poll(remaining):
+                    self.stop()
+                    raise WorkerCrashed(f"statement timed out after {timeout} seconds")
+                return self.connection.recv()
+            except KeyboardInterrupt:
+                os.kill(self.process.pid, signal.SIGINT)  # Interrupt the statement, keep waiting.
+            except (EOFError, ConnectionError):
+                self.process.join()
+                raise WorkerCrashed(f"worker exited with code {self.process.exitcode}") from None
+
+    def stop(self):
+        PARENT_ENDS.discard(self.connection)
+        self.connection.close()
+        self.process.kill()
+        self.process.join()
+
+
+class WorkerPool:
+    """
+    Keeps spare workers forked and ready, so replacing a worker is instant.
+    """
+
+    def __init__(self, spares=SPARES, memory_limit=MEMORY_LIMIT):
+        # Forked workers start with everything the parent has imported already.
+        self.context = multiprocessing.get_context("fork")
+        self.memory_limit = memory_limit
+        self.spares = [Worker(self.context, memory_limit) for _ in range(spares)]
+        self.size = spares
+
+    def acquire(self):
+        """Returns a warm worker and forks a new spare in its place."""
+        worker = self.spares.pop(0) if self.spares else Worker(self.context, self.memory_limit)
+        while len(self.spares) < self.size:
+            self.spares.append(Worker(self.context, self.memory_limit))
+        return worker
+
+    def close(self):
+        for worker in self.spares:
+            worker.stop()
+        self.spares.clear()
+
+
+class IsolatedSession:
+    """
+    A REPL session whose statements run in a worker of the pool.
+    """
+
+    def __init__(self, pool, timeout=TIMEOUT, batch=False):
+        self.pool = pool
+        self.timeout = timeout
+        self.batch = batch  # Raise SyntaxError for invalid input, as repl_v2 does in batch mode
+        self.worker = pool.acquire()
+        self.traceback = ""  # Traceback text of the last exception raised by a statement
+
+    def execute(self, line):
+        """
+        Runs one line of input in the worker and prints its output.
+
+        Returns:
+        bool: False if the REPL should stop, True otherwise.
+
+        Raises:
+        Exception: The exception the statement raised in the worker.
+        """
+        try:
+            output, keep_going, retired, error = self.worker.execute(line, self.timeout, self.batch)
+        except WorkerCrashed as error:
+            self.worker.stop()  # Close the pipe to the dead worker.
+            self.worker = self.pool.acquire()
+            print(f"Worker crashed ({error}), namespace reset")
+            return True
+        print(output, end="")
+        if retired:
+            self.worker.stop()
+            self.worker = self.pool.acquire()
+        if error is not None:
+            exception, self.traceback = error
+            raise exception
+        return keep_going
+
+    def close(self):
+        self.worker.stop()
+
+
+def main():
+    """
+    Starts repl_v2 with statements running in isolated worker processes.
+    """
+    pool = WorkerPool()
+    session = IsolatedSession(pool, batch=not interactive())
+    try:
+        if session.batch:
+            return 1 if run_batch(session.execute) else 0
+
+        print('Type "help" for more information, "exit" or "quit" to finish.')
+        while True:
+            try:
+                if not session.execute(input(PROMPT)):
+                    break
+            except KeyboardInterrupt:
+                print("\nKeyboardInterrupt")
+            except EOFError:
+                print()
+                break
+            except Exception:
+                print(session.traceback, end="")  # The traceback from the worker, like repl_v2.
+    finally:
+        session.close()
+        pool.close()
+
+
+# ===== Benchmark: isolation overhead per statement =====
+
+def run_benchmark(statements=20_000):
+    line = "x = 1 + 1"
+    namespace = {}
+    output = io.StringIO()
+
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        for _ in range(statements):
+            repl_v2.execute(line, namespace)
+    in_process = (time.perf_counter() - start) / statements
+
+    pool = WorkerPool()
+    worker = pool.acquire()
+    try:
+        start = time.perf_counter()
+        for _ in range(statements):
+            worker.execute(line)
+        isolated = (time.perf_counter() - start) / statements
+    finally:
+        worker.stop()
+        pool.close()
+
+    start = time.perf_counter()
+    replacement = WorkerPool(spares=1)
+    fork_time = time.perf_counter() - start
+    replacement.close()
+
+    print(f"In process:        {in_process * 1e6:8.1f} us per statement")
+    print(f"Isolated worker:   {isolated * 1e6:8.1f} us per statement")
+    print(f"Overhead:          {(isolated - in_process) * 1e6:8.1f} us per statement")
+    print(f"Forking a worker:  {fork_time * 1e3:8.1f} ms (paid ahead of time by the spare pool)")
+
+
+if __name__ == "__main__":
+    match sys.argv[1:]:
+        case ["bench"]:
+            run_benchmark()
+        case _:
+            sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Timing and profiling commands for repl_v2.py.
+
+    time <stmt>      Runs the statement once and reports wall and CPU time.
+    timeit <stmt>    Runs the statement in repeated, auto-sized loops and reports
+                     mean ± standard deviation and the best time per loop.
+    profile <stmt>   Runs the statement under cProfile and prints the top functions.
+    mem <stmt>       Runs the statement under tracemalloc and prints the biggest
+                     allocation differences.
+
+Every command runs the statement in the REPL namespace, so it can use (and
+change) variables defined earlier.
+"""
+
+import cProfile
+import pstats
+import statistics
+import time
+import timeit
+import tracemalloc
+
+import repl_render
+
+# Number of timing runs for timeit; each run lasts at least 0.2 seconds
+REPEAT = 7
+
+# Number of lines printed by profile and mem
+TOP = 15
+
+
+def format_time(seconds):
+    """Formats a duration with a readable unit, like the timeit module does."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6), ("ns", 1e-9)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def time_statement(run):
+    """Calls run() once and prints its wall and CPU time, and its result."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = run()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    print(f"Wall time: {format_time(wall)}, CPU time: {format_time(cpu)}")
+    if result is not None:
+        repl_render.render(result)  # Like repl_v2: large results are truncated, not built in full.
+
+
+def timeit_statement(source, namespace, repeat=REPEAT):
+    """
+    Times source with timeit: the loop count is chosen so one run lasts at
+    least 0.2 seconds, then the run is repeated to estimate the spread.
+    """
+    timer = timeit.Timer(source, globals=namespace)
+    number, _ = timer.autorange()
+    per_loop = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    mean, stdev = statistics.mean(per_loop), statistics.stdev(per_loop)
+    print(f"{format_time(mean)} ± {format_time(stdev)} per loop "
+          f"(mean ± std. dev. of {repeat} runs, {number:,} loops each), best {format_time(min(per_loop))}")
+
+
+def profile_statement(run, top=TOP):
+    """Calls run() under cProfile and prints the functions with the most cumulative time."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run()
+    finally:
+        profiler.disable()
+    pstats.Stats(profiler).strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+
+def memory_statement(run, top=TOP):
+    """Calls run() under tracemalloc and prints where memory was allocated."""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        run()
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    for difference in differences[:top]:
+        print(difference)
+    print(f"Traced memory: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB peak")
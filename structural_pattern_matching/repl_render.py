@@ -0,0 +1,205 @@
+"""
+Lazy, size-bounded rendering of REPL results.
+
+print(value) builds the complete str/repr of a value before writing a single
+character. For a list of 50 million elements or a deeply nested structure that
+freezes the REPL and spikes memory. render() instead walks the value and writes
+its text piece by piece, stopping at:
+
+- MAX_ITEMS elements per container: [0, 1, 2, ... (49999997 more)]
+- MAX_DEPTH levels of nesting: [[[...]]]
+- MAX_CHARS characters of output in total
+
+Strings, bytes and containers are rendered lazily: the built-in containers
+(list, tuple, dict, set, frozenset) and their subclasses, defaultdict,
+OrderedDict, Counter and deque, and any other Mapping, Sequence or Set (as
+TypeName({...}) or TypeName([...]), in iteration order). Other objects, and
+subclasses with a repr of their own, are rendered with their own
+str()/repr(), cut to MAX_CHARS. The output matches print(value) whenever
+nothing is cut.
+
+page() shows one page of the elements of a (large) value, so the rest of a
+truncated result can still be inspected.
+"""
+
+import heapq
+import itertools
+import sys
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Mapping, Sequence, Set
+from operator import itemgetter
+
+# Elements shown per container
+MAX_ITEMS = 100
+
+# Levels of nested containers shown
+MAX_DEPTH = 6
+
+# Characters written per result
+MAX_CHARS = 10_000
+
+# Elements shown by page()
+PAGE_SIZE = 50
+
+# Lazily rendered containers: opening and closing text
+BRACKETS = {list: ("[", "]"), tuple: ("(", ")"), set: ("{", "}"), frozenset: ("frozenset({", "})"), dict: ("{", "}")}
+
+# Strings rendered as their repr, cut to the character limit
+TEXT = (str, bytes, bytearray)
+
+
+def brackets(value):
+    """
+    Returns the opening and closing text of a container pieces() renders lazily,
+    or None if value is shown with its own repr().
+    """
+    kind = type(value)
+    if kind in BRACKETS:
+        return BRACKETS[kind]
+    name = kind.__name__
+    if isinstance(value, defaultdict):
+        return f"{name}({value.default_factory!r}, {{", "})"
+    if isinstance(value, OrderedDict) and sys.version_info < (3, 12):
+        return f"{name}([", "])"  # Shown as a list of (key, value) pairs before Python 3.12
+    if isinstance(value, (OrderedDict, Counter)):
+        return f"{name}({{", "})"
+    if isinstance(value, deque):
+        return f"{name}([", "])" if value.maxlen is None else f"], maxlen={value.maxlen})"
+    for base, (opening, closing) in BRACKETS.items():
+        if isinstance(value, base):
+            # A subclass prints like its base, unless it has a repr of its own (e.g. a namedtuple).
+            return (opening, closing) if kind.__repr__ is base.__repr__ else None
+    if isinstance(value, Mapping) or isinstance(value, Set):
+        return f"{name}({{", "})"
+    if isinstance(value, Sequence) and not isinstance(value, (*TEXT, range, memoryview)):
+        return f"{name}([", "])"
+    return None
+
+
+def pieces(value, max_items=MAX_ITEMS, max_depth=MAX_DEPTH, max_chars=MAX_CHARS, seen=None):
+    """
+    Yields the repr of value in small pieces, truncated by element count and depth.
+
+    Args:
+    value (object): The value to render.
+    max_items (int): Elements shown per container.
+    max_depth (int): Levels of nesting still allowed below this value.
+    max_chars (int): Characters of a single string shown.
+    seen (set): Ids of the containers being rendered, to stop at cycles.
+
+    Yields:
+    str: Consecutive pieces of the repr.
+    """
+    if isinstance(value, TEXT):
+        if len(value) > max_chars:
+            yield repr(value[:max_chars])  # Only the part shown is converted.
+            yield f"...({len(value) - max_chars} more)"
+        else:
+            yield repr(value)
+        return
+    found = brackets(value)
+    if found is None or not value:
+        yield repr(value)  # Empty containers are cheap to show as they are.
+        return
+
+    opening, closing = found
+    seen = set() if seen is None else seen
+    if max_depth <= 0 or id(value) in seen:
+        yield f"{opening}...{closing}"
+        return
+
+    seen.add(id(value))
+    yield opening
+    items = value.items() if isinstance(value, Mapping) else value
+    if isinstance(value, Counter):
+        try:
+            items = heapq.nlargest(max_items, items, key=itemgetter(1))  # Most common first, like its repr
+        except TypeError:
+            pass  # Counts that cannot be ordered: insertion order, as its repr falls back to
+    keyed = isinstance(value, Mapping) and opening.endswith("{")  # key: value, not (key, value) pairs
+    for index, item in enumerate(itertools.islice(items, max_items)):
+        if index:
+            yield ", "
+        if keyed:
+            yield from pieces(item[0], max_items, max_depth - 1, max_chars, seen)
+            yield ": "
+            item = item[1]
+        yield from pieces(item, max_items, max_depth - 1, max_chars, seen)
+    if len(value) > max_items:
+        yield f", ... ({len(value) - max_items} more)"
+    elif closing == ")" and len(value) == 1:
+        yield ","  # A tuple of one element
+    yield closing
+    seen.discard(id(value))
+
+
+def render(value, stream=None, max_items=MAX_ITEMS, max_depth=MAX_DEPTH, max_chars=MAX_CHARS):
+    """
+    Writes value like print(value) does, without building its full text.
+
+    Args:
+    value (object): The value to render.
+    stream (io.TextIOBase): Where to write, sys.stdout by default.
+    max_items (int): Elements shown per container.
+    max_depth (int): Levels of nesting shown.
+    max_chars (int): Characters written in total.
+    """
+    stream = sys.stdout if stream is None else stream
+    if isinstance(value, str) and type(value).__str__ is str.__str__:
+        parts = iter([value[:max_chars + 1]])  # print() shows strings without quotes.
+    elif isinstance(value, (bytes, bytearray)) or brackets(value) is not None:
+        parts = pieces(value, max_items, max_depth, max_chars)  # For these, str() is the repr.
+    else:
+        parts = iter([str(value)])
+
+    remaining = max_chars
+    for part in parts:
+        if len(part) > remaining:
+            stream.write(part[:remaining])
+            stream.write(" ...(output truncated, see `page`)")
+            break
+        stream.write(part)
+        remaining -= len(part)
+    stream.write("\n")
+
+
+def page(value, number, page_size=PAGE_SIZE, stream=None):
+    """
+    Writes the elements of one page of value, one per line with their index.
+
+    Args:
+    value (object): A string, bytes or container.
+    number (int): The page to show, starting at 1.
+    page_size (int): Elements per page.
+    stream (io.TextIOBase): Where to write, sys.stdout by default.
+    """
+    stream = sys.stdout if stream is None else stream
+    text = isinstance(value, TEXT)
+    if not text and brackets(value) is None:
+        render(value, stream)
+        return
+
+    # Text is paged as page_size lines of MAX_ITEMS characters each.
+    unit = page_size * MAX_ITEMS if text else page_size
+    pages = max(1, -(-len(value) // unit))
+    if not 1 <= number <= pages:
+        stream.write(f"No page {number}, there are {pages} pages\n")
+        return
+
+    start = (number - 1) * unit
+    if text:
+        chunk = value[start:start + unit]
+        for offset in range(0, len(chunk), MAX_ITEMS):
+            stream.write(f"{start + offset:>10}: {chunk[offset:offset + MAX_ITEMS]!r}\n")
+    else:
+        if isinstance(value, (list, tuple)):
+            items = value[start:start + unit]  # Sequences jump straight to the page.
+        else:
+            items = itertools.islice(value.items() if isinstance(value, Mapping) else value, start, start + unit)
+        for index, item in enumerate(items, start):
+            if isinstance(value, Mapping):
+                key, item = item
+                index = "".join(pieces(key, max_items=10, max_depth=1))
+            stream.write(f"{index:>10}: ")
+            render(item, stream, max_items=10, max_depth=2, max_chars=200)
+    stream.write(f"-- page {number} of {pages} --\n")
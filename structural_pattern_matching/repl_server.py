@@ -0,0 +1,411 @@
+"""
+Multi-session server for repl_v2.py over a local Unix domain socket.
+
+One warm Python process serves many users at once. Every connection is a
+session with its own namespace, handled by the same repl_v2.execute function
+(commands, valid() checks, eval/exec) as the interactive REPL.
+
+Each session has a memory limit. Every session compiles its code under its
+own file name ("<session-N>"), so tracemalloc attributes each allocation to
+the session whose code made it, even while other sessions run. When the
+process holds more than the limit in total, a snapshot filtered on the
+session's file name gives the memory that session still holds; a session
+over its limit has its namespace cleared. Python cannot stop a statement half
+way, so the limit is enforced after each statement, not during it. Snapshots
+are shared by all sessions and taken at most once per SNAPSHOT_INTERVAL, so a
+process over the limit does not pay for one after every statement; a session
+may thus be cleared a statement later than it went over its limit.
+
+Statements run in a thread of their session, not on the event loop, so a long
+computation (even an endless loop) in one session does not delay the others.
+What a statement prints goes to its own session: sys.stdout is replaced by a
+stream chosen per thread.
+
+Commands that show files of the host, such as history, are disabled: the
+users of a session are not necessarily the owner of the server.
+
+Usage:
+    python repl_server.py serve [PATH]      # Start the server
+    python repl_server.py connect [PATH]    # Open a session from the terminal
+    python repl_server.py bench [PATH]      # Session count vs response latency
+"""
+
+import asyncio
+import io
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import stat
+import tempfile
+import threading
+import time
+import traceback
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+
+import repl_v2
+
+PROMPT = repl_v2.PROMPT
+
+# Default location of the socket, one per user
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"repl-server-{os.getuid()}.sock")
+
+# Bytes a session may hold before its namespace is cleared (None disables the limit)
+MEMORY_LIMIT = 64 * 2**20
+
+# Frames tracemalloc keeps per allocation, so allocations made by library code
+# that a session calls are still attributed to the session
+TRACE_FRAMES = 16
+
+# Seconds a tracemalloc snapshot is reused for measuring sessions
+SNAPSHOT_INTERVAL = 1.0
+
+WELCOME = 'Type "help" for more information, "exit" or "quit" to finish.\n'
+
+
+class ThreadStdout(io.TextIOBase):
+    """
+    Replacement for sys.stdout that writes to the stream redirect_output() chose
+    for the current thread, or to the original stdout.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def stream(self):
+        return getattr(self.local, "stream", self.default)
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return self.stream().write(text)
+
+    def flush(self):
+        self.stream().flush()
+
+
+@contextmanager
+def thread_stdout():
+    """Installs a ThreadStdout as sys.stdout while the block runs."""
+    original = sys.stdout
+    sys.stdout = ThreadStdout(original)
+    try:
+        yield sys.stdout
+    finally:
+        sys.stdout = original
+
+
+@contextmanager
+def redirect_output(stream):
+    """Like redirect_stdout, but only for the current thread if a ThreadStdout is installed."""
+    stdout = sys.stdout
+    if not isinstance(stdout, ThreadStdout):
+        with redirect_stdout(stream):
+            yield
+        return
+    stdout.local.stream = stream
+    try:
+        yield
+    finally:
+        del stdout.local.stream
+
+
+class SnapshotCache:
+    """
+    A tracemalloc snapshot shared by the sessions, taken again at most once per
+    interval however many statements finish while the process is over the limit.
+    """
+
+    def __init__(self, interval=SNAPSHOT_INTERVAL):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.taken = float("-inf")  # time.monotonic() of the snapshot
+
+    def get(self, since):
+        """
+        Returns a snapshot taken at or after since (a time.monotonic() value),
+        or None if none was and the next one is not due yet.
+        """
+        with self.lock:
+            if self.taken < since:
+                if time.monotonic() - self.taken < self.interval:
+                    return None
+                self.snapshot = tracemalloc.take_snapshot()
+                self.taken = time.monotonic()
+            return self.snapshot
+
+    def due(self):
+        """Returns the seconds until the next snapshot may be taken."""
+        return max(0.0, self.taken + self.interval - time.monotonic())
+
+
+class Session:
+    """
+    State of one connected user: a namespace and its memory usage.
+    """
+
+    def __init__(self, number, memory_limit=MEMORY_LIMIT, snapshots=None):
+        self.number = number
+        self.filename = f"<session-{number}>"  # Code file name, by which allocations are attributed
+        self.namespace = {"__name__": "__main__"}
+        self.memory_limit = memory_limit
+        self.memory = 0  # Bytes allocated by this session's code and still held, when last measured
+        self.snapshots = SnapshotCache() if snapshots is None else snapshots
+        self.measured = None  # The snapshot self.memory was measured in
+        self.unchecked = None  # End time of a statement whose memory check is still due
+        self.notice = ""  # Message of a check made between statements, sent with the next output
+
+    def execute(self, line):
+        """
+        Runs one line of input in this session.
+
+        Returns:
+        tuple[str, bool]: The output, and False if the session should end.
+        """
+        output = io.StringIO()
+        output.write(self.notice)
+        self.notice = ""
+        with redirect_output(output):
+            try:
+                keep_going = repl_v2.execute(line, self.namespace, self.filename, remote=True)
+            except SystemExit:
+                keep_going = False  # exit() or quit() called as a function
+            except Exception:
+                traceback.print_exc(file=sys.stdout)  # Display the traceback, like repl_v2.
+                keep_going = True
+        output.write(self.enforce_limit(time.monotonic()))
+        return output.getvalue(), keep_going
+
+    def enforce_limit(self, since):
+        """
+        Clears the namespace if the session holds more than its limit, measured
+        in a snapshot taken after since. If no such snapshot may be taken yet,
+        the check is left to check_deferred(), and self.unchecked is set.
+
+        Returns:
+        str: The message for the user, "" if the namespace was kept.
+        """
+        self.unchecked = None
+        if self.memory_limit is None or not tracemalloc.is_tracing():
+            return ""
+        # A session holds at most what the whole process holds: no snapshot is needed below the limit.
+        if tracemalloc.get_traced_memory()[0] <= self.memory_limit:
+            self.memory = 0
+            return ""
+        snapshot = self.snapshots.get(since)
+        if snapshot is None:
+            self.unchecked = since
+            return ""
+        if snapshot is not self.measured:  # Filtering costs a pass over all traces, so do it once.
+            self.measured = snapshot
+            traces = snapshot.filter_traces([tracemalloc.Filter(True, self.filename, all_frames=True)]).traces
+            self.memory = sum(trace.size for trace in traces)
+        if self.memory <= self.memory_limit:
+            return ""
+        self.reset()
+        return (f"MemoryError: session memory limit of {self.memory_limit / 2**20:.0f} MiB "
+                f"exceeded, namespace cleared\n")
+
+    def check_deferred(self):
+        """Makes the memory check a statement left due; its message goes out with the next output."""
+        if self.unchecked is not None:
+            self.notice += self.enforce_limit(self.unchecked)
+
+    def reset(self):
+        """Drops every variable of the session."""
+        self.namespace.clear()
+        self.namespace["__name__"] = "__main__"
+        self.memory = 0
+
+
+def remove_stale_socket(path):
+    """
+    Removes the socket file of a server that is no longer running.
+
+    Raises:
+    FileExistsError: If path is not a socket, or a server still listens on it.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)  # Left behind by a server that did not shut down cleanly
+            return
+    raise FileExistsError(f"A server is already listening on {path}")
+
+
+class REPLServer:
+    """
+    Accepts sessions on a Unix socket and answers each line with its output
+    followed by the prompt.
+    """
+
+    def __init__(self, path=SOCKET_PATH, memory_limit=MEMORY_LIMIT):
+        self.path = path
+        self.memory_limit = memory_limit
+        self.sessions = 0
+        self.snapshots = SnapshotCache()
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        session = Session(self.sessions, self.memory_limit, self.snapshots)
+        # One thread per session: a session runs one statement at a time, and
+        # its endless loop cannot take the threads of other sessions.
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=session.filename)
+        writer.write((WELCOME + PROMPT).encode())
+        loop = asyncio.get_running_loop()
+        checker = None
+        try:
+            while line := await reader.readline():
+                output, keep_going = await loop.run_in_executor(
+                    executor, session.execute, line.decode().rstrip("\r\n"))
+                if not keep_going:
+                    break
+                writer.write((output + PROMPT).encode())
+                await writer.drain()
+                if session.unchecked is not None and (checker is None or checker.done()):
+                    checker = asyncio.create_task(self.check_later(session, executor))
+        except (ConnectionError, ValueError):
+            pass  # Client went away, or sent a line longer than the stream limit
+        finally:
+            if checker is not None:
+                checker.cancel()
+            executor.shutdown(wait=False)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def check_later(self, session, executor):
+        """Runs the memory check of a session once the next snapshot is due, also if it stays idle."""
+        loop = asyncio.get_running_loop()
+        while session.unchecked is not None:
+            await asyncio.sleep(self.snapshots.due())
+            await loop.run_in_executor(executor, session.check_deferred)
+
+    async def serve(self, started=None):
+        """
+        Serves sessions until cancelled.
+
+        Args:
+        started (asyncio.Event | None): Set once the socket accepts connections.
+        """
+        remove_stale_socket(self.path)
+        server = await asyncio.start_unix_server(self.handle, self.path, backlog=1024)
+        inode = os.stat(self.path).st_ino  # Only this socket file is removed on exit.
+        tracing = self.memory_limit is not None and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(TRACE_FRAMES)
+        print(f"Serving on {self.path}", flush=True)
+        if started is not None:
+            started.set()
+        try:
+            with thread_stdout():
+                async with server:
+                    await server.serve_forever()
+        finally:
+            if tracing:
+                tracemalloc.stop()
+            try:
+                if os.stat(self.path).st_ino == inode:
+                    os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+# ===== Client =====
+
+def read_response(stream):
+    """Reads from a socket file until the prompt; returns "" when the server closed."""
+    marker = PROMPT.encode()
+    data = bytearray()
+    while not data.endswith(marker):
+        byte = stream.read(1)
+        if not byte:
+            break
+        data += byte
+    return data.decode()
+
+
+def connect(path=SOCKET_PATH):
+    """Opens a session and relays lines between the terminal and the server."""
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(path)
+        stream = sock.makefile("rwb")
+        while response := read_response(stream):
+            print(response, end="", flush=True)
+            try:
+                line = input()
+            except EOFError:
+                print()
+                break
+            stream.write(line.encode() + b"\n")
+            stream.flush()
+
+
+# ===== Benchmark: session count vs response latency =====
+
+async def measure_sessions(path, sessions, requests=50):
+    """
+    Opens the given number of sessions at once; each sends requests lines and
+    waits for every answer. Returns the latencies and the total time.
+    """
+    marker = PROMPT.encode()
+    latencies = []
+
+    async def session():
+        reader, writer = await asyncio.open_unix_connection(path)
+        await reader.readuntil(marker)
+        for i in range(requests):
+            start = time.perf_counter()
+            writer.write(f"x = {i}; x * 2\n".encode())
+            await reader.readuntil(marker)
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return sorted(latencies), time.perf_counter() - start
+
+
+def run_benchmark(path=SOCKET_PATH, session_counts=(1, 10, 100, 500)):
+    server = subprocess.Popen([sys.executable, __file__, "serve", path], stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()  # Wait for "Serving on ..."
+        print(f"{'sessions':>9} {'requests/s':>12} {'p50':>10} {'p99':>10} {'stdev':>10}")
+        for count in session_counts:
+            latencies, elapsed = asyncio.run(measure_sessions(path, count))
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(f"{count:>9} {len(latencies) / elapsed:>12,.0f} "
+                  f"{statistics.median(latencies) * 1e3:>8.2f}ms {p99 * 1e3:>8.2f}ms "
+                  f"{statistics.pstdev(latencies) * 1e3:>8.2f}ms")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    match sys.argv[1:]:
+        case ["serve", *path]:
+            try:
+                asyncio.run(REPLServer(*path).serve())
+            except KeyboardInterrupt:
+                pass
+        case ["connect", *path]:
+            connect(*path)
+        case ["bench", *path]:
+            run_benchmark(*path)
+        case _:
+            print(__doc__)
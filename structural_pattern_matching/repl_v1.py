@@ -1,6 +1,8 @@
 import sys
 import traceback
 
+from repl_batch import interactive, run_batch
+
 PROMPT = "\N{snake} "
 
 class Command:
@@ -9,20 +11,28 @@ class Command:
     QUIT = "quit"
 
 
+def execute(line):
+    match line:
+        case Command.HELP:
+            message = f"Python {sys.version}"
+            print(message)
+        case Command.EXIT:
+            return False
+        case Command.QUIT:
+            return False
+        case _:
+            print("Please type a command")
+    return True
+
+
 def main():
+    if not interactive():
+        return 1 if run_batch(execute) else 0
     print('Type "help" for more information, "exit" or "quit" to finish.')
     while True:
         try:
-            match input(PROMPT):
-                case Command.HELP:
-                    message = f"Python {sys.version}"
-                    print(message)
-                case Command.EXIT:
-                    break
-                case Command.QUIT:
-                    break
-                case _:
-                    print("Please type a command")
+            if not execute(input(PROMPT)):
+                break
         except KeyboardInterrupt:
             print("\nKeyboardInterrupt")
         except EOFError:
@@ -32,4 +42,4 @@ def main():
             traceback.print_exc(file=sys.stdout)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
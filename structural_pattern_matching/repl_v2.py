@@ -1,16 +1,79 @@
 import ast  # Module to parse and analyze Abstract Syntax Trees (ASTs) in Python.
+import functools  # Module providing the lru_cache decorator for compiled code.
 import sys  # Module providing access to system-level functionality.
 import traceback  # Module to handle and format exceptions for debugging.
 
+import repl_history  # Persistent input history shared by all REPL processes.
+import repl_profiling  # Timing and profiling commands.
+import repl_render  # Size-bounded printing of results.
+from repl_batch import interactive, run_batch  # Non-interactive mode for piped input.
+from repl_commands import commands  # Registry of commands, shared with plugins.
+
 # Prompt symbol for user interaction
 PROMPT = "\N{snake} "  # Unicode snake emoji (🐍) as a prompt symbol.
 
+# Number of compiled inputs kept, so repeated inputs skip parsing and compiling.
+CACHE_SIZE = 1024
+
 
 # Class to define command constants for better readability and maintainability.
 class Command:
     HELP = "help"  # Command to display help information.
     EXIT = "exit"  # Command to exit the REPL.
     QUIT = "quit"  # An alternative command to exit the REPL.
+    TIME = "time"  # Command to time a statement once.
+    TIMEIT = "timeit"  # Command to time a statement over repeated runs.
+    PROFILE = "profile"  # Command to profile a statement with cProfile.
+    MEM = "mem"  # Command to trace the memory allocated by a statement.
+    PAGE = "page"  # Command to page through the last result.
+    HISTORY = "history"  # Command to search the persistent input history.
+
+
+# Function to parse the provided Python code once, shared by both modes.
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse(code):
+    """
+    Parses Python code as a module (statements), caching the result.
+
+    Args:
+    code (str): The code to parse.
+
+    Returns:
+    ast.Module | None: The syntax tree, or None if the code is not valid Python syntax.
+    """
+    try:
+        return ast.parse(code, mode="exec")  # Parse once; expressions are statements too.
+    except SyntaxError:
+        return None  # Code is invalid due to a syntax error.
+
+
+# Function to compile the provided Python code, reusing the cached syntax tree.
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_code(code, mode, flags=0, filename="<string>"):
+    """
+    Compiles Python code in the given mode from its cached syntax tree.
+
+    Args:
+    code (str): The code to compile.
+    mode (str): Specifies the mode for compiling; "eval" for expressions, "exec" for statements.
+    flags (int): Compiler flags, e.g. ast.PyCF_ALLOW_TOP_LEVEL_AWAIT.
+    filename (str): File name shown in tracebacks and recorded by tracemalloc.
+
+    Returns:
+    types.CodeType | None: The code object, or None if the code is not valid in this mode.
+    """
+    tree = parse(code)
+    if tree is None:
+        return None
+    if mode == "eval":
+        # An expression is a module made of a single expression statement.
+        if len(tree.body) != 1 or not isinstance(tree.body[0], ast.Expr):
+            return None
+        try:
+            return compile(ast.Expression(tree.body[0].value), filename, "eval", flags)
+        except SyntaxError:
+            return None  # E.g. `yield` outside a function; left for exec to report.
+    return compile(tree, filename, "exec", flags)
 
 
 # Function to check the validity of the provided Python code.
@@ -26,44 +89,185 @@ def valid(code, mode):
     bool: True if code is valid Python syntax, False otherwise.
     """
     try:
-        ast.parse(code, mode=mode)  # Parse the code using the given mode.
-        return True  # Code is valid if no exceptions are raised.
+        return compile_code(code, mode) is not None  # Parsed and compiled at most once.
     except SyntaxError:
-        return False  # Code is invalid due to a syntax error.
+        return True  # Valid syntax that fails to compile; exec reports the error.
+
+
+# Function to compile code up front, so the timing and profiling commands measure only running it.
+def runner(code, namespace):
+    """
+    Compiles code and returns a function that runs it.
+
+    Args:
+    code (str): The code to run.
+    namespace (dict): Global namespace the code runs in.
+
+    Returns:
+    callable: Returns the value of an expression, None for statements.
+    """
+    if (compiled := compile_code(code, "eval")) is not None:
+        return lambda: eval(compiled, namespace)
+    compiled = compile_code(code, "exec")
+    return lambda: exec(compiled, namespace)
+
+
+# Built-in commands, registered in the command registry like plugin commands.
+@commands.command(Command.HELP, help="Show the Python version and the available commands")
+def show_help(args, namespace):
+    message = f"Python {sys.version}"  # Get the current Python version.
+    print(message)
+    for name in commands:  # List every registered command with its help text.
+        print(f"  {name:<10} {commands.lookup(name).help}")
+
+
+@commands.command(Command.EXIT, help="Close the REPL")
+@commands.command(Command.QUIT, help="Close the REPL")
+def close(args, namespace):
+    return False  # Tell the caller to stop reading input.
+
+
+# Argument pattern of the performance commands: a valid, non-empty statement.
+def statement_argument(args):
+    return bool(args) and valid(args, "exec")
+
+
+# Performance commands, e.g. `timeit sorted(data)`. The pattern keeps code such
+# as `time = 5` working as a normal statement; once `time` is a variable, every
+# line starting with it is code, e.g. `time - 5` (see CommandRegistry.resolve).
+@commands.command(Command.TIME, pattern=statement_argument, help="Time a statement once")
+def time_command(args, namespace):
+    repl_profiling.time_statement(runner(args, namespace))
+
+
+@commands.command(Command.TIMEIT, pattern=statement_argument, help="Time a statement over repeated runs")
+def timeit_command(args, namespace):
+    repl_profiling.timeit_statement(args, namespace)
+
+
+@commands.command(Command.PROFILE, pattern=statement_argument, help="Profile a statement with cProfile")
+def profile_command(args, namespace):
+    repl_profiling.profile_statement(runner(args, namespace))
+
+
+@commands.command(Command.MEM, pattern=statement_argument, help="Trace the memory a statement allocates")
+def mem_command(args, namespace):
+    repl_profiling.memory_statement(runner(args, namespace))
+
+
+# Page command, e.g. `page 3`: show part of the last result in full.
+@commands.command(Command.PAGE, pattern=r"\d*", help="Show page N of the last result")
+def page_command(args, namespace):
+    if "_" in namespace:
+        repl_render.page(namespace["_"], int(args or 1))
+    else:
+        print("No result to page through")
+
+
+# Function to open the history file once, on first use.
+@functools.cache
+def open_history():
+    return repl_history.History()
+
+
+# Argument pattern of the history command: anything but a statement such as
+# `history = []`, which keeps working as normal code. Once `history` is a
+# variable, every line starting with it is code (see CommandRegistry.resolve).
+def history_argument(args):
+    line = f"{Command.HISTORY} {args}"
+    return not args or valid(line, "eval") or not valid(line, "exec")
+
+
+# History command, e.g. `history ^import`.
+@commands.command(Command.HISTORY, pattern=history_argument, local=True,
+                  help="Show recent input, or search it: history text, history ^prefix")
+def history_command(args, namespace):
+    history = open_history()
+    if not args:
+        repl_history.show(history.recent())
+    elif args.startswith("^"):
+        repl_history.show(history.search(args[1:], prefix=True))
+    else:
+        repl_history.show(history.search(args))
+
+
+# Function to handle a single line of input, shared by the interactive and batch modes.
+def execute(line, namespace, filename="<string>", batch=False, remote=False):
+    """
+    Handles one line of input as a command, an expression or a statement.
+
+    Args:
+    line (str): The line of input.
+    namespace (dict): Global namespace the code is evaluated and executed in.
+    filename (str): File name the code is compiled with, e.g. one per server session.
+    batch (bool): Raise SyntaxError for input that is neither a command nor code,
+        so batch mode reports it, instead of asking for a command.
+    remote (bool): The user is not on this host (e.g. a repl_server session):
+        local commands such as history, which show the host's files, are disabled.
+
+    Returns:
+    bool: False if the REPL should stop, True otherwise.
+    """
+    match line:
+        # Registered commands, found in the command registry by their first word
+        # (unless that word is one of the user's variables).
+        case _ if (found := commands.resolve(line, namespace, remote)) is not None:
+            command, args = found
+            return command.handler(args, namespace) is not False
+
+        # Handle valid Python expressions (evaluated with `eval`).
+        case expression if (code := compile_code(expression, "eval", filename=filename)) is not None:
+            _ = eval(code, namespace)  # Evaluate the compiled expression.
+            if _ is not None:  # Print the result if not `None`.
+                namespace["_"] = _  # Keep the result for the page command.
+                repl_render.render(_)  # Print it without building its full text.
+
+        # Handle valid Python statements (executed with `exec`).
+        case statement if (code := compile_code(statement, "exec", filename=filename)) is not None:
+            exec(code, namespace)  # Execute the compiled Python statement.
+
+        # If input does not match any valid commands or code.
+        case _:
+            if batch:
+                compile(line, filename, "exec")  # Raise the SyntaxError for batch mode to report.
+            print("Please type a command")  # Prompt the user for valid input.
+
+    return True  # Keep reading input.
 
 
 # Main function implementing a Python REPL (Read-Eval-Print Loop).
 def main():
     """
     Starts a simple Python REPL (Read-Eval-Print Loop) with custom commands.
+
+    When stdin is not a terminal, all lines are run in batch mode instead:
+    no prompts, buffered output and errors reported with line numbers.
     """
+    namespace = {"__name__": "__main__"}  # Variables defined by the user.
+
+    # Piped or redirected input: run everything without prompts.
+    if not interactive():
+        return 1 if run_batch(lambda line: execute(line, namespace, batch=True)) else 0
+
     # Display initial REPL help message.
     print('Type "help" for more information, "exit" or "quit" to finish.')
+    commands.install_completion()  # Complete command names with the Tab key.
+
+    # Persistent history of typed lines; the REPL still works without it.
+    try:
+        history = open_history()
+        repl_history.load_into_readline(history)
+    except OSError:
+        history = None
 
     while True:  # Keep running the REPL until explicitly exited.
         try:
             # Read user input and handle it based on the command or code entered.
-            match input(PROMPT):  # Replace PROMPT with the snake emoji symbol.
-                case Command.HELP:  # Help command: Display Python version info.
-                    message = f"Python {sys.version}"  # Get the current Python version.
-                    print(message)
-
-                case Command.EXIT | Command.QUIT:  # Exit command: Close the REPL.
-                    break  # Exit the loop, terminating the REPL.
-
-                # Handle valid Python expressions (evaluated with `eval`).
-                case expression if valid(expression, "eval"):
-                    _ = eval(expression)  # Evaluate the expression.
-                    if _ is not None:  # Print the result if not `None`.
-                        print(_)
-
-                # Handle valid Python statements (executed with `exec`).
-                case statement if valid(statement, "exec"):
-                    exec(statement)  # Execute the Python statement.
-
-                # If input does not match any valid commands or code.
-                case _:
-                    print("Please type a command")  # Prompt the user for valid input.
+            line = input(PROMPT)  # Replace PROMPT with the snake emoji symbol.
+            if history is not None and line.strip():
+                history.append(line)  # Remember the line for later sessions.
+            if not execute(line, namespace):
+                break  # Exit the loop, terminating the REPL.
 
         # Handle user interruption with Ctrl+C.
         except KeyboardInterrupt:
@@ -81,4 +285,4 @@ def main():
 
 # Ensure the script runs only when executed directly, not when imported.
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
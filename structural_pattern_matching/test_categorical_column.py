@@ -0,0 +1,105 @@
+"""
+Simple test script to verify that CategoricalColumn in categorical_column.py
+stores Color values as bytes and filters, counts and groups them correctly.
+"""
+
+import sys
+from enum import Enum
+
+# Import the class we want to test
+sys.path.append('.')
+import categorical_column
+from categorical_column import CategoricalColumn
+from color_dispatch import describe_colors, encode_colors
+from constant_value_patterns_enums import MESSAGES, Color
+
+VALUES = [Color.RED, Color.BLUE, Color.BLUE, Color.RED, Color.BLUE]
+
+
+def test_column_operations():
+    """
+    The column behaves like the list of members it was built from.
+    """
+    column = CategoricalColumn(VALUES)
+    assert list(column) == VALUES and column[1] == Color.BLUE and len(column) == 5
+    assert column.mask(Color.BLUE) == bytes([0, 1, 1, 0, 1])
+    assert list(column.filter(Color.RED, Color.GREEN)) == [0, 3]
+    assert column.counts() == {Color.RED: 2, Color.GREEN: 0, Color.BLUE: 3}
+    assert column.group_by("abcde") == {Color.RED: ["a", "d"], Color.BLUE: ["b", "c", "e"]}
+    assert list(column[2:4]) == VALUES[2:4]
+
+    column.append(Color.GREEN)
+    assert column.count(Color.GREEN) == 1
+
+
+def test_bytes_round_trip():
+    """
+    Columns go to and from raw bytes without copying; invalid codes are rejected.
+    """
+    column = CategoricalColumn(VALUES)
+    raw = column.buffer()
+    assert raw.obj is column.codes  # Shares the column's memory.
+
+    data = bytes(raw)
+    restored = CategoricalColumn.from_buffer(data)
+    assert restored == column and restored.codes.obj is data
+
+    try:
+        CategoricalColumn.from_buffer(bytes([1, 2, 0]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Code 0 is no Color member")
+
+
+def test_codes_match_color_dispatch():
+    """
+    Columns use the codes of color_dispatch: encoded colors read back as the same
+    members, and the codes of a column are described as its colors.
+    """
+    members = [Color.RED, Color.GREEN, Color.BLUE]
+    column = CategoricalColumn.from_buffer(encode_colors(["RED", "green", 3]))
+    assert list(column) == members and column == CategoricalColumn(members)
+    assert describe_colors(column.buffer()) == describe_colors(members)
+    assert describe_colors(column.buffer()) == [MESSAGES[member] for member in members]
+
+    class Size(Enum):
+        SMALL = "S"
+        LARGE = "L"
+    sizes = CategoricalColumn([Size.LARGE, Size.SMALL], enum=Size)  # No integer values: positions
+    assert bytes(sizes.buffer()) == bytes([1, 0]) and list(sizes) == [Size.LARGE, Size.SMALL]
+
+
+def test_views_over_buffers():
+    """
+    Columns over buffers work chunk by chunk, do not grow, and copy() into columns that do.
+    """
+    data = bytearray([3, 1, 3, 3, 1] * 3)
+    view = CategoricalColumn.from_buffer(data)
+    chunk = categorical_column.CHUNK
+    categorical_column.CHUNK = 4  # Several chunks for 15 codes
+    try:
+        assert view.mask(Color.BLUE) == bytes([1, 0, 1, 1, 0] * 3)
+        assert view.count(Color.RED) == 6 and view == CategoricalColumn(VALUES[::-1] * 3)
+        assert view[::5].counts() == {Color.RED: 0, Color.GREEN: 0, Color.BLUE: 3}
+    finally:
+        categorical_column.CHUNK = chunk
+
+    for column in (view, view[1:3]):
+        try:
+            column.append(Color.RED)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("A column over a buffer grew")
+    grown = view[1:3].copy()
+    grown.extend([Color.GREEN])
+    assert list(grown) == [Color.RED, Color.BLUE, Color.GREEN] and len(view) == 15
+
+
+if __name__ == "__main__":
+    test_column_operations()
+    test_bytes_round_trip()
+    test_codes_match_color_dispatch()
+    test_views_over_buffers()
+    print("SUCCESS: Categorical columns store, filter and group Color values.")
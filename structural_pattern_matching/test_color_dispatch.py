@@ -0,0 +1,57 @@
+"""
+Simple test script to verify that the bulk functions in color_dispatch.py
+agree with process_color and parse every spelling of a Color.
+"""
+
+import sys
+from array import array
+
+# Import the functions we want to test
+sys.path.append('.')
+from color_dispatch import describe_color, describe_colors, dispatch_colors, encode_colors, parse_color, parse_colors
+from constant_value_patterns_enums import Color
+
+
+def test_describe_and_dispatch():
+    """
+    Members and codes get the messages of the match version; others are unknown.
+    """
+    colors = [Color.RED, Color.BLUE, None, "RED", 7, 1, True, 1.0, 3]
+    assert describe_colors(colors) == [describe_color(color) for color in colors] == [
+        "It's red!", "It's blue!", "Unknown color", "Unknown color", "Unknown color",
+        "It's red!", "Unknown color", "Unknown color", "It's blue!",
+    ]
+    assert describe_colors(array("d", [1.0])) == ["Unknown color"]
+    assert describe_colors(array("B", [1, 2, 3, 0])) == ["It's red!", "It's green!", "It's blue!", "Unknown color"]
+
+    handlers = {Color.RED: lambda m: m.name, Color.GREEN: lambda m: m.value}
+    results = dispatch_colors(iter([1, Color.GREEN, 9, True]), handlers, default=lambda color: f"no {color}")
+    assert results == ["RED", 2, "no 9", "no True"]
+
+
+def test_parse():
+    """
+    Names in any case, values, values as text and members all parse; others raise.
+    """
+    values = ["RED", "green", " Blue ", "3", 2, Color.RED]
+    assert parse_colors(values) == [Color.RED, Color.GREEN, Color.BLUE, Color.BLUE, Color.GREEN, Color.RED]
+    assert encode_colors(values) == array("B", [1, 2, 3, 3, 2, 1])
+    for bad in (["RED", "purple"], ["RED", [1]]):
+        try:
+            parse_colors(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{bad[1]!r} should not parse")
+    try:
+        parse_color({"RED"})  # Unhashable
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a set should not parse")
+
+
+if __name__ == "__main__":
+    test_describe_and_dispatch()
+    test_parse()
+    print("SUCCESS: Colors are dispatched and parsed in bulk.")
@@ -0,0 +1,49 @@
+"""
+Simple test script to verify that ndjson_matcher.py streams records through
+the patterns and writes the captured fields of each pattern to its own file.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Import the function we want to test
+sys.path.append('.')
+from ndjson_matcher import run
+
+EVENTS = """\
+{"type": "click", "x": 10, "y": 20.5, "button": 1}
+{"type": "move", "position": [1.5, 2, 0]}
+
+{"type": "move", "position": [1.5, 2, 1]}
+not json
+{"type": "key", "key": "a"}
+{"type": "click", "x": 3, "y": 4}"""
+
+
+def test_per_pattern_outputs():
+    """
+    Matches go to one file per pattern; blank, unmatched and invalid lines are counted.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        # A tiny chunk size makes records span several chunks.
+        stats = run(io.StringIO(EVENTS), directory, chunk_size=7)
+        outputs = {}
+        for name in sorted(os.listdir(directory)):
+            with open(os.path.join(directory, name)) as output:
+                outputs[name] = [json.loads(line) for line in output]
+
+    assert outputs == {
+        "click.ndjson": [{"x": 10, "y": 20.5}, {"x": 3, "y": 4}],
+        "key.ndjson": [{"key": "a"}],
+        "point.ndjson": [{"x": 1.5, "y": 2}],
+    }
+    assert (stats.records, stats.unmatched, stats.invalid) == (5, 1, 1)
+    assert stats.matched == {"click": 2, "key": 1, "point": 1}
+
+
+if __name__ == "__main__":
+    test_per_pattern_outputs()
+    print("SUCCESS: Records are matched and written per pattern.")
@@ -0,0 +1,85 @@
+"""
+Simple test script to verify that pattern_compiler.py finds the same pattern
+and captures as the equivalent `match` statement.
+"""
+
+import sys
+
+# Import the functions we want to test
+sys.path.append('.')
+from pattern_compiler import (
+    WILDCARD, As, Capture, Literal, Or, Sequence, Type, compile_patterns, dispatcher, source,
+)
+
+RECORDS = [
+    0, 1, 1.0, 2, True, False, None, 0.0, "a", "ab", b"x", 3.5,
+    [], [1], [True], [None], (1, 2), [1, 2], [2, 1], ["a", 1], ["a", "b"], [1, [2, 3]], [1, (2, "a")],
+    [[1, 2], 5], [{"a": 1}, 2], {"a": 1}, [[1]], ([],), [1, 2, 0], [1.5, 2, 0.0], [1, 2, False], (1, 2, 3),
+]
+
+PATTERNS = {
+    "literals": [Literal(value) for value in (1, True, None, 0.0, "a", b"x", 2, 3.5)],
+    "few literals": [Literal(True), Literal(1), Literal(None)],
+    "types": [
+        Type(bool), As(Type(int), "n"), Type(float), Type(str, Literal("a")), Type(list, Sequence([])),
+        Type(tuple), Type(tuple, Sequence([WILDCARD])),
+    ],
+    "sequences": [
+        Type(list, Sequence([As(Or(Type(int), Type(float)), "x"), As(Or(Type(int), Type(float)), "y"), Literal(0)])),
+        Sequence([Capture("a"), Sequence([Capture("b"), Or(Literal(3), Literal("a"))])]),
+        Sequence([Sequence([Capture("a"), Capture("b")]), Literal(5)]),
+        Sequence([Or(Literal(1), Literal("a"), Literal(True)), Capture("rest")]),
+        Sequence([Literal(2), WILDCARD]),
+        Sequence([As(Sequence([]), "empty")]),
+        Or(Sequence([Capture("x")]), Sequence([Capture("x"), WILDCARD, WILDCARD])),
+        As(WILDCARD, "anything"),
+    ],
+}
+
+
+def test_same_as_match():
+    """
+    Every record gets the same pattern number and captures from both.
+    """
+    for name, patterns in PATTERNS.items():
+        namespace = {}
+        exec(source(patterns), namespace)
+        written = namespace["match_record"]
+        compiled = compile_patterns(patterns)
+        for record in RECORDS:
+            assert compiled(record) == written(record), (name, record)
+
+
+def test_dispatcher():
+    """
+    Handlers are called with the captures; unmatched records go to the default.
+    """
+    dispatch = dispatcher(
+        [
+            (Sequence([Literal("move"), As(Type(int), "dx"), As(Type(int), "dy")]), lambda dx, dy: ("move", dx + dy)),
+            (Literal("stop"), lambda: "stop"),
+        ],
+        default=lambda record: ("unknown", record),
+    )
+    assert dispatch(["move", 1, 2]) == ("move", 3)
+    assert dispatch("stop") == "stop"
+    assert dispatch(["move", 1]) == ("unknown", ["move", 1])
+
+
+def test_invalid_patterns():
+    """
+    Patterns Python rejects are rejected when compiling.
+    """
+    for pattern in (Sequence([Capture("x"), Capture("x")]), Or(Capture("x"), Capture("y"))):
+        try:
+            compile_patterns([pattern])
+        except ValueError:
+            continue
+        raise AssertionError("Pattern should have been rejected")
+
+
+if __name__ == "__main__":
+    test_same_as_match()
+    test_dispatcher()
+    test_invalid_patterns()
+    print("SUCCESS: Compiled patterns match like the match statement.")
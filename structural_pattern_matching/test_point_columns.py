@@ -0,0 +1,76 @@
+"""
+Simple test script to verify that classify() in point_columns.py gives the same
+results as the scalar Point pattern for every kind of column.
+"""
+
+import sys
+from array import array
+
+# Import the functions we want to test
+sys.path.append('.')
+from point_columns import classify, classify_scalar
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RECORDS = [
+    (1, 2, 0), (3.5, 7, 0), (1, 2, 0.0), (1, 2, -0.0), (True, 2, False),
+    (1, 2, 1), (1, 2, float("nan")), ("a", 2, 0), (1, None, 0), (1, 2, "0"), (1j, 2, 0),
+]
+
+
+def expected(records):
+    results = [classify_scalar(list(record)) for record in records]
+    mask = bytearray(result is not None for result in results)
+    points = [result for result in results if result is not None]
+    return mask, [x for x, _ in points], [y for _, y in points]
+
+
+def test_sequences():
+    """
+    Lists of mixed Python values are classified exactly like the scalar match.
+    """
+    columns = [list(column) for column in zip(*RECORDS)]
+    assert classify(*columns) == expected(RECORDS)
+
+
+def test_arrays():
+    """
+    array.array columns give the same mask and keep their type codes.
+    """
+    numeric = [record for record in RECORDS if all(isinstance(value, (int, float)) for value in record)]
+    x, y, z = (array("d", column) for column in zip(*numeric))
+    mask, xs, ys = classify(x, y, z)
+    assert (mask, list(xs), list(ys)) == expected(numeric)
+    assert xs.typecode == ys.typecode == "d"
+
+    text = array("u", "abc")
+    assert classify(text, array("i", [1, 2, 3]), array("i", [0, 0, 0]))[0] == bytearray(3)
+
+
+def test_numpy():
+    """
+    NumPy columns, numeric and object, match the scalar pattern (if NumPy is installed).
+    """
+    if np is None:
+        return
+    mask, xs, ys = classify(np.array([1, 2, 3]), np.array([1.5, 2.5, 3.5]), np.array([0.0, 1.0, -0.0]))
+    assert mask.tolist() == [True, False, True]
+    assert xs.tolist() == [1, 3] and ys.tolist() == [1.5, 3.5]
+
+    columns = [np.array(column, dtype=object) for column in zip(*RECORDS)]
+    mask, xs, ys = classify(*columns)
+    assert (bytearray(mask.tolist()), xs.tolist(), ys.tolist()) == expected(RECORDS)
+
+    # Plain lists next to an array keep their values, even mixed ones.
+    mask, xs, ys = classify(["a", 1, 2.5], np.array([1.0, 2.0, 3.0]), [0, 0, 1])
+    assert mask.tolist() == [False, True, False] and xs.tolist() == [1] and ys.tolist() == [2.0]
+
+
+if __name__ == "__main__":
+    test_sequences()
+    test_arrays()
+    test_numpy()
+    print("SUCCESS: Columns are classified like the scalar Point pattern.")
@@ -0,0 +1,76 @@
+"""
+Simple test script to verify that repl_async.py runs code, jobs and threads,
+leaves variables named like its commands alone, pages large results, and
+exits without waiting for thread jobs.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Import the class we want to test
+sys.path.append('.')
+from repl_async import AsyncREPL
+
+
+def run_lines(lines):
+    """Runs lines in a fresh AsyncREPL; returns its output."""
+    async def scenario():
+        repl = AsyncREPL()
+        for line in lines:
+            await repl.execute(line)
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        asyncio.run(scenario())
+    return output.getvalue()
+
+
+def test_commands_and_code():
+    """
+    Commands work while their words are free; await and thread run code.
+    """
+    assert run_lines(["await asyncio.sleep(0, 'slept')", "thread 20 + 22", "wait 3", "jobs"]) == (
+        "slept\n42\nNo such job: 3\n")
+
+
+def test_variables_named_like_commands():
+    """
+    After `thread = 1`, `jobs = []` etc., lines starting with those words are code.
+    """
+    output = run_lines([
+        "thread = 1", "thread + 1",
+        "jobs = []", "jobs.append(2)", "jobs",
+        "wait = 5", "wait",
+        "cancel = 'no'", "cancel",
+    ])
+    assert output == "2\n[2]\n5\nno\n"
+
+
+def test_exit_does_not_wait_for_thread_jobs():
+    """
+    Leaving the REPL with a thread job still running returns at once.
+    """
+    start = time.perf_counter()
+    output = run_lines(["& thread import time; time.sleep(3)"])
+    assert time.perf_counter() - start < 2
+    assert output.startswith("[1] started\n")
+
+
+def test_large_results_are_paged():
+    """
+    A large job result is truncated like in repl_v2, and `page` shows the rest.
+    """
+    output = run_lines(["await asyncio.sleep(0, list(range(10**6)))", "page 2"])
+    assert "... (999900 more)]\n" in output
+    assert output.endswith("-- page 2 of 20000 --\n")
+
+
+if __name__ == "__main__":
+    test_commands_and_code()
+    test_variables_named_like_commands()
+    test_large_results_are_paged()
+    test_exit_does_not_wait_for_thread_jobs()
+    print("SUCCESS: The async REPL runs jobs and leaves variables alone.")
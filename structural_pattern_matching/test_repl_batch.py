@@ -0,0 +1,49 @@
+"""
+Simple test script to verify that repl_v2.py runs piped input in batch mode:
+no prompts, results in order and errors reported with line numbers.
+"""
+
+import io
+import sys
+
+# Import the functions we want to test
+sys.path.append('.')
+from repl_batch import read_lines, run_batch
+from repl_v2 import execute
+
+
+def test_read_lines_across_chunks():
+    """
+    Lines split over several small chunks must come out whole.
+    """
+    stream = io.StringIO("first line\nsecond line\n\nlast line without newline")
+    assert list(read_lines(stream, chunk_size=4)) == [
+        "first line", "second line", "", "last line without newline",
+    ]
+    long_line = "x" * 10_000
+    assert list(read_lines(io.StringIO(f"{long_line}\n\n{long_line}"), chunk_size=7)) == [long_line, "", long_line]
+
+
+def test_run_batch():
+    """
+    Run a small script through repl_v2 in batch mode.
+    """
+    namespace = {}
+    stdin = io.StringIO("x = 20\nx + 22\nundefined_name\n1 +\nexit\nx = 0\n")
+    stdout = io.StringIO()
+
+    errors = run_batch(lambda line: execute(line, namespace, batch=True), stdin, stdout, buffer_size=1)
+
+    assert errors == 2
+    assert stdout.getvalue() == (
+        "42\n"
+        "line 3: NameError: name 'undefined_name' is not defined\n"
+        "line 4: SyntaxError: invalid syntax (<string>, line 1)\n"
+    )
+    assert namespace["x"] == 20  # Nothing after "exit" was run
+
+
+if __name__ == "__main__":
+    test_read_lines_across_chunks()
+    test_run_batch()
+    print("SUCCESS: Batch mode runs piped input without prompts.")
@@ -0,0 +1,43 @@
+"""
+Simple test script to verify that the command registry in repl_commands.py finds
+commands, checks their arguments and completes prefixes.
+"""
+
+import sys
+
+# Import the class we want to test
+sys.path.append('.')
+from repl_commands import CommandRegistry
+
+
+def test_resolve_and_complete():
+    """
+    Register a few commands and look them up by line and by prefix.
+    """
+    registry = CommandRegistry()
+    registry.register("stat", lambda args, namespace: None)
+    registry.register("status", lambda args, namespace: None, pattern=r"\d+")
+    registry.register("stop", lambda args, namespace: None, pattern=lambda args: args in ("", "now"))
+
+    command, args = registry.resolve("  status 42 ")
+    assert (command.name, args) == ("status", "42")
+    assert registry.resolve("stop now")[0].name == "stop"
+
+    # Unknown names, prefixes and rejected arguments are left to the match fallbacks
+    assert registry.resolve("sta") is None
+    assert registry.resolve("status = 5") is None
+    assert registry.resolve("stat x") is None
+
+    # A name bound in the namespace is a variable, not a command
+    assert registry.resolve("stat", {"stat": 1}) is None
+    assert registry.resolve("stat", {"other": 1})[0].name == "stat"
+
+    assert registry.complete("sta") == ["stat", "status"]
+    assert registry.complete("s") == ["stat", "status", "stop"]
+    assert registry.complete("x") == []
+    assert len(registry) == 3
+
+
+if __name__ == "__main__":
+    test_resolve_and_complete()
+    print("SUCCESS: Commands are resolved and completed through the registry.")
@@ -0,0 +1,115 @@
+"""
+Simple test script to verify that repl_history.py keeps one consistent history
+for concurrent REPLs, repairs torn writes and finds entries by prefix.
+"""
+
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Import the classes we want to test
+sys.path.append('.')
+from repl_history import History
+from repl_v2 import execute
+
+
+def append_entries(path, writer, count):
+    history = History(path)
+    for i in range(count):
+        history.append(f"writer {writer} entry {i}")
+
+
+def test_concurrent_appends():
+    """
+    Processes appending at the same time never interleave or lose entries.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "history")
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=append_entries, args=(path, writer, 200)) for writer in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    history = History(path)
+    assert len(history) == 800
+    with open(path + ".dat", "rb") as data:
+        lines = data.read().splitlines()
+    assert sorted(lines) == sorted(f"writer {w} entry {i}".encode() for w in range(4) for i in range(200))
+    with history.mapped_offsets() as offsets:  # Every offset points at the start of its entry.
+        assert list(offsets) == [sum(len(line) + 1 for line in lines[:n]) for n in range(len(lines))]
+
+
+def test_torn_write_is_repaired():
+    """
+    An index out of step with the data (a writer died half way) is rebuilt on open.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "history")
+    history = History(path)
+    for entry in ["first", "second", "third"]:
+        history.append(entry)
+    with open(path + ".idx", "r+b") as index:
+        index.truncate(8 + 3)  # One offset and a partly written one
+    with open(path + ".dat", "ab") as data:
+        data.write(b"fourth\n")  # Written without its offset
+
+    history = History(path)
+    assert len(history) == 4
+    assert history.recent() == [(1, "first"), (2, "second"), (3, "third"), (4, "fourth")]
+
+
+def test_prefix_search():
+    """
+    Prefix searches match entry starts only, newest first, including the very first entry.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "history")
+    history = History(path)
+    for entry in ["import os", "x = 1", "print('import')", "import sys", "y = 2"]:
+        history.append(entry)
+    assert history.search("import", prefix=True) == [(4, "import sys"), (1, "import os")]
+    assert history.search("import") == [(4, "import sys"), (3, "print('import')"), (1, "import os")]
+    assert history.search("import", limit=1, prefix=True) == [(4, "import sys")]
+    assert history.search("nothing") == []
+
+
+def test_line_breaks_and_permissions():
+    """
+    Entries with \\r or other line separators keep their numbers; the files are private.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "history")
+    history = History(path)
+    for entry in ["one\rtwo", "three\x0bfour\u2028five", "six\nseven", "eight"]:
+        history.append(entry)
+    assert len(history) == 4
+    assert history.recent() == [(1, "one two"), (2, "three\x0bfour\u2028five"), (3, "six seven"), (4, "eight")]
+    assert history.recent(2) == [(3, "six seven"), (4, "eight")]
+    assert history.search("eight") == [(4, "eight")]
+    for extension in (".dat", ".idx"):
+        assert os.stat(path + extension).st_mode & 0o777 == 0o600
+
+
+def test_history_variable():
+    """
+    A variable called history is used as such, not taken for the history command.
+    """
+    namespace = {}
+    output = io.StringIO()
+    with redirect_stdout(output):
+        execute("history = []", namespace)
+        execute("history.append(1)", namespace)
+        execute("history[0]", namespace)
+        execute("history + [2]", namespace)  # Valid as an expression and as a search
+    assert namespace["history"] == [1] and output.getvalue() == "1\n[1, 2]\n"
+
+
+if __name__ == "__main__":
+    test_concurrent_appends()
+    test_torn_write_is_repaired()
+    test_prefix_search()
+    test_line_breaks_and_permissions()
+    test_history_variable()
+    print("SUCCESS: The history stays consistent and searchable.")
@@ -0,0 +1,141 @@
+"""
+Simple test script to verify that repl_pool.py runs statements in worker
+processes: errors reach the REPL process, and crashed workers are replaced.
+"""
+
+import io
+import multiprocessing
+import os
+import sys
+import time
+
+# Import the classes we want to test
+sys.path.append('.')
+from repl_batch import run_batch
+from repl_pool import IsolatedSession, RemoteError, WorkerPool
+
+
+def test_errors_are_raised_in_the_parent():
+    """
+    Batch mode counts and reports the errors of statements run in a worker, syntax errors included.
+    """
+    pool = WorkerPool(spares=1)
+    session = IsolatedSession(pool, batch=True)
+    try:
+        stdout = io.StringIO()
+        errors = run_batch(session.execute, io.StringIO("x = 20\nundefined_name\n1 +\nx + 22\n"), stdout)
+        assert errors == 2
+        assert stdout.getvalue() == (
+            "line 2: NameError: name 'undefined_name' is not defined\n"
+            "line 3: SyntaxError: invalid syntax (<string>, line 1)\n"
+            "42\n"
+        )
+
+        # An exception class defined in the worker cannot be unpickled by the parent.
+        session.execute("class Custom(Exception): pass")
+        try:
+            session.execute("raise Custom('boom')")
+            raise AssertionError("no exception raised")
+        except RemoteError as error:
+            assert str(error) == "Custom: boom"
+        assert session.traceback.startswith("Traceback") and session.traceback.endswith("Custom: boom\n")
+    finally:
+        session.close()
+        pool.close()
+
+
+def test_crashed_worker_is_replaced():
+    """
+    A crashed worker's pipe is closed, and a fresh worker with an empty namespace takes over.
+    """
+    pool = WorkerPool(spares=1)
+    session = IsolatedSession(pool)
+    try:
+        session.execute("x = 1")
+        crashed = session.worker
+        stdout = io.StringIO()
+        errors = run_batch(session.execute, io.StringIO("import os; os._exit(3)\nx\n"), stdout)
+        assert crashed.connection.closed and not crashed.process.is_alive()
+        assert session.worker is not crashed
+        assert errors == 1
+        assert stdout.getvalue() == (
+            "Worker crashed (worker exited with code 3), namespace reset\n"
+            "line 2: NameError: name 'x' is not defined\n"
+        )
+    finally:
+        session.close()
+        pool.close()
+
+
+def test_runaway_statements_are_stopped():
+    """
+    A statement past the timeout, or one allocating more than the limit, costs
+    only its worker.
+    """
+    pool = WorkerPool(spares=1, memory_limit=256 * 2**20)
+    session = IsolatedSession(pool, timeout=0.5)
+    try:
+        session.execute("x = 1")
+        stdout = io.StringIO()
+        errors = run_batch(session.execute, io.StringIO("while True: pass\nx\n"), stdout)
+        assert errors == 1 and stdout.getvalue() == (
+            "Worker crashed (statement timed out after 0.5 seconds), namespace reset\n"
+            "line 2: NameError: name 'x' is not defined\n"
+        )
+
+        session.execute("y = 1")
+        stdout = io.StringIO()
+        errors = run_batch(session.execute, io.StringIO(f"huge = bytearray({2**32})\ny\n"), stdout)
+        assert errors == 2
+        assert stdout.getvalue().startswith("MemoryError: worker memory limit of 256 MiB exceeded")
+        assert "line 1: MemoryError" in stdout.getvalue()
+        assert stdout.getvalue().endswith("line 2: NameError: name 'y' is not defined\n")
+    finally:
+        session.close()
+        pool.close()
+
+
+def start_pool_and_die(connection):
+    """Starts a pool, reports its worker pids and dies without cleaning up."""
+    pool = WorkerPool(spares=3)
+    connection.send([worker.process.pid for worker in pool.spares])
+    os._exit(0)
+
+
+def running(pid):
+    """Tells whether a process runs (and is no zombie waiting for its parent)."""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().rpartition(")")[2].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+def test_workers_exit_with_the_repl():
+    """
+    When the REPL process dies, all of its workers exit: none holds another one's pipe open.
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe()
+    repl = context.Process(target=start_pool_and_die, args=(sender,))
+    repl.start()
+    pids = receiver.recv()
+    repl.join()
+    deadline = time.monotonic() + 5
+    while any(map(running, pids)) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(map(running, pids))
+
+
+if __name__ == "__main__":
+    test_errors_are_raised_in_the_parent()
+    test_crashed_worker_is_replaced()
+    test_runaway_statements_are_stopped()
+    test_workers_exit_with_the_repl()
+    print("SUCCESS: Worker errors reach the REPL and crashed workers are replaced.")
@@ -0,0 +1,50 @@
+"""
+Simple test script to verify that the time, timeit, profile and mem commands
+of repl_v2.py run statements, and leave variables with their names alone.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+# Import the function we want to test
+sys.path.append('.')
+from repl_v2 import execute
+
+
+def run_lines(lines, namespace):
+    """Runs lines through repl_v2.execute; returns their output."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        for line in lines:
+            execute(line, namespace)
+    return output.getvalue()
+
+
+def test_commands_run_statements():
+    """
+    The commands run their statement in the REPL namespace.
+    """
+    namespace = {}
+    output = run_lines(["data = [3, 1, 2]", "time sorted(data)"], namespace)
+    assert output.startswith("Wall time: ") and output.endswith("[1, 2, 3]\n")
+    output = run_lines(["mem big = list(range(1000))"], namespace)
+    assert "Traced memory: " in output and len(namespace["big"]) == 1000
+    output = run_lines(["time list(range(10**6))"], namespace)
+    assert output.endswith("... (999900 more)]\n")
+
+
+def test_variables_named_like_commands():
+    """
+    After `time = 5`, `time - 5` is an expression, not a command timing `- 5`.
+    """
+    namespace = {}
+    lines = ["time = 5", "time - 5", "timeit = [1]", "timeit + [2]", "profile = mem = 'x'", "mem * 2"]
+    assert run_lines(lines, namespace) == "0\n[1, 2]\nxx\n"
+    assert namespace["time"] == 5 and namespace["profile"] == "x"
+
+
+if __name__ == "__main__":
+    test_commands_run_statements()
+    test_variables_named_like_commands()
+    print("SUCCESS: Performance commands run statements and leave variables alone.")
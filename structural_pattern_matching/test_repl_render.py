@@ -0,0 +1,78 @@
+"""
+Simple test script to verify that repl_render.py prints small values exactly
+like print() and cuts large values short without building their full text.
+"""
+
+import io
+import sys
+from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
+from contextlib import redirect_stdout
+
+# Import the functions we want to test
+sys.path.append('.')
+from repl_render import render
+from repl_v2 import execute
+
+
+def rendered(value, **limits):
+    stream = io.StringIO()
+    render(value, stream, **limits)
+    return stream.getvalue()
+
+
+def test_matches_print():
+    """
+    Values within the limits look exactly like print(value).
+    """
+    values = [
+        [1, 2.5, "a", None], (1,), (), {"a": [1, {2}], 3: ("x", b"y")},
+        set(), frozenset(), frozenset({1}), [[], {}], "plain text", 42,
+        b"bytes", bytearray(b"array"), defaultdict(list, {"a": [1]}), OrderedDict(a=1, b=(2,)),
+        Counter("abbccc"), deque([1, [2]]), deque([1], maxlen=5), deque(), namedtuple("Point", "x y")(1, 2),
+        type("Items", (list,), {})([1, 2]),
+    ]
+    for value in values:
+        assert rendered(value) == str(value) + "\n", value
+
+
+def test_truncation():
+    """
+    Element count, depth, cycles and the character budget are all bounded.
+    """
+    assert rendered(list(range(1000)), max_items=3) == "[0, 1, 2, ... (997 more)]\n"
+    assert rendered([[[[1]]]], max_depth=2) == "[[[...]]]\n"
+
+    cycle = [1]
+    cycle.append(cycle)
+    assert rendered(cycle) == "[1, [...]]\n"
+
+    output = rendered(["x" * 100] * 100, max_chars=50)
+    assert output.startswith("['xxx") and "output truncated" in output
+    assert len(output) < 100
+
+    # Bytes are sliced before their repr is built; subclasses are rendered lazily too.
+    assert rendered(b"x" * 10**7, max_chars=5).startswith("b'xxx")
+    assert rendered(deque(range(10**6)), max_items=2) == "deque([0, 1, ... (999998 more)])\n"
+    assert rendered(defaultdict(int, dict.fromkeys(range(1000), 0)), max_items=1) == (
+        "defaultdict(<class 'int'>, {0: 0, ... (999 more)})\n")
+
+
+def test_page_variable():
+    """
+    A variable called page is printed, not taken for the page command, which works again once it is gone.
+    """
+    namespace = {}
+    output = io.StringIO()
+    with redirect_stdout(output):
+        execute("page = [1, 2]", namespace)
+        execute("page", namespace)
+        execute("del page", namespace)
+        execute("page", namespace)
+    assert output.getvalue() == "[1, 2]\n         0: 1\n         1: 2\n-- page 1 of 1 --\n"
+
+
+if __name__ == "__main__":
+    test_matches_print()
+    test_truncation()
+    test_page_variable()
+    print("SUCCESS: Results are rendered within their limits.")
@@ -0,0 +1,163 @@
+"""
+Simple test script to verify that repl_server.py keeps sessions apart: own
+namespaces, own memory limits, and statements that do not block each other.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Import the classes we want to test
+sys.path.append('.')
+from repl_server import PROMPT, TRACE_FRAMES, REPLServer, Session, SnapshotCache, remove_stale_socket
+
+MiB = 2**20
+
+
+def test_memory_limit():
+    """
+    A session that holds more than its limit has its namespace cleared.
+    """
+    tracemalloc.start(TRACE_FRAMES)
+    try:
+        session = Session(1, memory_limit=8 * MiB)
+        output, keep_going = session.execute(f"small = bytearray({MiB})")
+        assert keep_going and output == "" and "small" in session.namespace
+
+        output, _ = session.execute(f"big = bytearray({16 * MiB})")
+        assert output.startswith("MemoryError: session memory limit of 8 MiB exceeded")
+        assert "big" not in session.namespace and "small" not in session.namespace
+    finally:
+        tracemalloc.stop()
+
+
+def test_sessions_are_isolated():
+    """
+    Each session has its own namespace, and is charged only for its own memory:
+    two sessions under their limit stay intact although together they are over it.
+    """
+    tracemalloc.start(TRACE_FRAMES)
+    try:
+        first, second = Session(1, memory_limit=8 * MiB), Session(2, memory_limit=8 * MiB)
+        first.execute(f"data = bytearray({6 * MiB})")
+        output, _ = second.execute(f"data = bytearray({6 * MiB}); other = 1")
+        assert output == ""
+        assert 6 * MiB <= second.memory < 7 * MiB
+        assert len(first.namespace["data"]) == len(second.namespace["data"]) == 6 * MiB
+        assert "other" not in first.namespace
+    finally:
+        tracemalloc.stop()
+
+
+def test_snapshots_are_rate_limited():
+    """
+    Over the limit, statements share one snapshot per interval; a check that has
+    to wait for the next snapshot still clears the session, and says so with the next output.
+    """
+    tracemalloc.start(TRACE_FRAMES)
+    try:
+        snapshots = SnapshotCache(interval=60)
+        first, second = Session(1, 8 * MiB, snapshots), Session(2, 8 * MiB, snapshots)
+        first.execute(f"data = bytearray({6 * MiB})")
+        second.execute(f"data = bytearray({4 * MiB})")  # 10 MiB in total: measured
+        taken = snapshots.taken
+        output, _ = second.execute(f"more = bytearray({6 * MiB})")  # Over its limit, but no snapshot due
+        assert output == "" and snapshots.taken == taken and second.unchecked is not None
+        assert "more" in second.namespace
+
+        snapshots.taken -= 60  # The next snapshot is due.
+        second.check_deferred()
+        assert "data" not in second.namespace and second.unchecked is None
+        output, _ = second.execute("1 + 1")
+        assert output.startswith("MemoryError: session memory limit of 8 MiB exceeded") and output.endswith("2\n")
+        assert len(first.namespace["data"]) == 6 * MiB
+    finally:
+        tracemalloc.stop()
+
+
+def test_history_is_not_served():
+    """
+    The history command would show the server owner's input: in a session it is no command.
+    """
+    output, _ = Session(1, memory_limit=None).execute("history")
+    assert output.endswith("NameError: name 'history' is not defined\n")
+
+
+def test_slow_statement_does_not_block_other_sessions():
+    """
+    Statements run outside the event loop: a quick session answers while another one sleeps,
+    and each session only sees its own output.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "repl.sock")
+    marker = PROMPT.encode()
+
+    async def ask(line):
+        reader, writer = await asyncio.open_unix_connection(path)
+        await reader.readuntil(marker)
+        writer.write(line.encode() + b"\n")
+        answer = await reader.readuntil(marker)
+        writer.close()
+        return answer.decode(), time.perf_counter()
+
+    async def scenario():
+        started = asyncio.Event()
+        server = asyncio.create_task(REPLServer(path, memory_limit=None).serve(started))
+        await started.wait()
+        try:
+            start = time.perf_counter()
+            # More slow sessions than the default executor has threads
+            *slow, (quick, quick_done) = await asyncio.gather(
+                *(ask("import time as t; t.sleep(0.5); print('slow')") for _ in range(40)),
+                ask("print('quick')"))
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+        assert all(answer == "slow\n" + PROMPT for answer, _ in slow) and quick == "quick\n" + PROMPT
+        assert quick_done - start < 0.4 < min(done for _, done in slow) - start
+
+    asyncio.run(scenario())
+    assert not os.path.exists(path)  # The server removed its own socket
+
+
+def test_stale_socket():
+    """
+    A socket nobody listens on is removed; a live socket or any other file is left alone.
+    """
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "repl.sock")
+    with socket.socket(socket.AF_UNIX) as stale:
+        stale.bind(path)  # Closed without unlinking, as by a crashed server
+    remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+    with socket.socket(socket.AF_UNIX) as live:
+        live.bind(path)
+        live.listen()
+        try:
+            remove_stale_socket(path)
+            raise AssertionError("a live socket was removed")
+        except FileExistsError:
+            assert os.path.exists(path)
+    os.unlink(path)
+
+    with open(path, "w") as regular:
+        regular.write("not a socket")
+    try:
+        remove_stale_socket(path)
+        raise AssertionError("a regular file was removed")
+    except FileExistsError:
+        assert os.path.exists(path)
+
+
+if __name__ == "__main__":
+    test_memory_limit()
+    test_sessions_are_isolated()
+    test_snapshots_are_rate_limited()
+    test_history_is_not_served()
+    test_slow_statement_does_not_block_other_sessions()
+    test_stale_socket()
+    print("SUCCESS: Server sessions are isolated and limited.")
@@ -0,0 +1,272 @@
+"""
+Compact bank accounts with pooled lock stripes.
+
+The BankAccount in bank-lock.py stores its balance in an instance __dict__
+and owns a dedicated threading.Lock. Both cost far more memory than the
+balance itself. This script shows a compact alternative:
+
+- CompactAccount uses __slots__, so there is no per-instance __dict__
+- Locks come from a fixed pool (LockStripes) and are picked by account ID hash,
+  so a million accounts share, for example, 64 locks instead of owning a million
+
+Usage:
+    python bank-compact.py                    # demo, same as bank-lock.py
+    python bank-compact.py memory [N ...]     # tracemalloc benchmark (default 100k, 1M, 10M)
+    python bank-compact.py throughput         # contention benchmark per stripe count
+"""
+
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+
+# Fixed delay for demonstration purposes (the benchmarks set it to 0)
+DELAY = 0.05
+
+# Number of locks in the default pool, must be a power of two
+STRIPES = 64
+
+
+class BankAccount:
+    """
+    Baseline account with the same layout as BankAccount in bank-lock.py:
+    balance in the instance __dict__ and one threading.Lock per account.
+    """
+    def __init__(self, balance=0):
+        self.balance = balance
+        self.account_lock = threading.Lock()
+
+    def withdraw(self, amount):
+        with self.account_lock:
+            if self.balance >= amount:
+                new_balance = self.balance - amount
+                time.sleep(DELAY)  # Simulate a delay
+                self.balance = new_balance
+            else:
+                raise ValueError("Insufficient balance")
+
+    def deposit(self, amount):
+        with self.account_lock:
+            new_balance = self.balance + amount
+            time.sleep(DELAY)  # Simulate a delay
+            self.balance = new_balance
+
+
+class LockStripes:
+    """
+    A fixed pool of locks shared by many accounts.
+
+    Each account ID is mapped to one lock of the pool by its hash. Operations on
+    the same account are always serialized, while operations on different
+    accounts only contend when their IDs land on the same stripe.
+
+    Note: never hold one stripe while acquiring another for a different account
+    (e.g. in a transfer). Two accounts may share a stripe, and threading.Lock is
+    not reentrant. Use locked(), which takes each stripe once, in index order.
+    """
+    __slots__ = ("locks", "mask")
+
+    def __init__(self, count=STRIPES, lock_factory=threading.Lock):
+        if count <= 0 or count & (count - 1):
+            raise ValueError("Stripe count must be a power of two")
+        self.locks = tuple(lock_factory() for _ in range(count))
+        self.mask = count - 1
+
+    def __len__(self):
+        return len(self.locks)
+
+    def stripe_index(self, account_id):
+        """Return the index of the lock guarding account_id."""
+        return hash(account_id) & self.mask
+
+    def lock_for(self, account_id):
+        """Return the lock guarding account_id."""
+        return self.locks[hash(account_id) & self.mask]
+
+    @contextmanager
+    def locked(self, *account_ids):
+        """
+        Hold the locks of several accounts, e.g. for a transfer.
+
+        Each stripe is acquired once, even if several accounts share it, and in
+        index order, so two threads locking the same accounts cannot deadlock.
+        """
+        indexes = sorted({self.stripe_index(account_id) for account_id in account_ids})
+        with ExitStack() as stack:
+            for index in indexes:
+                stack.enter_context(self.locks[index])
+            yield
+
+
+# Pool shared by every CompactAccount unless a class sets its own
+default_stripes = LockStripes()
+
+
+class CompactAccount:
+    """
+    Thread-safe account without an instance __dict__ or a lock of its own.
+
+    Only the account ID and the balance are stored per instance. The lock is
+    looked up in the class-level LockStripes pool on every operation.
+    """
+    __slots__ = ("account_id", "balance")
+
+    stripes = default_stripes
+
+    def __init__(self, account_id, balance=0):
+        self.account_id = account_id
+        self.balance = balance
+
+    @property
+    def account_lock(self):
+        """The pooled lock guarding this account."""
+        return self.stripes.lock_for(self.account_id)
+
+    def withdraw(self, amount):
+        """Thread-safe withdrawal, serialized on the account's stripe."""
+        with self.stripes.lock_for(self.account_id):
+            if self.balance >= amount:
+                new_balance = self.balance - amount
+                time.sleep(DELAY)  # Simulate a delay
+                self.balance = new_balance
+            else:
+                raise ValueError("Insufficient balance")
+
+    def deposit(self, amount):
+        """Thread-safe deposit, serialized on the account's stripe."""
+        with self.stripes.lock_for(self.account_id):
+            new_balance = self.balance + amount
+            time.sleep(DELAY)  # Simulate a delay
+            self.balance = new_balance
+
+    def transfer(self, target, amount):
+        """Thread-safe transfer to target, holding both accounts' stripes."""
+        with self.stripes.locked(self.account_id, target.account_id):
+            if self.balance < amount:
+                raise ValueError("Insufficient balance")
+            self.balance -= amount
+            time.sleep(DELAY)  # Simulate a delay
+            target.balance += amount
+
+
+def striped_account_class(stripes):
+    """Return a CompactAccount subclass that uses the given lock pool."""
+    return type(f"CompactAccount{len(stripes)}", (CompactAccount,), {"__slots__": (), "stripes": stripes})
+
+
+# ===== Memory benchmark =====
+
+def measure_memory(factory, count):
+    """
+    Create count accounts with factory(account_id) and return
+    (total bytes, bytes per account) as traced by tracemalloc.
+    The list holding the accounts is included in the total.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        accounts = [factory(account_id) for account_id in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del accounts
+    total = after - before
+    return total, total / count
+
+
+def run_memory_benchmark(sizes=(100_000, 1_000_000, 10_000_000)):
+    print("\n--- Memory (tracemalloc) ---")
+    print(f"{'accounts':>12} {'BankAccount':>16} {'CompactAccount':>16} {'ratio':>8}")
+    for count in sizes:
+        lock_total, lock_each = measure_memory(lambda _: BankAccount(1000), count)
+        compact_total, compact_each = measure_memory(lambda i: CompactAccount(i, 1000), count)
+        print(f"{count:>12,} {lock_total / 2**20:>12.1f} MiB {compact_total / 2**20:>12.1f} MiB "
+              f"{lock_total / compact_total:>7.1f}x")
+        print(f"{'per account':>12} {lock_each:>14.1f} B {compact_each:>14.1f} B")
+
+
+# ===== Throughput benchmark =====
+
+def measure_throughput(accounts, threads=8, operations=50_000):
+    """
+    Run deposit/withdraw pairs on random accounts from several threads and
+    return the number of operations per second.
+    """
+    def worker(seed):
+        rng = random.Random(seed)
+        count = len(accounts)
+        for _ in range(operations // 2):
+            account = accounts[rng.randrange(count)]
+            account.deposit(1)
+            account.withdraw(1)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker, seed) for seed in range(threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return threads * (operations // 2) * 2 / elapsed
+
+
+def run_throughput_benchmark(account_count=10_000, threads=8, stripe_counts=(1, 4, 16, 64, 1024)):
+    global DELAY
+    saved_delay, DELAY = DELAY, 0
+
+    print(f"\n--- Throughput ({threads} threads, {account_count:,} accounts) ---")
+    try:
+        baseline = measure_throughput([BankAccount(1000) for _ in range(account_count)], threads)
+        print(f"{'lock per account':>20}: {baseline:>12,.0f} ops/s")
+        for count in stripe_counts:
+            account_class = striped_account_class(LockStripes(count))
+            accounts = [account_class(i, 1000) for i in range(account_count)]
+            rate = measure_throughput(accounts, threads)
+            print(f"{f'{count} stripes':>20}: {rate:>12,.0f} ops/s ({rate / baseline:.2f}x)")
+    finally:
+        DELAY = saved_delay
+
+    print("\nFewer stripes mean more accounts share a lock, so unrelated operations wait")
+    print("on each other. With the GIL the cost is small until the stripe count drops")
+    print("close to the number of threads.")
+
+
+# ===== Demo =====
+
+def charge_fees(accounts):
+    for account in accounts:
+        account.withdraw(14.95)
+
+
+def reimburse_fees(accounts):
+    for account in accounts:
+        account.deposit(14.95)
+
+
+def run_demo():
+    print("Creating accounts")
+    # 50 accounts sharing the default pool of STRIPES locks
+    accounts = [CompactAccount(account_id, 1000) for account_id in range(0, 50)]
+
+    print("Charging fees")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(charge_fees, accounts)
+        executor.submit(reimburse_fees, accounts)
+
+    print("Checking balances")
+    # Every balance should still be exactly 1000
+    for start in range(0, len(accounts), 5):
+        for account in accounts[start:start + 5]:
+            print(f"{account.balance:7.2f}   ", end='')
+        print()
+
+
+if __name__ == "__main__":
+    match sys.argv[1:]:
+        case ["memory", *sizes]:
+            run_memory_benchmark([int(size) for size in sizes] or (100_000, 1_000_000, 10_000_000))
+        case ["throughput"]:
+            run_throughput_benchmark()
+        case _:
+            run_demo()
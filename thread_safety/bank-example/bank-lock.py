@@ -7,11 +7,12 @@ from itertools import batched
 DELAY = 0.05
 
 class BankAccount:
-    def __init__(self, balance=0):
+    def __init__(self, balance=0, lock_factory=threading.Lock):
         self.balance = balance
         # Create a threading.Lock object for this account
         # This lock will ensure that only one thread can access the account at a time
-        self.account_lock = threading.Lock()
+        # Any Lock-compatible factory works, e.g. TicketLock from fair_locks.py
+        self.account_lock = lock_factory()
 
     def withdraw(self, amount):
         """
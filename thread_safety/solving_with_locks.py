@@ -5,17 +5,21 @@ This script shows how to use threading.Lock to protect shared resources
 and prevent race conditions when multiple threads access and modify shared data.
 """
 
+import sys
 import threading
 import time
 import random
 
+from fair_locks import TicketLock
+
 # Shared resources
 counter_without_lock = 0
 counter_with_lock = 0
 iterations = 100000
 
 # Create a lock object
-counter_lock = threading.Lock()
+# Run "python solving_with_locks.py fair" to use the FIFO-fair TicketLock instead
+counter_lock = TicketLock() if sys.argv[1:] == ["fair"] else threading.Lock()
 
 def increment_without_lock():
     """
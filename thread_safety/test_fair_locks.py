@@ -0,0 +1,155 @@
+"""
+Simple test script to verify that TicketLock from fair_locks.py protects
+shared data and grants the lock in FIFO (and priority) order.
+"""
+
+import os
+import signal
+import sys
+import time
+import threading
+
+# Import the class we want to test
+sys.path.append('.')
+from fair_locks import TicketLock
+
+
+def start_waiter(target, *args):
+    """Start a thread and give it time to queue on the lock."""
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    time.sleep(0.05)
+    return thread
+
+
+def test_mutual_exclusion():
+    """
+    Increment a shared counter from several threads under the TicketLock.
+    """
+    lock = TicketLock()
+    counter = 0
+
+    def increment():
+        nonlocal counter
+        for _ in range(10000):
+            with lock:
+                counter += 1
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert counter == 40000
+    assert not lock.locked()
+
+
+def test_fifo_and_priority_order():
+    """
+    Queue waiters while the lock is held and check the order they are served in.
+    """
+    lock = TicketLock()
+    order = []
+
+    def waiter(name, priority):
+        with lock.priority(priority):
+            order.append(name)
+
+    lock.acquire()
+    threads = [start_waiter(waiter, name, priority)
+               for name, priority in [("first", 0), ("second", 0), ("urgent", -1), ("third", 0)]]
+    lock.release()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ["urgent", "first", "second", "third"]
+
+
+def test_releasing_thread_cannot_overtake():
+    """
+    A thread that releases the lock and asks for it again queues behind the waiter.
+    """
+    lock = TicketLock()
+    order = []
+
+    def waiter():
+        with lock:
+            order.append("waiter")
+
+    lock.acquire()
+    thread = start_waiter(waiter)
+    lock.release()
+    with lock:  # threading.Lock would often let this thread in first
+        order.append("releaser")
+    thread.join(timeout=5)
+
+    assert order == ["waiter", "releaser"]
+
+
+def test_timeout_and_non_blocking():
+    """
+    A timed-out waiter must leave the queue without taking the lock, and invalid
+    timeouts are rejected like threading.Lock does.
+    """
+    lock = TicketLock()
+    assert lock.acquire()
+    assert not lock.acquire(blocking=False)
+    assert not lock.acquire(timeout=0.05)
+    lock.release()
+    assert lock.acquire(blocking=False)  # Nobody is left in line before us
+    lock.release()
+
+    for arguments in [{"blocking": False, "timeout": 1}, {"timeout": -2}]:
+        try:
+            lock.acquire(**arguments)
+        except ValueError:
+            assert not lock.locked()
+        else:
+            raise AssertionError(f"acquire(**{arguments}) must raise ValueError")
+
+    try:
+        lock.release()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Releasing an unlocked TicketLock must raise RuntimeError")
+
+
+def test_interrupted_waiter_leaves_the_line():
+    """
+    A waiter interrupted by Ctrl+C (SIGINT) leaves the queue, so the lock is free again later.
+    """
+    lock = TicketLock()
+    holding, done = threading.Event(), threading.Event()
+
+    def holder():
+        with lock:
+            holding.set()
+            done.wait(timeout=5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    holding.wait(timeout=5)
+    threading.Timer(0.05, os.kill, (os.getpid(), signal.SIGINT)).start()
+    try:
+        lock.acquire(timeout=5)  # Waits in the main thread, which receives the signal
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("The wait was not interrupted")
+    done.set()
+    thread.join(timeout=5)
+
+    assert not lock.locked()
+    assert lock.acquire(timeout=1)
+    lock.release()
+
+
+if __name__ == "__main__":
+    test_mutual_exclusion()
+    test_fifo_and_priority_order()
+    test_releasing_thread_cannot_overtake()
+    test_timeout_and_non_blocking()
+    test_interrupted_waiter_leaves_the_line()
+    print("SUCCESS: TicketLock is exclusive and grants the lock in order.")